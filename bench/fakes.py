@@ -0,0 +1,284 @@
+import asyncio
+import itertools
+import time
+from typing import Any, Dict, List, Optional
+import discord
+
+"""
+Minimal stand-ins for the discord.py objects the cogs and views touch, for driving them without a gateway
+"""
+_ids = itertools.count(1)
+
+def snowflake() -> int:
+    """A unique id that decodes to the current time, like Discord's"""
+    return discord.utils.time_snowflake(discord.utils.utcnow()) + next(_ids) % 4096
+
+class Api:
+    """Simulated Discord REST latency; every outbound call made through the fakes awaits `call()`"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def call(self):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+class FakeRole:
+    def __init__(self, name: str, guild: "FakeGuild"):
+        self.id = snowflake()
+        self.name = name
+        self.guild = guild
+        self.members: List["FakeMember"] = []
+
+    @property
+    def mention(self) -> str:
+        return f"<@&{self.id}>"
+
+class FakeMember:
+    def __init__(self, name: str, guild: "FakeGuild", roles: List[FakeRole] = ()):
+        self.id = snowflake()
+        self.name = name
+        self.display_name = name
+        self.bot = False
+        self.guild = guild
+        self.roles = list(roles)
+        self.guild_permissions = discord.Permissions.none()
+        self.dms: List["FakeMessage"] = []
+        for role in self.roles:
+            role.members.append(self)
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return next((role for role in self.roles if role.id == role_id), None)
+
+    async def send(self, content: str = None, **kwargs) -> "FakeMessage":
+        await self.guild.api.call()
+        message = FakeMessage(self, content, **kwargs)
+        self.dms.append(message)
+        return message
+
+    def __str__(self):
+        return self.name
+
+class FakeMessage:
+    def __init__(self, channel, content: str = None, embed: discord.Embed = None, embeds: List[discord.Embed] = None, view: discord.ui.View = None, **_):
+        self.id = snowflake()
+        self.channel = channel
+        self.content = content
+        self.embeds = embeds or ([embed] if embed else [])
+        self.view = view
+        self.pinned = False
+        self.author = None
+
+    async def edit(self, **kwargs):
+        await self.channel.guild.api.call()
+        return self.update(**kwargs)
+
+    def update(self, content: str = None, embed: discord.Embed = None, view: discord.ui.View = None, **_):
+        if content is not None:
+            self.content = content
+        if embed is not None:
+            self.embeds = [embed]
+        if view is not None:
+            self.view = view
+        return self
+
+    def to_reference(self, fail_if_not_exists: bool = True) -> "FakeMessage":
+        return self
+
+    async def pin(self, reason: str = None):
+        await self.channel.guild.api.call()
+        self.pinned = True
+
+class FakeChannel:
+    def __init__(self, name: str, guild: "FakeGuild"):
+        self.id = snowflake()
+        self.name = name
+        self.guild = guild
+        self.messages: List[FakeMessage] = []
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+    async def send(self, content: str = None, **kwargs) -> FakeMessage:
+        await self.guild.api.call()
+        message = FakeMessage(self, content, **kwargs)
+        self.messages.append(message)
+        return message
+
+    def get_partial_message(self, message_id: int) -> Optional[FakeMessage]:
+        return next((message for message in self.messages if message.id == message_id), None)
+
+    async def history(self, limit: int = 100):
+        for message in reversed(self.messages[-limit:]):
+            yield message
+
+    def __str__(self):
+        return self.name
+
+class FakeGuild:
+    def __init__(self, api: Api, name: str = "Hackathon"):
+        self.id = snowflake()
+        self.name = name
+        self.api = api
+        self.roles: List[FakeRole] = []
+        self.channels: List[FakeChannel] = []
+        self.members: List[FakeMember] = []
+
+    def add_role(self, name: str) -> FakeRole:
+        role = FakeRole(name, self)
+        self.roles.append(role)
+        return role
+
+    def add_channel(self, name: str) -> FakeChannel:
+        channel = FakeChannel(name, self)
+        self.channels.append(channel)
+        return channel
+
+    def add_member(self, name: str, roles: List[FakeRole] = ()) -> FakeMember:
+        member = FakeMember(name, self, roles)
+        self.members.append(member)
+        return member
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return next((role for role in self.roles if role.id == role_id), None)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return next((channel for channel in self.channels if channel.id == channel_id), None)
+
+    def get_member(self, member_id: int) -> Optional[FakeMember]:
+        return next((member for member in self.members if member.id == member_id), None)
+
+    async def fetch_member(self, member_id: int) -> FakeMember:
+        await self.api.call()
+        member = self.get_member(member_id)
+        if member is None:
+            raise discord.NotFound(FakeHTTPResponse(404), "Unknown Member")
+        return member
+
+class FakeHTTPResponse:
+    """Enough of aiohttp's response for discord.HTTPException"""
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "Not Found"
+
+class FakeClient:
+    def __init__(self, guild: FakeGuild):
+        self.guild = guild
+        self.guilds = [guild]
+        self.user = guild.add_member("garudabot")
+        self.user.bot = True
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self.guild.get_channel(channel_id)
+
+    def get_user(self, user_id: int) -> Optional[FakeMember]:
+        return self.guild.get_member(user_id)
+
+    async def fetch_user(self, user_id: int) -> FakeMember:
+        return await self.guild.fetch_member(user_id)
+
+class FakeCommand:
+    def __init__(self, qualified_name: str):
+        self.qualified_name = qualified_name
+
+class FakeResponse:
+    """InteractionResponse: one initial response, recorded with the time it was sent"""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self.type: Optional[str] = None
+        self.answered_at: Optional[float] = None
+        self.messages: List[FakeMessage] = []
+        self.modal: Optional[discord.ui.Modal] = None
+
+    def is_done(self) -> bool:
+        return self.type is not None
+
+    async def _respond(self, kind: str):
+        if self.type is not None:
+            raise discord.InteractionResponded(self._interaction)
+        self.type = kind
+        await self._interaction.api.call()
+        self.answered_at = time.perf_counter()
+
+    async def send_message(self, content: str = None, **kwargs):
+        await self._respond('message')
+        self.messages.append(FakeMessage(self._interaction.channel, content, **kwargs))
+
+    async def defer(self, ephemeral: bool = False, thinking: bool = False):
+        await self._respond('defer')
+
+    async def edit_message(self, **kwargs):
+        await self._respond('edit')
+        if self._interaction.message is not None:
+            self._interaction.message.update(**kwargs)
+
+    async def send_modal(self, modal: discord.ui.Modal):
+        await self._respond('modal')
+        self.modal = modal
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self.messages: List[FakeMessage] = []
+
+    async def send(self, content: str = None, **kwargs) -> FakeMessage:
+        await self._interaction.api.call()
+        message = FakeMessage(self._interaction.channel, content, **kwargs)
+        self.messages.append(message)
+        return message
+
+class FakeInteraction:
+    """
+    A slash command, component or modal submit interaction from `user`.
+
+    Created at the moment it is dispatched, so queueing before the handler runs
+    shows up in the handler's queued_ms like it would behind the gateway.
+    """
+
+    def __init__(self, client: FakeClient, user: FakeMember, channel: FakeChannel, command: str = None, message: FakeMessage = None):
+        self.id = snowflake()
+        self.created_at = discord.utils.utcnow()
+        self.client = client
+        self.user = user
+        self.guild = channel.guild
+        self.guild_id = channel.guild.id
+        self.channel = channel
+        self.channel_id = channel.id
+        self.message = message
+        self.command = FakeCommand(command) if command else None
+        self.extras: Dict[str, Any] = {}
+        self.api = channel.guild.api
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def edit_original_response(self, **kwargs):
+        await self.api.call()
+        if self.message is not None:
+            await self.message.edit(**kwargs)
+
+    async def delete_original_response(self):
+        await self.api.call()
+
+def _refresh(item: discord.ui.Item, interaction: FakeInteraction, data: Dict[str, Any]):
+    try:
+        item._refresh_state(interaction, data)
+    except TypeError:
+        # discord.py releases before 2.4 don't pass the interaction to text inputs
+        item._refresh_state(data)
+
+def choose(interaction: FakeInteraction, select: discord.ui.Select, values: List[str]):
+    """Set a select's values as Discord would before its callback runs"""
+    _refresh(select, interaction, {'values': values})
+
+def fill(interaction: FakeInteraction, modal: discord.ui.Modal, values: Dict[str, str]):
+    """Fill a modal's text inputs, given by attribute name (e.g. 'title_input')"""
+    for name, value in values.items():
+        _refresh(getattr(modal, name), interaction, {'value': value})
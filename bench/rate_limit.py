@@ -0,0 +1,62 @@
+import os
+import sys
+import asyncio
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from utils.categories import DEFAULT_GROUPS
+from utils.styles import Titles
+from bench.fakes import FakeInteraction, choose
+from bench.replay import Replay
+
+"""
+Hammers the public ticket interface and checks the picker rate limit throttles it
+
+    python -m bench.rate_limit                # one hacker, 30 selects back to back
+    python -m bench.rate_limit --selects 100
+
+Sets the bot up like bench.replay (real views, in-memory Firestore, fake guild) at real
+time, then has one hacker pick a group on the posted interface `--selects` times without
+submitting anything. Only the picker burst (TICKET_PICKER_RATE_USER_BURST) may get
+through; the rest must be answered with the rate limited embed. Exits with 1 otherwise.
+"""
+async def hammer(selects: int) -> int:
+    """Selects answered with the rate limited embed, out of `selects` rapid ones by the same hacker"""
+    replay = Replay([{'at': 0, 'kind': 'ticket', 'hacker': 0}], speed=1, api_latency=0, db_latency=0)
+    await replay.setup()
+    logging.getLogger('discord').setLevel(logging.WARNING)
+    group = DEFAULT_GROUPS[0][0]
+    select = replay.interface.children[0]
+    rejected = 0
+    try:
+        for _ in range(selects):
+            interaction = FakeInteraction(replay.client, replay.hackers[0], replay.ticket_channel)
+            choose(interaction, select, [group])
+            await select.callback(interaction)
+            embeds = [embed for message in interaction.response.messages + interaction.followup.messages
+                      for embed in message.embeds]
+            rejected += any(embed.title == Titles.RATE_LIMITED for embed in embeds)
+    finally:
+        await replay.dashboard.stop()
+        replay.db.replayer.stop()
+        replay._journal_dir.cleanup()
+    return rejected
+
+def main():
+    parser = argparse.ArgumentParser(description="Check rapid selects on the ticket interface are rate limited")
+    parser.add_argument('--selects', type=int, default=30, help="selects by one hacker, back to back")
+    args = parser.parse_args()
+
+    rejected = asyncio.run(hammer(args.selects))
+    # a token or so may refill while the selects run
+    allowed = int(Config.TICKET_PICKER_RATE_USER_BURST) + 1
+    print(f"{rejected}/{args.selects} selects rate limited (burst {Config.TICKET_PICKER_RATE_USER_BURST:g})")
+    ok = rejected >= args.selects - allowed
+    print("throttled" if ok else "NOT throttled")
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
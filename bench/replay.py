@@ -0,0 +1,369 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from utils.categories import DEFAULT_GROUPS
+from utils.interactions import ACK_DEADLINE_SECONDS
+from utils.local_store import LocalFirestore
+from utils.metrics import get_metrics
+from bench.fakes import Api, FakeClient, FakeGuild, FakeInteraction, choose, fill
+
+logger = logging.getLogger('discord')
+
+"""
+Replays a recorded or synthetic interaction trace through the real cogs and views, against
+an in-memory Firestore and fake Discord objects, and reports throughput, handler latency
+percentiles and event-loop lag.
+
+    python -m bench.replay                                  # 600 hackers, 50 mentors, 10 minutes at 20x
+    python -m bench.replay --speed 1 --api-latency-ms 120   # real time, slow Discord
+    python -m bench.replay --record peak.jsonl              # save the synthetic trace
+    python -m bench.replay --trace peak.jsonl               # replay a saved or recorded trace
+
+A trace is JSON lines ordered by `at` (seconds from the start, trace time):
+
+    {"at": 12.5, "kind": "ticket", "hacker": 17, "group": "Backend", "category": "Python",
+     "think": 20.0, "title": "...", "description": "...", "location": "Table 4"}
+    {"at": 40.0, "kind": "accept", "mentor": 3}
+    {"at": 41.0, "kind": "list", "hacker": 17}
+    {"at": 50.0, "kind": "queue", "mentor": 3}
+
+A ticket event is one hacker session: pick a group on the public interface, pick a
+technology, then submit the modal `think` seconds later. An accept is a mentor clicking
+one of the oldest accept buttons still enabled in the mentor channel, so mentors race
+for tickets the way they do on the real channel. `list` and `queue` run /list and
+/mentor tickets.
+"""
+PROBLEMS = (
+    ("Can't connect to the database", "Connection refused when the app starts"),
+    ("Deploy keeps failing", "The build passes locally but the pipeline fails on install"),
+    ("CORS error from the API", "Browser blocks requests from the frontend dev server"),
+    ("Model won't train", "Loss is NaN after the first epoch"),
+    ("Merge conflict", "We both edited the same files and git refuses to pull"),
+    ("App crashes on launch", "Emulator closes right after the splash screen"),
+    ("Need feedback on our idea", "Not sure if the problem is big enough for the judges"),
+    ("Auth token expired", "Login works once then every request returns 401"),
+)
+
+def synthetic_trace(hackers: int = 600, mentors: int = 50, minutes: float = 10, seed: int = 1) -> List[Dict[str, Any]]:
+    """Peak-hour shape: every hacker opens one ticket, each ticket gets accepted, and people keep checking their lists"""
+    rng = random.Random(seed)
+    duration = minutes * 60
+    events = []
+    for hacker in range(hackers):
+        group, categories = rng.choice(DEFAULT_GROUPS)
+        title, description = rng.choice(PROBLEMS)
+        at = rng.uniform(0, duration)
+        think = rng.uniform(10, 40)
+        events.append({
+            'at': at, 'kind': 'ticket', 'hacker': hacker, 'group': group, 'category': rng.choice(categories),
+            'think': think, 'title': title, 'description': f"{description} ({rng.randrange(1000)})",
+            'location': f"Table {rng.randrange(1, 120)}"
+        })
+        events.append({'at': at + think + rng.uniform(15, 90), 'kind': 'accept', 'mentor': rng.randrange(mentors)})
+        if rng.random() < 0.3:
+            events.append({'at': at + think + rng.uniform(30, 120), 'kind': 'list', 'hacker': hacker})
+    for mentor in range(mentors):
+        at = rng.uniform(0, 120)
+        while at < duration:
+            events.append({'at': at, 'kind': 'queue', 'mentor': mentor})
+            at += rng.uniform(90, 150)
+    events.sort(key=lambda event: event['at'])
+    return events
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    with open(path) as trace:
+        events = [json.loads(line) for line in trace if line.strip()]
+    events.sort(key=lambda event: event['at'])
+    return events
+
+def save_trace(path: str, events: Iterable[Dict[str, Any]]):
+    with open(path, 'w') as trace:
+        for event in events:
+            trace.write(json.dumps(event) + "\n")
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+class Replay:
+    """One bot instance (storage, indexes, cogs) wired to a fake guild, driven by a trace"""
+
+    def __init__(self, events: List[Dict[str, Any]], speed: float = 20.0, api_latency: float = 0.08, db_latency: float = 0.015):
+        self.events = events
+        self.speed = speed
+        self.api = Api(api_latency)
+        self.store = LocalFirestore(db_latency)
+        # (total seconds, seconds until the first response) per interaction kind
+        self.samples: Dict[str, List[tuple]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.outcomes: Dict[str, int] = defaultdict(int)
+        self.lag: List[float] = []
+
+    async def setup(self):
+        from utils.db import init_firebase_db
+        from utils.ticket_index import get_ticket_index
+        from utils.search import get_search_index
+        from utils.duplicates import get_duplicate_detector
+        from utils.mentor_load import get_mentor_load
+        from utils.tracing import get_tracer
+        from commands.ticket import Ticket
+        from commands.mentor import Mentor
+        from views.create_ticket import PublicCategorySelectionView
+        from utils.categories import get_category_catalogue
+
+        self._journal_dir = tempfile.TemporaryDirectory()
+        self.db = init_firebase_db(journal_path=os.path.join(self._journal_dir.name, "journal.sqlite3"), client=self.store,
+                                   config_ttl=Config.DEV_CONFIG_CACHE_SECONDS)
+        for listener in (get_ticket_index().apply, get_search_index().apply, get_duplicate_detector().apply, get_mentor_load().apply):
+            self.db.add_listener(listener)
+        get_ticket_index().load([])
+        get_tracer().set_sample_rate(0)
+
+        hackers = 1 + max((event.get('hacker', 0) for event in self.events), default=0)
+        mentors = 1 + max((event.get('mentor', 0) for event in self.events), default=0)
+        self.guild = FakeGuild(self.api)
+        self.client = FakeClient(self.guild)
+        mentor_role = self.guild.add_role("Mentor")
+        self.guild.add_role("Admin")
+        self.ticket_channel = self.guild.add_channel("tickets")
+        self.mentor_channel = self.guild.add_channel("mentors")
+        self.hackers = [self.guild.add_member(f"hacker{n}") for n in range(hackers)]
+        self.mentors = [self.guild.add_member(f"mentor{n}", [mentor_role]) for n in range(mentors)]
+        for mentor in self.mentors:
+            get_mentor_load().register(mentor.id, mentor.display_name)
+        self.db.set_dev_config('ticket_channel', str(self.ticket_channel.id))
+        self.db.set_dev_config('mentor_channel', str(self.mentor_channel.id))
+
+        self.scale_time()
+        self.ticket_cog = Ticket(self.client)
+        self.mentor_cog = Mentor(self.client)
+        # the public interface every hacker clicks, as posted in the ticket channel
+        self.interface = PublicCategorySelectionView(get_category_catalogue().get(self.guild.id))
+        self.api.calls = 0
+
+    def scale_time(self):
+        """Compress the time-based limits by the replay speed so a sped-up trace isn't throttled or batched differently"""
+        from utils import rate_limit
+        from utils.digest import get_notification_batcher
+        from utils.dashboard import init_dashboard
+        rate_limit.ticket_rate_limiter = rate_limit.RateLimiter(
+            'ticket_create',
+            user_rate=Config.TICKET_RATE_USER_PER_MINUTE / 60 * self.speed,
+            user_burst=Config.TICKET_RATE_USER_BURST,
+            guild_rate=Config.TICKET_RATE_GUILD_PER_MINUTE / 60 * self.speed,
+            guild_burst=Config.TICKET_RATE_GUILD_BURST
+        )
+        rate_limit.picker_rate_limiter = rate_limit.RateLimiter(
+            'ticket_picker',
+            user_rate=Config.TICKET_PICKER_RATE_USER_PER_MINUTE / 60 * self.speed,
+            user_burst=Config.TICKET_PICKER_RATE_USER_BURST,
+            guild_rate=Config.TICKET_PICKER_RATE_GUILD_PER_MINUTE / 60 * self.speed,
+            guild_burst=Config.TICKET_PICKER_RATE_GUILD_BURST
+        )
+        batcher = get_notification_batcher()
+        batcher.window /= self.speed
+        batcher.max_delay /= self.speed
+        self.dashboard = init_dashboard(self.client, Config.DASHBOARD_EDIT_SECONDS / self.speed)
+        self.dashboard.start()
+
+    async def dispatch(self, kind: str, handler: Callable[[FakeInteraction], Awaitable[Any]], interaction: FakeInteraction):
+        started = time.perf_counter()
+        try:
+            await handler(interaction)
+        except Exception as e:
+            self.errors[kind] += 1
+            logger.error(f"{kind} handler raised {type(e).__name__}: {e}")
+        finished = time.perf_counter()
+        answered_at = interaction.response.answered_at or finished
+        self.samples[kind].append((finished - started, answered_at - started))
+
+    async def think(self, seconds: float):
+        await asyncio.sleep(seconds / self.speed)
+
+    async def ticket(self, event: Dict[str, Any]):
+        hacker = self.hackers[event['hacker']]
+        interaction = FakeInteraction(self.client, hacker, self.ticket_channel)
+        group_select = self.interface.children[0]
+        choose(interaction, group_select, [event['group']])
+        await self.dispatch('select_group', group_select.callback, interaction)
+
+        modal = interaction.response.modal
+        if modal is None:
+            picker = next((message.view for message in interaction.response.messages if message.view), None)
+            if picker is None:
+                # rate limited, too many open tickets or a removed group
+                self.outcomes['ticket_rejected'] += 1
+                return
+            await self.think(min(5.0, event['think'] / 4))
+            message = interaction.response.messages[0]
+            interaction = FakeInteraction(self.client, hacker, self.ticket_channel, message=message)
+            category_select = picker.children[0]
+            choose(interaction, category_select, [event['category']])
+            await self.dispatch('select_category', category_select.callback, interaction)
+            modal = interaction.response.modal
+            if modal is None:
+                self.outcomes['ticket_rejected'] += 1
+                return
+
+        await self.think(event['think'])
+        interaction = FakeInteraction(self.client, hacker, self.ticket_channel)
+        fill(interaction, modal, {'title_input': event['title'], 'description_input': event['description'], 'location_input': event['location']})
+        await self.dispatch('submit', modal.on_submit, interaction)
+        self.outcomes['ticket_submitted'] += 1
+
+    def open_buttons(self) -> List[tuple]:
+        """(message, button) for every accept button still enabled, oldest message first"""
+        return [
+            (message, item)
+            for message in self.mentor_channel.messages if message.view is not None
+            # accept buttons are dynamic items wrapping the button
+            for item in message.view.children if not getattr(getattr(item, 'item', item), 'disabled', True)
+        ]
+
+    async def accept(self, event: Dict[str, Any]):
+        buttons = self.open_buttons()[:3]
+        if not buttons:
+            self.outcomes['accept_nothing_open'] += 1
+            return
+        message, button = random.choice(buttons)
+        interaction = FakeInteraction(self.client, self.mentors[event['mentor']], self.mentor_channel, message=message)
+        await self.dispatch('accept', button.callback, interaction)
+
+    async def list(self, event: Dict[str, Any]):
+        interaction = FakeInteraction(self.client, self.hackers[event['hacker']], self.ticket_channel, command='list')
+        await self.dispatch('list', lambda i: self.ticket_cog.list_tickets.callback(self.ticket_cog, i), interaction)
+
+    async def queue(self, event: Dict[str, Any]):
+        interaction = FakeInteraction(self.client, self.mentors[event['mentor']], self.mentor_channel, command='mentor tickets')
+        await self.dispatch('queue', lambda i: self.mentor_cog.view_tickets.callback(self.mentor_cog, i), interaction)
+
+    async def monitor_lag(self, interval: float = 0.02):
+        """How late the loop wakes a sleeper: time every queued callback waits behind blocking work"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            self.lag.append(max(0.0, loop.time() - started - interval))
+
+    async def run(self) -> Dict[str, Any]:
+        from utils.lifecycle import get_lifecycle
+        await self.setup()
+        loop = asyncio.get_running_loop()
+        monitor = asyncio.create_task(self.monitor_lag())
+        handlers = {'ticket': self.ticket, 'accept': self.accept, 'list': self.list, 'queue': self.queue}
+        tasks = []
+        started = loop.time()
+        for event in self.events:
+            delay = started + event['at'] / self.speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # dispatched without waiting, like the gateway does
+            tasks.append(asyncio.create_task(handlers[event['kind']](event)))
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - started
+        await get_lifecycle().drain(timeout=30)
+        flushed = await asyncio.to_thread(self.db.replayer.flush, 30)
+        monitor.cancel()
+        await self.dashboard.stop()
+        self.db.replayer.stop()
+        self._journal_dir.cleanup()
+        return self.report(elapsed, flushed)
+
+    def report(self, elapsed: float, flushed: bool) -> Dict[str, Any]:
+        tickets = [snapshot.to_dict() for snapshot in self.store.collection(self.db.tickets_collection).stream()]
+        total = sum(len(samples) for samples in self.samples.values())
+        metrics = get_metrics()
+        kinds = {}
+        for kind, samples in sorted(self.samples.items()):
+            latencies = [total_s for total_s, _ in samples]
+            acks = [ack_s for _, ack_s in samples]
+            kinds[kind] = {
+                'count': len(samples),
+                'errors': self.errors[kind],
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p95_ms': percentile(latencies, 95) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000,
+                'max_ms': max(latencies) * 1000,
+                'ack_p99_ms': percentile(acks, 99) * 1000,
+                'late_acks': sum(1 for ack in acks if ack > ACK_DEADLINE_SECONDS)
+            }
+        return {
+            'speed': self.speed,
+            'elapsed_s': elapsed,
+            'interactions': total,
+            'throughput_per_s': total / elapsed if elapsed else 0.0,
+            'kinds': kinds,
+            'loop_lag_ms': {
+                'p50': percentile(self.lag, 50) * 1000,
+                'p99': percentile(self.lag, 99) * 1000,
+                'max': max(self.lag, default=0.0) * 1000
+            },
+            'outcomes': dict(self.outcomes),
+            'tickets_stored': len(tickets),
+            'tickets_assigned': sum(1 for ticket in tickets if ticket.get('mentor_id')),
+            'journal_flushed': flushed,
+            'firestore_reads': self.store.reads,
+            'firestore_writes': self.store.writes,
+            'discord_calls': self.api.calls,
+            'notification_messages': {mode: metrics.get('notification_messages_total', mode=mode) for mode in ('single', 'digest')},
+            'rate_limited': sum(metrics.snapshot().get('ratelimit_rejected_total', {}).values())
+        }
+
+def print_report(report: Dict[str, Any]):
+    print(f"Replayed {report['interactions']} interactions in {report['elapsed_s']:.1f}s "
+          f"({report['throughput_per_s']:.1f}/s) at {report['speed']:g}x speed")
+    print(f"{'kind':<16}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'ack p99':>9}{'late':>6}")
+    for kind, row in report['kinds'].items():
+        print(f"{kind:<16}{row['count']:>7}{row['errors']:>8}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+              f"{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}{row['ack_p99_ms']:>9.1f}{row['late_acks']:>6}")
+    lag = report['loop_lag_ms']
+    print(f"Event-loop lag: p50 {lag['p50']:.1f} ms, p99 {lag['p99']:.1f} ms, max {lag['max']:.1f} ms")
+    print(f"Tickets stored {report['tickets_stored']}, assigned {report['tickets_assigned']}, "
+          f"journal {'flushed' if report['journal_flushed'] else 'NOT flushed'}; outcomes {report['outcomes']}")
+    notifications = report['notification_messages']
+    print(f"Firestore reads {report['firestore_reads']}, writes {report['firestore_writes']}; "
+          f"Discord calls {report['discord_calls']}; mentor notifications {notifications['single']:g} single, "
+          f"{notifications['digest']:g} digest; rate limited {report['rate_limited']:g}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay an interaction trace through the bot's handlers")
+    parser.add_argument('--trace', help="JSONL trace to replay (default: synthetic peak hour)")
+    parser.add_argument('--record', help="write the trace being replayed to this file")
+    parser.add_argument('--hackers', type=int, default=600)
+    parser.add_argument('--mentors', type=int, default=50)
+    parser.add_argument('--minutes', type=float, default=10)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--speed', type=float, default=20, help="trace seconds replayed per wall-clock second")
+    parser.add_argument('--api-latency-ms', type=float, default=80, help="simulated Discord REST round trip")
+    parser.add_argument('--db-latency-ms', type=float, default=15, help="simulated Firestore round trip")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+    events = load_trace(args.trace) if args.trace else synthetic_trace(args.hackers, args.mentors, args.minutes, args.seed)
+    if args.record:
+        save_trace(args.record, events)
+    random.seed(args.seed)
+    replay = Replay(events, args.speed, args.api_latency_ms / 1000, args.db_latency_ms / 1000)
+    report = asyncio.run(replay.run())
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import asyncio
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from utils.local_store import LocalFirestore
+from bench.ticket_memory import make_documents
+
+"""
+Cold start against an in-memory Firestore, checked against STARTUP_TARGET_SECONDS
+
+    python -m bench.startup                                  # 2000 tickets, 30 ms Firestore round trips
+    python -m bench.startup --tickets 20000 --db-latency-ms 60
+
+Runs main.py's leader startup path: Firebase init alongside the Discord login, loading
+the cogs, the storage warm-up alongside the gateway handshake, then finish_startup().
+The Discord round trips are simulated with --login-ms and --gateway-ms, and there are no
+guilds, so the guild half of the warm-up only reads its configs. Time to ready counts
+from main.py's import, like the bot's own report. Exits with 1 when it misses the
+target, so it can guard against startup regressions in CI.
+"""
+def seed(tickets: int) -> LocalFirestore:
+    """An in-memory Firestore holding `tickets` tickets (about half open) and the ticket counter"""
+    store = LocalFirestore()
+    collection = store.collection("tickets")
+    for document in make_documents(tickets):
+        collection.document(document['id']).set(document)
+    store.collection("dev_configs").document("counter").set({'value': str(tickets)})
+    return store
+
+async def cold_start(store: LocalFirestore, journal_path: str, login: float, gateway: float):
+    """Start the bot the way main() does for an elected leader; returns its StartupReport"""
+    import main as bot
+    logging.getLogger('discord').setLevel(logging.WARNING)
+    startup = bot.startup
+
+    await asyncio.gather(
+        startup.timed('firebase', asyncio.to_thread(bot.init_database, journal_path, store)),
+        startup.timed('discord_login', asyncio.sleep(login))
+    )
+    await startup.timed('extensions', bot.load_extensions())
+    bot.register_persistent_views()
+
+    bot.warmup = asyncio.create_task(bot.warm_storage())
+    bot.lifecycle.spawn(bot.load_search_index())
+    await startup.timed('gateway', asyncio.sleep(gateway))
+    await bot.finish_startup()
+
+    await bot.lifecycle.drain(Config.SHUTDOWN_GRACE_SECONDS)
+    await bot.escalations.stop()
+    await bot.dashboard.stop()
+    return startup
+
+def main():
+    parser = argparse.ArgumentParser(description="Time a cold start against the startup target")
+    parser.add_argument('--tickets', type=int, default=2000, help="tickets in Firestore (about half open)")
+    parser.add_argument('--db-latency-ms', type=float, default=30, help="simulated Firestore round trip")
+    parser.add_argument('--login-ms', type=float, default=400, help="simulated Discord REST login")
+    parser.add_argument('--gateway-ms', type=float, default=1500, help="simulated gateway handshake, until on_ready")
+    parser.add_argument('--target', type=float, default=Config.STARTUP_TARGET_SECONDS, help="seconds to ready")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    store = seed(args.tickets)
+    # seeding isn't part of the start
+    store.latency = args.db_latency_ms / 1000
+    with tempfile.TemporaryDirectory() as journal_dir:
+        startup = asyncio.run(cold_start(store, os.path.join(journal_dir, "journal.sqlite3"),
+                                         args.login_ms / 1000, args.gateway_ms / 1000))
+    startup.target_seconds = args.target
+
+    if args.json:
+        print(json.dumps(dict(startup.as_dict(), tickets=args.tickets, reads=store.reads)))
+    else:
+        print(f"{args.tickets} tickets, {args.db_latency_ms:g} ms Firestore, {store.reads} reads")
+        for name, seconds in startup.phases.items():
+            print(f"  {name:<16} {seconds * 1000:8.1f} ms")
+        print(startup.summary())
+        print("within target" if startup.within_target else f"MISSED the {args.target:g}s target")
+    return 0 if startup.within_target else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import os
+import sys
+import gc
+import time
+import random
+import argparse
+import tracemalloc
+from datetime import timedelta
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.categories import DEFAULT_GROUPS
+from utils.ticket_model import Ticket
+from utils.timestamps import utcnow
+
+"""
+Memory and conversion cost of tickets held as Firestore-shaped dicts versus Ticket objects
+
+    python -m bench.ticket_memory --tickets 10000
+"""
+def make_documents(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """Ticket documents as the database returns them (half closed, most assigned)"""
+    rng = random.Random(seed)
+    categories = [category for _, group in DEFAULT_GROUPS for category in group]
+    now = utcnow()
+    documents = []
+    for n in range(1, count + 1):
+        created_at = now - timedelta(seconds=rng.randrange(36 * 3600))
+        closed = rng.random() < 0.5
+        mentor = rng.random() < 0.8
+        documents.append({
+            'id': str(n),
+            'user_id': rng.randrange(10 ** 17, 10 ** 18),
+            'user_name': f"hacker{rng.randrange(600)}",
+            'title': f"Problem {n} with the build",
+            'description': f"Something about ticket {n} " * rng.randrange(1, 8),
+            'location': f"Table {rng.randrange(1, 120)}",
+            'categories': rng.sample(categories, rng.randrange(0, 3)),
+            'status': 'closed' if closed else 'open',
+            'created_at': created_at,
+            'mentor_id': rng.randrange(10 ** 17, 10 ** 18) if mentor else None,
+            'mentor_name': f"mentor{rng.randrange(50)}" if mentor else None,
+            'closed_at': created_at + timedelta(minutes=rng.randrange(5, 90)) if closed else None
+        })
+    return documents
+
+def retained(build: Callable[[], Any]) -> int:
+    """Bytes still allocated by what `build` returns"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+def per_item(seconds: float, count: int) -> str:
+    return f"{seconds / count * 1e6:.2f} µs"
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dict and Ticket memory use and conversion speed")
+    parser.add_argument('--tickets', type=int, default=10000)
+    args = parser.parse_args()
+
+    documents = make_documents(args.tickets)
+    # each form is built from fresh documents so both pay for their own strings, lists and timestamps
+    dict_bytes = retained(lambda: make_documents(args.tickets))
+    ticket_bytes = retained(lambda: [Ticket.from_dict(document) for document in make_documents(args.tickets)])
+    print(f"{args.tickets} tickets")
+    print(f"  dict:   {dict_bytes / args.tickets:8.0f} bytes/ticket  ({dict_bytes / 2 ** 20:.1f} MiB)")
+    print(f"  Ticket: {ticket_bytes / args.tickets:8.0f} bytes/ticket  ({ticket_bytes / 2 ** 20:.1f} MiB, "
+          f"{1 - ticket_bytes / dict_bytes:.0%} smaller)")
+
+    started = time.perf_counter()
+    tickets = [Ticket.from_dict(document) for document in documents]
+    from_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    converted = [ticket.to_dict() for ticket in tickets]
+    to_seconds = time.perf_counter() - started
+    print(f"  from_dict {per_item(from_seconds, args.tickets)}/ticket, to_dict {per_item(to_seconds, args.tickets)}/ticket")
+
+    # timestamps are kept to the second, everything else round-trips exactly
+    for document, back in zip(documents, converted):
+        expected = {**document, 'created_at': document['created_at'].replace(microsecond=0),
+                    'closed_at': document['closed_at'] and document['closed_at'].replace(microsecond=0)}
+        assert sorted(back['categories']) == sorted(expected.pop('categories'))
+        back.pop('categories')
+        assert back == expected, (back, expected)
+    print("  round trip ok")
+
+if __name__ == '__main__':
+    main()
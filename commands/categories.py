@@ -0,0 +1,109 @@
+import asyncio
+import discord
+from discord import app_commands
+from discord.ext import commands
+from typing import List
+from utils.categories import get_category_catalogue
+from utils.roles import admin_only
+from utils.interactions import interaction_handler, reply
+from utils.styles import Colors, Emojis, Titles
+from views.create_ticket import refresh_ticket_interfaces
+
+class Categories(commands.GroupCog, group_name='category', group_description="Manage ticket categories (Admin only)"):
+    """
+    Lets organizers change the guild's ticket categories mid-event without a redeploy.
+    """
+    def __init__(self, bot):
+        self.bot = bot
+        self.catalogue = get_category_catalogue()
+
+    @app_commands.command(name='list', description="Show the ticket categories by group (Admin only)")
+    @admin_only()
+    @interaction_handler(defer='reply')
+    async def list_categories(self, interaction: discord.Interaction):
+        """Show the ticket categories by group (Admin only)"""
+        embed = discord.Embed(title="🏷️ Ticket Categories", color=Colors.BLUE)
+        catalogue = await asyncio.to_thread(self.catalogue.get, interaction.guild_id)
+        for name, categories in catalogue.groups[:25]:
+            embed.add_field(name=name, value=", ".join(categories)[:1024], inline=False)
+        await reply(interaction, embed=embed, ephemeral=True)
+
+    @app_commands.command(name='add', description="Add a ticket category (Admin only)")
+    @app_commands.describe(group="Existing or new group", name="Category name, e.g. a sponsor technology")
+    @admin_only()
+    @interaction_handler(defer='reply')
+    async def add_category(self, interaction: discord.Interaction, group: str, name: str):
+        """Add a ticket category (Admin only)"""
+        catalogue = await asyncio.to_thread(self.catalogue.get, interaction.guild_id)
+        try:
+            saved = await asyncio.to_thread(self.catalogue.add, interaction.guild_id, group, name)
+        except ValueError as e:
+            await reply(interaction, f"{Emojis.ERROR} {e}", ephemeral=True)
+            return
+
+        if not saved:
+            await reply(interaction, f"{Emojis.ERROR} Failed to save the category.", ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title=Titles.CONFIG_SUCCESS,
+            description=f"Added **{name.strip()}** to **{group.strip()}**.",
+            color=Colors.GREEN
+        )
+        note = await self.update_interfaces(interaction.guild, catalogue)
+        if note:
+            embed.add_field(name="Ticket interface", value=note, inline=False)
+        await reply(interaction, embed=embed, ephemeral=True)
+
+    @add_category.autocomplete('group')
+    async def group_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        current = current.lower()
+        catalogue = await asyncio.to_thread(self.catalogue.get, interaction.guild_id)
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name, _ in catalogue.groups
+            if current in name.lower()
+        ][:25]
+
+    @app_commands.command(name='remove', description="Remove a ticket category (Admin only)")
+    @app_commands.describe(name="Category to remove")
+    @admin_only()
+    @interaction_handler(defer='reply')
+    async def remove_category(self, interaction: discord.Interaction, name: str):
+        """Remove a ticket category (Admin only)"""
+        catalogue = await asyncio.to_thread(self.catalogue.get, interaction.guild_id)
+        try:
+            saved = await asyncio.to_thread(self.catalogue.remove, interaction.guild_id, name)
+        except ValueError as e:
+            await reply(interaction, f"{Emojis.ERROR} {e}", ephemeral=True)
+            return
+
+        if not saved:
+            await reply(interaction, f"{Emojis.ERROR} Failed to save the categories.", ephemeral=True)
+            return
+
+        note = await self.update_interfaces(interaction.guild, catalogue)
+        await reply(interaction, f"{Emojis.SUCCESS} Removed **{name}**." + (f" {note}" if note else ""), ephemeral=True)
+
+    async def update_interfaces(self, guild, before) -> str:
+        """Re-render the posted ticket interfaces if the set of groups changed; returns a note for the admin"""
+        after = await asyncio.to_thread(self.catalogue.get, guild.id)
+        if [name for name, _ in after.groups] == [name for name, _ in before.groups]:
+            # technologies are read when a group is picked, so the interface needs no change
+            return ""
+        if await refresh_ticket_interfaces(guild, after):
+            return "The groups on the ticket interface were updated."
+        return "No posted ticket interface was found to update; re-post it with `/post` to show the new groups."
+
+    @remove_category.autocomplete('name')
+    async def category_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        current = current.lower()
+        catalogue = await asyncio.to_thread(self.catalogue.get, interaction.guild_id)
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in catalogue.names
+            if current in name.lower()
+        ][:25]
+
+async def setup(bot):
+    await bot.add_cog(Categories(bot))
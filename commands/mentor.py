@@ -1,35 +1,59 @@
+import asyncio
 import discord
+from discord import app_commands
 from discord.ext import commands
-from datetime import datetime
+from typing import List, Optional
 from utils.db import get_firebase_db
+from utils.ticket_index import get_ticket_index
+from utils.ticket_model import Ticket
+from utils.mentor_load import get_mentor_load, suggest_mentors
+from utils.roles import admin_only, get_role_registry
+from utils.autocomplete import ticket_choices
+from utils.timestamps import utcnow, format_date, format_datetime
+from utils.interactions import interaction_handler, reply
 from utils.styles import Colors, Emojis, Titles, Messages, Footers
 
-class Mentor(commands.Cog):
+class Mentor(commands.GroupCog, group_name='mentor', group_description="Mentor ticket commands"):
     def __init__(self, bot):
         self.bot = bot
         self.db = get_firebase_db()
+        self.index = get_ticket_index()
 
-    def get_ticket_by_id(self, ticket_id):
+    def get_ticket_by_id(self, ticket_id) -> Optional[Ticket]:
         """Get ticket by ID"""
-        return self.db.get_ticket_by_id(ticket_id)
+        ticket = self.db.get_ticket_by_id(ticket_id)
+        return Ticket.from_dict(ticket) if ticket else None
 
-    def get_open_tickets(self):
-        """Get all open tickets"""
-        return self.db.get_open_tickets()
+    def get_open_tickets(self, limit=None) -> List[Ticket]:
+        """Get open tickets, oldest first"""
+        return [Ticket.from_dict(ticket) for ticket in self.db.get_open_tickets(limit)]
 
-    def is_mentor(self, ctx):
+    def is_mentor(self, interaction: discord.Interaction):
         """Check if user has mentor role"""
-        mentor_role = discord.utils.get(ctx.guild.roles, name="Mentor")
-        return mentor_role and mentor_role in ctx.author.roles
-
-    @commands.command(name='tickets')
-    async def view_tickets(self, ctx):
+        if get_role_registry().is_mentor(interaction.user):
+            # anyone using mentor commands joins the load-balancing roster
+            get_mentor_load().register(interaction.user.id, interaction.user.display_name)
+            return True
+        return False
+
+    async def unassigned_ticket_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Suggest open tickets nobody has accepted yet"""
+        return ticket_choices(self.index.unassigned(), current)
+
+    async def assigned_ticket_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Suggest the calling mentor's open tickets"""
+        return ticket_choices(self.index.mentor_tickets(interaction.user.id), current)
+
+    @app_commands.command(name='tickets', description="View all open tickets (Mentor only)")
+    @interaction_handler(defer='reply')
+    async def view_tickets(self, interaction: discord.Interaction):
         """View all open tickets (Mentor only)"""
-        if not self.is_mentor(ctx):
-            await ctx.send(f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.")
+        if not self.is_mentor(interaction):
+            await reply(interaction, f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.", ephemeral=True)
             return
 
-        open_tickets = self.get_open_tickets()
+        # oldest first, as many as fit in one embed
+        open_tickets = await asyncio.to_thread(self.get_open_tickets, limit=25)
 
         if not open_tickets:
             embed = discord.Embed(
@@ -37,58 +61,60 @@ class Mentor(commands.Cog):
                 description=Messages.NO_OPEN_TICKETS,
                 color=Colors.GREEN
             )
-            await ctx.send(embed=embed)
+            await reply(interaction, embed=embed, ephemeral=True)
             return
 
         embed = discord.Embed(
             title=Titles.OPEN_TICKETS,
-            description=f"There are {len(open_tickets)} open ticket(s):",
+            description=f"Showing {len(open_tickets)} open ticket(s), oldest first:",
             color=Colors.DEFAULT
         )
 
         for ticket in open_tickets:
-            mentor_status = f"Assigned to {ticket['mentor_name']}" if ticket['mentor_name'] else "**Unassigned**"
+            mentor_status = f"Assigned to {ticket.mentor_name}" if ticket.mentor_name else "**Unassigned**"
             
             categories_info = ""
-            if ticket.get('categories'):
-                categories_info = f"\n**Categories:** {', '.join(ticket['categories'])}"
+            if ticket.categories:
+                categories_info = f"\n**Categories:** {', '.join(ticket.categories)}"
             
-            title_info = f"\n**Title:** {ticket.get('title', 'No title')}"
-            location_info = f"\n**Location:** {ticket.get('location', 'No location')}"
+            title_info = f"\n**Title:** {ticket.title}"
+            location_info = f"\n**Location:** {ticket.location}"
             
             embed.add_field(
-                name=f"{Emojis.TICKET} Ticket #{ticket['id']}",
-                value=f"**Hacker:** {ticket['user_name']}{title_info}{location_info}\n**Description:** {ticket['description'][:100]}...\n**Mentor:** {mentor_status}{categories_info}\n**Created:** {ticket['created_at'][:10]}",
+                name=f"{Emojis.TICKET} Ticket #{ticket.id}",
+                value=f"**Hacker:** {ticket.user_name}{title_info}{location_info}\n**Description:** {ticket.description[:100]}...\n**Mentor:** {mentor_status}{categories_info}\n**Created:** {format_date(ticket.created)}",
                 inline=False
             )
 
-        await ctx.send(embed=embed)
+        await reply(interaction, embed=embed, ephemeral=True)
 
-    @commands.command(name='accept')
-    async def accept_ticket(self, ctx, ticket_id: str):
+    @app_commands.command(name='accept', description="Accept a ticket (Mentor only)")
+    @app_commands.describe(ticket_id="Ticket number")
+    @interaction_handler(defer='reply', ephemeral=False)
+    async def accept_ticket(self, interaction: discord.Interaction, ticket_id: str):
         """Accept a ticket (Mentor only)"""
-        if not self.is_mentor(ctx):
-            await ctx.send(f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.")
+        if not self.is_mentor(interaction):
+            await reply(interaction, f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.", ephemeral=True)
             return
 
-        ticket = self.get_ticket_by_id(ticket_id)
+        ticket = await asyncio.to_thread(self.get_ticket_by_id, ticket_id)
 
         if not ticket:
-            await ctx.send(f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.")
+            await reply(interaction, f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.", ephemeral=True)
             return
 
-        if ticket['status'] != 'open':
-            await ctx.send(f"{Emojis.ERROR} This ticket is not open.")
+        if not ticket.is_open:
+            await reply(interaction, f"{Emojis.ERROR} This ticket is not open.", ephemeral=True)
             return
 
-        if ticket['mentor_id']:
-            await ctx.send(f"{Emojis.ERROR} This ticket is already assigned to {ticket['mentor_name']}.")
+        if ticket.mentor_id:
+            await reply(interaction, f"{Emojis.ERROR} This ticket is already assigned to {ticket.mentor_name}.", ephemeral=True)
             return
 
-        success = self.db.assign_ticket(ticket_id, ctx.author.id, ctx.author.display_name)
+        success = await asyncio.to_thread(self.db.assign_ticket, ticket_id, interaction.user.id, interaction.user.display_name)
         
         if not success:
-            await ctx.send(f"{Emojis.ERROR} Failed to assign ticket. Please try again.")
+            await reply(interaction, f"{Emojis.ERROR} Failed to assign ticket. Please try again.", ephemeral=True)
             return
 
         embed = discord.Embed(
@@ -96,55 +122,61 @@ class Mentor(commands.Cog):
             description=f"{Messages.TICKET_ACCEPTED_SUCCESS} #{ticket_id}",
             color=Colors.GREEN
         )
-        embed.add_field(name="Hacker", value=ticket['user_name'], inline=True)
-        embed.add_field(name="Title", value=ticket.get('title', 'No title'), inline=False)
-        embed.add_field(name="Description", value=ticket['description'], inline=False)
-        embed.add_field(name="Location", value=ticket.get('location', 'No location'), inline=False)
-        if ticket.get('categories'):
-            embed.add_field(name="Categories", value=", ".join(ticket['categories']), inline=False)
-        embed.add_field(name="Accepted At", value=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+        embed.add_field(name="Hacker", value=ticket.user_name, inline=True)
+        embed.add_field(name="Title", value=ticket.title, inline=False)
+        embed.add_field(name="Description", value=ticket.description, inline=False)
+        embed.add_field(name="Location", value=ticket.location, inline=False)
+        if ticket.categories:
+            embed.add_field(name="Categories", value=", ".join(ticket.categories), inline=False)
+        embed.add_field(name="Accepted At", value=format_datetime(utcnow()), inline=True)
 
-        await ctx.send(embed=embed)
+        await reply(interaction, embed=embed)
 
         # notify the user
         try:
-            user = await self.bot.fetch_user(ticket['user_id'])
+            user = await self.bot.fetch_user(ticket.user_id)
             user_embed = discord.Embed(
                 title=Titles.TICKET_ASSIGNED,
                 description=Messages.TICKET_ASSIGNED_SUCCESS,
                 color=Colors.GREEN
             )
-            user_embed.add_field(name="Mentor", value=ctx.author.display_name, inline=True)
-            user_embed.add_field(name="Title", value=ticket.get('title', 'No title'), inline=False)
-            user_embed.add_field(name="Description", value=ticket['description'], inline=False)
+            user_embed.add_field(name="Mentor", value=interaction.user.display_name, inline=True)
+            user_embed.add_field(name="Title", value=ticket.title, inline=False)
+            user_embed.add_field(name="Description", value=ticket.description, inline=False)
             await user.send(embed=user_embed)
         except:
             pass
 
-    @commands.command(name='resolve')
-    async def close_ticket(self, ctx, ticket_id: str):
+    @accept_ticket.autocomplete('ticket_id')
+    async def accept_ticket_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return await self.unassigned_ticket_autocomplete(interaction, current)
+
+    @app_commands.command(name='resolve', description="Close a ticket as mentor (Mentor only)")
+    @app_commands.describe(ticket_id="Ticket number")
+    @interaction_handler(defer='reply', ephemeral=False)
+    async def close_ticket(self, interaction: discord.Interaction, ticket_id: str):
         """Close a ticket as mentor (Mentor only)"""
-        if not self.is_mentor(ctx):
-            await ctx.send(f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.")
+        if not self.is_mentor(interaction):
+            await reply(interaction, f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.", ephemeral=True)
             return
 
-        ticket = self.get_ticket_by_id(ticket_id)
+        ticket = await asyncio.to_thread(self.get_ticket_by_id, ticket_id)
 
         if not ticket:
-            await ctx.send(f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.")
+            await reply(interaction, f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.", ephemeral=True)
             return
 
-        if ticket['status'] == 'closed':
-            await ctx.send(f"{Emojis.ERROR} This ticket is already closed.")
+        if not ticket.is_open:
+            await reply(interaction, f"{Emojis.ERROR} This ticket is already closed.", ephemeral=True)
             return
 
-        if ticket['mentor_id'] != ctx.author.id:
-            await ctx.send(f"{Emojis.ERROR} You can only close tickets assigned to you.")
+        if ticket.mentor_id != interaction.user.id:
+            await reply(interaction, f"{Emojis.ERROR} You can only close tickets assigned to you.", ephemeral=True)
             return
 
-        success = self.db.close_ticket(ticket_id)
+        success = await asyncio.to_thread(self.db.close_ticket, ticket_id)
         if not success:
-            await ctx.send(f"{Emojis.ERROR} Failed to close ticket. Please try again.")
+            await reply(interaction, f"{Emojis.ERROR} Failed to close ticket. Please try again.", ephemeral=True)
             return
 
         embed = discord.Embed(
@@ -152,55 +184,60 @@ class Mentor(commands.Cog):
             description=f"Ticket #{ticket_id} has been closed by mentor.",
             color=Colors.GRAY
         )
-        embed.add_field(name="Closed By", value=ctx.author.display_name, inline=True)
-        embed.add_field(name="Hacker", value=ticket['user_name'], inline=True)
-        embed.add_field(name="Title", value=ticket.get('title', 'No title'), inline=False)
-        embed.add_field(name="Closed At", value=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+        embed.add_field(name="Closed By", value=interaction.user.display_name, inline=True)
+        embed.add_field(name="Hacker", value=ticket.user_name, inline=True)
+        embed.add_field(name="Title", value=ticket.title, inline=False)
+        embed.add_field(name="Closed At", value=format_datetime(utcnow()), inline=True)
 
-        await ctx.send(embed=embed)
+        await reply(interaction, embed=embed)
 
         # notify the user
         try:
-            user = await self.bot.fetch_user(ticket['user_id'])
+            user = await self.bot.fetch_user(ticket.user_id)
             user_embed = discord.Embed(
                 title=Titles.TICKET_CLOSED,
                 description=f"Your ticket #{ticket_id} has been closed by your mentor.",
                 color=Colors.GRAY
             )
-            user_embed.add_field(name="Closed By", value=ctx.author.display_name, inline=True)
+            user_embed.add_field(name="Closed By", value=interaction.user.display_name, inline=True)
             await user.send(embed=user_embed)
         except:
             pass
 
-    @commands.command(name='assign')
-    async def assign_ticket(self, ctx, ticket_id: str, member: discord.Member):
+    @close_ticket.autocomplete('ticket_id')
+    async def close_ticket_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return await self.assigned_ticket_autocomplete(interaction, current)
+
+    @app_commands.command(name='assign', description="Assign a ticket to another mentor (Mentor only)")
+    @app_commands.describe(ticket_id="Ticket number", member="Mentor to hand the ticket to")
+    @interaction_handler(defer='reply', ephemeral=False)
+    async def assign_ticket(self, interaction: discord.Interaction, ticket_id: str, member: discord.Member):
         """Assign a ticket to another mentor (Mentor only)"""
-        if not self.is_mentor(ctx):
-            await ctx.send(f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.")
+        if not self.is_mentor(interaction):
+            await reply(interaction, f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.", ephemeral=True)
             return
 
-        mentor_role = discord.utils.get(ctx.guild.roles, name="Mentor")
-        if not mentor_role or mentor_role not in member.roles:
-            await ctx.send(f"{Emojis.ERROR} You can only assign tickets to other mentors.")
+        if not get_role_registry().is_mentor(member):
+            await reply(interaction, f"{Emojis.ERROR} You can only assign tickets to other mentors.", ephemeral=True)
             return
 
-        ticket = self.get_ticket_by_id(ticket_id)
+        ticket = await asyncio.to_thread(self.get_ticket_by_id, ticket_id)
 
         if not ticket:
-            await ctx.send(f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.")
+            await reply(interaction, f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.", ephemeral=True)
             return
 
-        if ticket['status'] != 'open':
-            await ctx.send(f"{Emojis.ERROR} This ticket is not open.")
+        if not ticket.is_open:
+            await reply(interaction, f"{Emojis.ERROR} This ticket is not open.", ephemeral=True)
             return
 
-        if ticket['mentor_id'] != ctx.author.id:
-            await ctx.send(f"{Emojis.ERROR} You can only reassign tickets assigned to you.")
+        if ticket.mentor_id != interaction.user.id:
+            await reply(interaction, f"{Emojis.ERROR} You can only reassign tickets assigned to you.", ephemeral=True)
             return
 
-        success = self.db.reassign_ticket(ticket_id, member.id, member.display_name)
+        success = await asyncio.to_thread(self.db.reassign_ticket, ticket_id, member.id, member.display_name)
         if not success:
-            await ctx.send(f"{Emojis.ERROR} Failed to reassign ticket. Please try again.")
+            await reply(interaction, f"{Emojis.ERROR} Failed to reassign ticket. Please try again.", ephemeral=True)
             return
 
         embed = discord.Embed(
@@ -208,11 +245,11 @@ class Mentor(commands.Cog):
             description=f"Ticket #{ticket_id} has been reassigned to {member.display_name}.",
             color=Colors.GREEN
         )
-        embed.add_field(name="Reassigned By", value=ctx.author.display_name, inline=True)
+        embed.add_field(name="Reassigned By", value=interaction.user.display_name, inline=True)
         embed.add_field(name="New Mentor", value=member.display_name, inline=True)
-        embed.add_field(name="Hacker", value=ticket['user_name'], inline=True)
+        embed.add_field(name="Hacker", value=ticket.user_name, inline=True)
 
-        await ctx.send(embed=embed)
+        await reply(interaction, embed=embed)
 
         # notify the new mentor
         try:
@@ -221,15 +258,15 @@ class Mentor(commands.Cog):
                 description=f"You have been assigned ticket #{ticket_id}",
                 color=Colors.GREEN
             )
-            mentor_embed.add_field(name="Hacker", value=ticket['user_name'], inline=True)
-            mentor_embed.add_field(name="Title", value=ticket.get('title', 'No title'), inline=False)
-            mentor_embed.add_field(name="Description", value=ticket['description'], inline=False)
+            mentor_embed.add_field(name="Hacker", value=ticket.user_name, inline=True)
+            mentor_embed.add_field(name="Title", value=ticket.title, inline=False)
+            mentor_embed.add_field(name="Description", value=ticket.description, inline=False)
             await member.send(embed=mentor_embed)
         except:
             pass
 
         try:
-            user = await self.bot.fetch_user(ticket['user_id'])
+            user = await self.bot.fetch_user(ticket.user_id)
             user_embed = discord.Embed(
                 title=Titles.TICKET_ASSIGNED,
                 description=f"Your ticket #{ticket_id} has been reassigned to a new mentor.",
@@ -240,14 +277,71 @@ class Mentor(commands.Cog):
         except:
             pass
 
-    @commands.command(name='my')
-    async def my_tickets(self, ctx):
+    @assign_ticket.autocomplete('ticket_id')
+    async def assign_ticket_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return await self.assigned_ticket_autocomplete(interaction, current)
+
+    @app_commands.command(name='suggest', description="Suggest the least-busy mentor for a ticket (Mentor only)")
+    @app_commands.describe(ticket_id="Ticket number")
+    @interaction_handler(defer='reply')
+    async def suggest_mentor(self, interaction: discord.Interaction, ticket_id: str):
+        """Suggest mentors with matching skills and the fewest active tickets (Mentor only)"""
+        if not self.is_mentor(interaction):
+            await reply(interaction, f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.", ephemeral=True)
+            return
+
+        ticket = self.index.get(ticket_id) or await asyncio.to_thread(self.get_ticket_by_id, ticket_id)
+        if not ticket:
+            await reply(interaction, f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.", ephemeral=True)
+            return
+
+        suggestions = suggest_mentors(interaction.guild, ticket.to_dict(), count=3)
+        if not suggestions:
+            await reply(interaction, f"{Emojis.INFO} No mentors are on the roster yet.", ephemeral=True)
+            return
+
+        tracker = get_mentor_load()
+        lines = [
+            f"<@{mentor_id}> · {load} active ticket(s)" if interaction.guild.get_member(mentor_id) else f"{tracker.name(mentor_id) or mentor_id} · {load} active ticket(s)"
+            for mentor_id, load in suggestions
+        ]
+        embed = discord.Embed(
+            title=f"{Emojis.SEARCH} Suggested mentors for ticket #{ticket.id}",
+            description="\n".join(lines),
+            color=Colors.BLUE
+        )
+        if ticket.categories:
+            embed.add_field(name="Categories", value=", ".join(ticket.categories), inline=False)
+
+        await reply(interaction, embed=embed, ephemeral=True)
+
+    @suggest_mentor.autocomplete('ticket_id')
+    async def suggest_mentor_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return await self.unassigned_ticket_autocomplete(interaction, current)
+
+    @app_commands.command(name='autoassign', description="Turn automatic assignment of new tickets on or off (Admin only)")
+    @app_commands.describe(enabled="Assign each new ticket to the least-busy mentor with matching skills")
+    @admin_only()
+    @interaction_handler(defer='reply')
+    async def auto_assign(self, interaction: discord.Interaction, enabled: bool):
+        """Toggle auto-assign mode (Admin only)"""
+        await asyncio.to_thread(self.db.set_dev_config, 'auto_assign', 'on' if enabled else 'off')
+        state = "enabled" if enabled else "disabled"
+        await reply(interaction, f"{Emojis.SUCCESS} Auto-assign {state}.", ephemeral=True)
+
+    @app_commands.command(name='my', description="View your assigned tickets (Mentor only)")
+    @app_commands.describe(include_archive="Also show tickets closed a while ago (slower)")
+    @interaction_handler(defer='reply')
+    async def my_tickets(self, interaction: discord.Interaction, include_archive: bool = False):
         """View your assigned tickets (Mentor only)"""
-        if not self.is_mentor(ctx):
-            await ctx.send(f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.")
+        if not self.is_mentor(interaction):
+            await reply(interaction, f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}.", ephemeral=True)
             return
 
-        mentor_tickets = self.db.get_mentor_tickets(ctx.author.id)
+        mentor_tickets = [
+            Ticket.from_dict(ticket)
+            for ticket in await asyncio.to_thread(self.db.get_mentor_tickets, interaction.user.id, include_archive, limit=25)
+        ]
 
         if not mentor_tickets:
             embed = discord.Embed(
@@ -255,7 +349,7 @@ class Mentor(commands.Cog):
                 description="You have no assigned tickets.",
                 color=Colors.GRAY
             )
-            await ctx.send(embed=embed)
+            await reply(interaction, embed=embed, ephemeral=True)
             return
 
         embed = discord.Embed(
@@ -265,22 +359,22 @@ class Mentor(commands.Cog):
         )
 
         for ticket in mentor_tickets:
-            status_emoji = Emojis.OPEN_TICKET if ticket['status'] == 'open' else Emojis.CLOSED_TICKET
+            status_emoji = Emojis.OPEN_TICKET if ticket.is_open else Emojis.CLOSED_TICKET
             
             categories_info = ""
-            if ticket.get('categories'):
-                categories_info = f"\n**Categories:** {', '.join(ticket['categories'])}"
+            if ticket.categories:
+                categories_info = f"\n**Categories:** {', '.join(ticket.categories)}"
             
-            title_info = f"\n**Title:** {ticket.get('title', 'No title')}"
-            location_info = f"\n**Location:** {ticket.get('location', 'No location')}"
+            title_info = f"\n**Title:** {ticket.title}"
+            location_info = f"\n**Location:** {ticket.location}"
             
             embed.add_field(
-                name=f"{status_emoji} Ticket #{ticket['id']}",
-                value=f"**Status:** {ticket['status'].title()}{title_info}{location_info}\n**Hacker:** {ticket['user_name']}\n**Description:** {ticket['description'][:100]}...{categories_info}\n**Created:** {ticket['created_at'][:10]}",
+                name=f"{status_emoji} Ticket #{ticket.id}",
+                value=f"**Status:** {ticket.status.value.title()}{title_info}{location_info}\n**Hacker:** {ticket.user_name}\n**Description:** {ticket.description[:100]}...{categories_info}\n**Created:** {format_date(ticket.created)}",
                 inline=False
             )
 
-        await ctx.send(embed=embed)
+        await reply(interaction, embed=embed, ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(Mentor(bot))
@@ -0,0 +1,58 @@
+import asyncio
+import discord
+from discord import app_commands
+from discord.ext import commands
+from utils.roles import admin_only, get_role_registry
+from utils.interactions import interaction_handler, reply
+from utils.styles import Colors, Emojis, Titles
+
+class Roles(commands.Cog):
+    """
+    Keeps the role registry in step with guild role changes and lets admins pick the role names.
+    """
+    def __init__(self, bot):
+        self.bot = bot
+        self.registry = get_role_registry()
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        # resolve the new guild's roles before its first command checks them on the event loop
+        await asyncio.to_thread(self.registry.warm, [guild])
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name:
+            await asyncio.to_thread(self.registry.on_role_renamed, after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.registry.on_role_changed(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self.registry.on_role_changed(role)
+
+    @app_commands.command(name='roles', description="Choose which roles count as Mentor and Admin (Admin only)")
+    @app_commands.describe(mentor_role="Role that can accept and resolve tickets", admin_role="Role that can configure the bot")
+    @admin_only()
+    @interaction_handler(defer='reply')
+    async def configure_roles(self, interaction: discord.Interaction, mentor_role: discord.Role = None, admin_role: discord.Role = None):
+        """Configure the mentor and admin role names (Admin only)"""
+        if mentor_role:
+            await asyncio.to_thread(self.registry.set_name, interaction.guild_id, 'mentor', mentor_role.name)
+        if admin_role:
+            await asyncio.to_thread(self.registry.set_name, interaction.guild_id, 'admin', admin_role.name)
+
+        names = self.registry.names(interaction.guild_id)
+        embed = discord.Embed(
+            title=Titles.CONFIG_SUCCESS,
+            description="Role configuration:",
+            color=Colors.GREEN
+        )
+        embed.add_field(name="Mentor Role", value=names['mentor'], inline=True)
+        embed.add_field(name="Admin Role", value=names['admin'], inline=True)
+
+        await reply(interaction, embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Roles(bot))
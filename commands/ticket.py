@@ -1,13 +1,22 @@
+import asyncio
 import discord
+from discord import app_commands
 from discord.ext import commands
-import json
-import os
-from datetime import datetime
-import asyncio
-from utils.db import get_firebase_db, categories
+from typing import List, Optional
+from utils.db import get_firebase_db
+from utils.categories import get_category_catalogue
+from utils.ticket_index import get_ticket_index
+from utils.ticket_messages import get_ticket_messages
+from utils.ticket_model import Ticket as TicketRecord
+from utils.search import get_search_index
+from utils.roles import admin_only, get_role_registry
+from utils.autocomplete import ticket_choices
+from utils.timestamps import utcnow, format_date, format_datetime
+from utils.interactions import interaction_handler, reply
 from utils.styles import Colors, Emojis, Titles, Messages, Footers
 from views.create_ticket import (
-    TicketCreateModal, CategorySelectionView, PublicCategorySelectionView
+    TicketCreateModal, CategorySelectionView, PublicCategorySelectionView,
+    open_ticket_count, picker_retry_after, rate_limited_embed
 )
 from views.manage_ticket import AcceptTicketView, notify_mentors
 from views.mentor_action import MentorActionView
@@ -21,64 +30,87 @@ class Ticket(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = get_firebase_db()
+        self.index = get_ticket_index()
 
-    def get_ticket_by_id(self, ticket_id):
+    def get_ticket_by_id(self, ticket_id) -> Optional[TicketRecord]:
         """Get ticket by ID"""
-        return self.db.get_ticket_by_id(ticket_id)
+        ticket = self.db.get_ticket_by_id(ticket_id)
+        return TicketRecord.from_dict(ticket) if ticket else None
 
-    def get_user_tickets(self, user_id):
-        """Get all tickets for a specific user"""
-        return self.db.get_user_tickets(user_id)
+    def get_user_tickets(self, user_id, include_archive=False, limit=None) -> List[TicketRecord]:
+        """Get a user's tickets, newest first"""
+        return [TicketRecord.from_dict(ticket) for ticket in self.db.get_user_tickets(user_id, include_archive, limit)]
 
     def get_open_tickets(self):
         """Get all open tickets"""
         return self.db.get_open_tickets()
 
-    @commands.command(name='create')
-    async def create_ticket(self, ctx):
+    def is_mentor(self, interaction: discord.Interaction):
+        """Check if user has mentor role"""
+        return get_role_registry().is_mentor(interaction.user)
+
+    async def own_ticket_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Suggest the caller's open tickets from the in-memory index"""
+        return ticket_choices(self.index.user_tickets(interaction.user.id), current)
+
+    async def visible_ticket_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Mentors see every open ticket, hackers only their own"""
+        if self.is_mentor(interaction):
+            return ticket_choices(self.index.open_tickets(), current)
+        return ticket_choices(self.index.user_tickets(interaction.user.id), current)
+
+    @app_commands.command(name='create', description="Create a new ticket with category selection")
+    @interaction_handler(defer='reply')
+    async def create_ticket(self, interaction: discord.Interaction):
         """Create a new ticket with category selection"""
-        ticket_channel_id = self.db.get_dev_config('ticket_channel')
-        if ticket_channel_id and str(ctx.channel.id) != ticket_channel_id:
+        retry_after = picker_retry_after(interaction.user.id, interaction.guild_id)
+        if retry_after:
+            await reply(interaction, embed=rate_limited_embed(retry_after), ephemeral=True)
+            return
+
+        ticket_channel_id = await asyncio.to_thread(self.db.get_dev_config, 'ticket_channel')
+        if ticket_channel_id and str(interaction.channel_id) != ticket_channel_id:
             embed = discord.Embed(
                 title=Titles.WRONG_CHANNEL,
                 description=Messages.WRONG_CHANNEL_MSG,
                 color=Colors.RED
             )
-            await ctx.send(embed=embed)
+            await reply(interaction, embed=embed, ephemeral=True)
             return
 
-        user_tickets = self.get_user_tickets(ctx.author.id)
-        open_tickets = [t for t in user_tickets if t['status'] == 'open']
-        
-        if len(open_tickets) > 5:
+        if await open_ticket_count(interaction.user.id) > 5:
             embed = discord.Embed(
                 title=Titles.TOO_MANY_TICKETS,
                 description=Messages.TOO_MANY_TICKETS_MSG,
                 color=Colors.RED
             )
-            await ctx.send(embed=embed)
+            await reply(interaction, embed=embed, ephemeral=True)
             return
 
-        view = CategorySelectionView(ctx.author.id)
+        catalogue = await asyncio.to_thread(get_category_catalogue().get, interaction.guild_id)
+        view = CategorySelectionView(interaction.user.id, catalogue)
         embed = discord.Embed(
             title="Need 1:1 mentor help?",
-            description="Select a technology you need help with and follow the instructions!",
+            description="Select the area you need help with, then the technology, and follow the instructions!",
             color=Colors.GREEN
         )
-        await ctx.send(embed=embed, view=view)
+        await reply(interaction, embed=embed, view=view, ephemeral=True)
 
-    @commands.command(name='list')
-    async def list_tickets(self, ctx):
+    @app_commands.command(name='list', description="List your tickets")
+    @app_commands.describe(include_archive="Also show tickets closed a while ago (slower)")
+    @interaction_handler(defer='reply')
+    async def list_tickets(self, interaction: discord.Interaction, include_archive: bool = False):
         """List your tickets"""
-        user_tickets = self.get_user_tickets(ctx.author.id)
-        
+        # embeds hold at most 25 fields
+        user_tickets = await asyncio.to_thread(self.get_user_tickets, interaction.user.id, include_archive, limit=25)
+
         if not user_tickets:
             embed = discord.Embed(
                 title=Titles.YOUR_TICKETS,
                 description=Messages.NO_TICKETS,
                 color=Colors.GRAY
             )
-            await ctx.send(embed=embed)
+            await reply(interaction, embed=embed, ephemeral=True)
             return
 
         embed = discord.Embed(
@@ -88,84 +120,89 @@ class Ticket(commands.Cog):
         )
 
         for ticket in user_tickets:
-            status_emoji = Emojis.OPEN_TICKET if ticket['status'] == 'open' else Emojis.CLOSED_TICKET
-            mentor_info = f"Assigned to {ticket['mentor_name']}" if ticket['mentor_name'] else "Unassigned"
-            
+            status_emoji = Emojis.OPEN_TICKET if ticket.is_open else Emojis.CLOSED_TICKET
+            mentor_info = f"Assigned to {ticket.mentor_name}" if ticket.mentor_name else "Unassigned"
+
             categories_info = ""
-            if ticket.get('categories'):
-                categories_info = f"\n**Categories:** {', '.join(ticket['categories'])}"
-            
-            title_info = f"\n**Title:** {ticket.get('title', 'No title')}"
-            location_info = f"\n**Location:** {ticket.get('location', 'No location')}"
-            
+            if ticket.categories:
+                categories_info = f"\n**Categories:** {', '.join(ticket.categories)}"
+
+            title_info = f"\n**Title:** {ticket.title}"
+            location_info = f"\n**Location:** {ticket.location}"
+
             embed.add_field(
-                name=f"{status_emoji} Ticket #{ticket['id']}",
-                value=f"**Status:** {ticket['status'].title()}{title_info}{location_info}\n**Description:** {ticket['description'][:100]}...\n**Mentor:** {mentor_info}{categories_info}\n**Created:** {ticket['created_at'][:10]}",
+                name=f"{status_emoji} Ticket #{ticket.id}",
+                value=f"**Status:** {ticket.status.value.title()}{title_info}{location_info}\n**Description:** {ticket.description[:100]}...\n**Mentor:** {mentor_info}{categories_info}\n**Created:** {format_date(ticket.created)}",
                 inline=False
             )
 
-        await ctx.send(embed=embed)
+        await reply(interaction, embed=embed, ephemeral=True)
 
-    @commands.command(name='info')
-    async def ticket_info(self, ctx, ticket_id: str):
+    @app_commands.command(name='info', description="Get detailed information about a ticket")
+    @app_commands.describe(ticket_id="Ticket number")
+    @interaction_handler(defer='reply')
+    async def ticket_info(self, interaction: discord.Interaction, ticket_id: str):
         """Get detailed information about a ticket"""
-        ticket = self.get_ticket_by_id(ticket_id)
-        
+        ticket = await asyncio.to_thread(self.get_ticket_by_id, ticket_id)
+
         if not ticket:
-            await ctx.send(f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.")
+            await reply(interaction, f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.", ephemeral=True)
             return
 
-        mentor_role = discord.utils.get(ctx.guild.roles, name="Mentor")
-        is_mentor = mentor_role and mentor_role in ctx.author.roles
-        
-        if ticket['user_id'] != ctx.author.id and not is_mentor:
-            await ctx.send(f"{Emojis.ERROR} You can only view your own tickets.")
+        if ticket.user_id != interaction.user.id and not self.is_mentor(interaction):
+            await reply(interaction, f"{Emojis.ERROR} You can only view your own tickets.", ephemeral=True)
             return
 
         embed = discord.Embed(
-            title=f"{Emojis.TICKET} Ticket #{ticket['id']}",
-            color=Colors.GREEN if ticket['status'] == 'open' else Colors.RED_STATUS
+            title=f"{Emojis.TICKET} Ticket #{ticket.id}",
+            color=Colors.GREEN if ticket.is_open else Colors.RED
         )
-        
-        embed.add_field(name="Status", value=ticket['status'].title(), inline=True)
-        embed.add_field(name="Created By", value=ticket['user_name'], inline=True)
-        embed.add_field(name="Title", value=ticket.get('title', 'No title'), inline=False)
-        embed.add_field(name="Location", value=ticket.get('location', 'No location'), inline=True)
-        embed.add_field(name="Description", value=ticket['description'], inline=False)
-        
-        if ticket.get('categories'):
-            embed.add_field(name="Categories", value=", ".join(ticket['categories']), inline=False)
-        
-        embed.add_field(name="Created", value=ticket['created_at'], inline=True)
-        
-        if ticket['mentor_name']:
-            embed.add_field(name="Assigned Mentor", value=ticket['mentor_name'], inline=True)
-        
-        if ticket['closed_at']:
-            embed.add_field(name="Closed", value=ticket['closed_at'], inline=True)
-
-        await ctx.send(embed=embed)
-
-    @commands.command(name='close_ticket')
-    async def close_ticket(self, ctx, ticket_id: str):
+
+        embed.add_field(name="Status", value=ticket.status.value.title(), inline=True)
+        embed.add_field(name="Created By", value=ticket.user_name, inline=True)
+        embed.add_field(name="Title", value=ticket.title, inline=False)
+        embed.add_field(name="Location", value=ticket.location, inline=True)
+        embed.add_field(name="Description", value=ticket.description, inline=False)
+
+        if ticket.categories:
+            embed.add_field(name="Categories", value=", ".join(ticket.categories), inline=False)
+
+        embed.add_field(name="Created", value=format_datetime(ticket.created), inline=True)
+
+        if ticket.mentor_name:
+            embed.add_field(name="Assigned Mentor", value=ticket.mentor_name, inline=True)
+
+        if ticket.closed:
+            embed.add_field(name="Closed", value=format_datetime(ticket.closed), inline=True)
+
+        await reply(interaction, embed=embed, ephemeral=True)
+
+    @ticket_info.autocomplete('ticket_id')
+    async def ticket_info_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return await self.visible_ticket_autocomplete(interaction, current)
+
+    @app_commands.command(name='close_ticket', description="Close one of your tickets")
+    @app_commands.describe(ticket_id="Ticket number")
+    @interaction_handler(defer='reply', ephemeral=False)
+    async def close_ticket(self, interaction: discord.Interaction, ticket_id: str):
         """Close a ticket"""
-        ticket = self.get_ticket_by_id(ticket_id)
-        
+        ticket = await asyncio.to_thread(self.get_ticket_by_id, ticket_id)
+
         if not ticket:
-            await ctx.send(f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.")
+            await reply(interaction, f"{Emojis.ERROR} {Messages.TICKET_NOT_FOUND_MSG}.", ephemeral=True)
             return
 
-        if ticket['user_id'] != ctx.author.id:
-            await ctx.send(f"{Emojis.ERROR} You can only close your own tickets.")
+        if ticket.user_id != interaction.user.id:
+            await reply(interaction, f"{Emojis.ERROR} You can only close your own tickets.", ephemeral=True)
             return
 
-        if ticket['status'] == 'closed':
-            await ctx.send(f"{Emojis.ERROR} This ticket is already closed.")
+        if not ticket.is_open:
+            await reply(interaction, f"{Emojis.ERROR} This ticket is already closed.", ephemeral=True)
             return
 
-        success = self.db.close_ticket(ticket_id)
+        success = await asyncio.to_thread(self.db.close_ticket, ticket_id)
         if not success:
-            await ctx.send(f"{Emojis.ERROR} Failed to close ticket. Please try again.")
+            await reply(interaction, f"{Emojis.ERROR} Failed to close ticket. Please try again.", ephemeral=True)
             return
 
         embed = discord.Embed(
@@ -173,19 +210,78 @@ class Ticket(commands.Cog):
             description=f"Ticket #{ticket_id} has been closed.",
             color=Colors.GRAY
         )
-        embed.add_field(name="Closed By", value=ctx.author.display_name, inline=True)
-        embed.add_field(name="Closed At", value=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), inline=True)
-        
-        await ctx.send(embed=embed)
-
-    @commands.command(name='config')
-    @commands.has_permissions(administrator=True)
-    async def config_channels(self, ctx, ticket_channel: discord.TextChannel, mentor_channel: discord.TextChannel):
+        embed.add_field(name="Closed By", value=interaction.user.display_name, inline=True)
+        embed.add_field(name="Closed At", value=format_datetime(utcnow()), inline=True)
+
+        await reply(interaction, embed=embed)
+
+    @close_ticket.autocomplete('ticket_id')
+    async def close_ticket_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return await self.own_ticket_autocomplete(interaction, current)
+
+    @app_commands.command(name='search', description="Search tickets by title, description and location (Mentor only)")
+    @app_commands.describe(terms="Words to look for", category="Only tickets in this category", status="Only open or closed tickets")
+    @app_commands.choices(status=[
+        app_commands.Choice(name="Open", value="open"),
+        app_commands.Choice(name="Closed", value="closed")
+    ])
+    @interaction_handler
+    async def search_tickets(self, interaction: discord.Interaction, terms: str, category: str = None, status: str = None):
+        """Search tickets from the in-memory index (Mentor only)"""
+        if not self.is_mentor(interaction):
+            await reply(interaction, f"{Emojis.ERROR} {Messages.MENTOR_ROLE_REQUIRED}", ephemeral=True)
+            return
+
+        results = get_search_index().search(terms, category=category, status=status)
+
+        if not results:
+            embed = discord.Embed(
+                title=Titles.SEARCH_RESULTS,
+                description=f"{Messages.NO_SEARCH_RESULTS} `{terms}`.",
+                color=Colors.GRAY
+            )
+            await reply(interaction, embed=embed, ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title=Titles.SEARCH_RESULTS,
+            description=f"Top {len(results)} match(es) for `{terms}`:",
+            color=Colors.DEFAULT
+        )
+
+        for score, ticket in results:
+            status_emoji = Emojis.OPEN_TICKET if ticket['status'] == 'open' else Emojis.CLOSED_TICKET
+            mentor_info = ticket['mentor_name'] or "Unassigned"
+            categories_info = f"\n**Categories:** {', '.join(ticket['categories'])}" if ticket['categories'] else ""
+
+            embed.add_field(
+                name=f"{status_emoji} Ticket #{ticket['id']} · {ticket['title']}"[:256],
+                value=f"**Hacker:** {ticket['user_name']}\n**Location:** {ticket['location']}\n**Mentor:** {mentor_info}{categories_info}",
+                inline=False
+            )
+
+        await reply(interaction, embed=embed, ephemeral=True)
+
+    @search_tickets.autocomplete('category')
+    async def search_category_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        current = current.lower()
+        catalogue = await asyncio.to_thread(get_category_catalogue().get, interaction.guild_id)
+        return [
+            app_commands.Choice(name=category, value=category)
+            for category in catalogue.names
+            if current in category.lower()
+        ][:25]
+
+    @app_commands.command(name='config', description="Configure bot channels (Admin only)")
+    @app_commands.describe(ticket_channel="Where hackers create tickets", mentor_channel="Where mentors are notified")
+    @admin_only()
+    @interaction_handler(defer='reply', ephemeral=False)
+    async def config_channels(self, interaction: discord.Interaction, ticket_channel: discord.TextChannel, mentor_channel: discord.TextChannel):
         """Configure bot channels (Admin only)"""
         try:
-            self.db.set_dev_config('ticket_channel', str(ticket_channel.id))
-            self.db.set_dev_config('mentor_channel', str(mentor_channel.id))
-            
+            await asyncio.to_thread(self.db.set_dev_config, 'ticket_channel', str(ticket_channel.id))
+            await asyncio.to_thread(self.db.set_dev_config, 'mentor_channel', str(mentor_channel.id))
+
             embed = discord.Embed(
                 title=Titles.CONFIG_SUCCESS,
                 description="Bot channels configured successfully!",
@@ -193,43 +289,48 @@ class Ticket(commands.Cog):
             )
             embed.add_field(name="Ticket Channel", value=ticket_channel.mention, inline=True)
             embed.add_field(name="Mentor Channel", value=mentor_channel.mention, inline=True)
-            
-            await ctx.send(embed=embed)
+
+            await reply(interaction, embed=embed)
         except Exception as e:
-            await ctx.send(f"{Emojis.ERROR} Failed to configure channels: {e}")
+            await reply(interaction, f"{Emojis.ERROR} Failed to configure channels: {e}", ephemeral=True)
 
-    @commands.command(name='post')
-    @commands.has_permissions(administrator=True)
-    async def post_ticket_interface(self, ctx):
+    @app_commands.command(name='post', description="Post the interactive ticket creation interface (Admin only)")
+    @admin_only()
+    @interaction_handler(defer='reply', ephemeral=False)
+    async def post_ticket_interface(self, interaction: discord.Interaction):
         """Post the interactive ticket creation interface (Admin only)"""
         embed = discord.Embed(
             title="Need 1:1 mentor help?",
-            description="Select a technology you need help with and follow the instructions!",
+            description="Select the area you need help with, then the technology, and follow the instructions!",
             color=Colors.GREEN
         )
-        
-        view = PublicCategorySelectionView()
-        
-        await ctx.send(embed=embed, view=view)
-
-    @commands.command(name='setup')
-    @commands.has_permissions(administrator=True)
-    async def setup(self, ctx):
+
+        catalogue = await asyncio.to_thread(get_category_catalogue().get, interaction.guild_id)
+        view = PublicCategorySelectionView(catalogue)
+
+        message = await reply(interaction, embed=embed, view=view)
+        # so /category can update it when groups change
+        get_ticket_messages().record_interface(message)
+
+    @app_commands.command(name='setup', description="Interactive channel setup using dropdowns (Admin only)")
+    @admin_only()
+    @interaction_handler(defer='reply', ephemeral=False)
+    async def setup(self, interaction: discord.Interaction):
         """Interactive channel setup using dropdowns (Admin only)"""
         try:
-            self.db.set_dev_config('counter', '0')
+            await asyncio.to_thread(self.db.set_dev_config, 'counter', '0')
         except:
-            pass 
-        
+            pass
+
         embed = discord.Embed(
             title="🔧 Configure Mentorship Channels",
             description="Ticket creation channel: This will be where hackers can post tickets.\nMentor notification channel: This will be where mentors can accept and resolve open tickets.",
             color=Colors.GREEN
         )
-        
+
         view = ChannelSetupView()
-        
-        await ctx.send(embed=embed, view=view)
+
+        await reply(interaction, embed=embed, view=view)
 
 async def setup(bot):
     await bot.add_cog(Ticket(bot))
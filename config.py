@@ -15,8 +15,81 @@ class Config:
     FIREBASE_CREDENTIALS = os.getenv("FIREBASE_CREDENTIALS")  # JSON string
     
     # bot settings
-    COMMAND_PREFIX = os.getenv("COMMAND_PREFIX", "!")
+    ENABLE_MEMBERS_INTENT = os.getenv("ENABLE_MEMBERS_INTENT", "false").lower() == "true"
+    SYNC_COMMANDS_ON_STARTUP = os.getenv("SYNC_COMMANDS_ON_STARTUP", "true").lower() == "true"
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json (Cloud Logging) or text
+    
+    # startup
+    STARTUP_TARGET_SECONDS = float(os.getenv("STARTUP_TARGET_SECONDS", "10"))
+    
+    # health and shutdown (Cloud Run sets PORT and allows 10s after SIGTERM)
+    PORT = int(os.getenv("PORT", "8080"))
+    SHUTDOWN_GRACE_SECONDS = float(os.getenv("SHUTDOWN_GRACE_SECONDS", "8"))
+    DB_PROBE_INTERVAL_SECONDS = float(os.getenv("DB_PROBE_INTERVAL_SECONDS", "10"))
+    
+    # leader election: only the lease holder connects to the gateway and runs singleton jobs
+    LEADER_ELECTION = os.getenv("LEADER_ELECTION", "true").lower() == "true"  # false: single instance, local lease
+    LEASE_TTL_SECONDS = float(os.getenv("LEASE_TTL_SECONDS", "15"))
+    LEASE_RENEW_SECONDS = float(os.getenv("LEASE_RENEW_SECONDS", "5"))
+    
+    # ticket creation rate limits (token buckets, charged per ticket created)
+    TICKET_RATE_USER_PER_MINUTE = float(os.getenv("TICKET_RATE_USER_PER_MINUTE", "6"))
+    TICKET_RATE_USER_BURST = float(os.getenv("TICKET_RATE_USER_BURST", "4"))
+    TICKET_RATE_GUILD_PER_MINUTE = float(os.getenv("TICKET_RATE_GUILD_PER_MINUTE", "300"))
+    TICKET_RATE_GUILD_BURST = float(os.getenv("TICKET_RATE_GUILD_BURST", "50"))
+    # opening the ticket flow (public dropdown, /create), charged per open so hammering the picker is throttled too
+    TICKET_PICKER_RATE_USER_PER_MINUTE = float(os.getenv("TICKET_PICKER_RATE_USER_PER_MINUTE", "12"))
+    TICKET_PICKER_RATE_USER_BURST = float(os.getenv("TICKET_PICKER_RATE_USER_BURST", "6"))
+    TICKET_PICKER_RATE_GUILD_PER_MINUTE = float(os.getenv("TICKET_PICKER_RATE_GUILD_PER_MINUTE", "600"))
+    TICKET_PICKER_RATE_GUILD_BURST = float(os.getenv("TICKET_PICKER_RATE_GUILD_BURST", "100"))
+    
+    # near-duplicate detection (Jaccard similarity of word shingles)
+    DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.5"))
+    
+    # storage calls: attempts and overall deadline while a user waits (Discord allows 3s to respond)
+    STORAGE_ATTEMPTS = int(os.getenv("STORAGE_ATTEMPTS", "3"))
+    STORAGE_DEADLINE_SECONDS = float(os.getenv("STORAGE_DEADLINE_SECONDS", "2"))
+    STORAGE_BACKGROUND_DEADLINE_SECONDS = float(os.getenv("STORAGE_BACKGROUND_DEADLINE_SECONDS", "15"))
+    
+    # local write-behind journal and ticket cache (SQLite); keep it on a persistent volume if you have one
+    JOURNAL_PATH = os.getenv("JOURNAL_PATH", "journal.sqlite3")
+    # minimum seconds to spend pushing unflushed writes to Firestore during shutdown (it also gets whatever the drain leaves of SHUTDOWN_GRACE_SECONDS)
+    JOURNAL_FLUSH_SECONDS = float(os.getenv("JOURNAL_FLUSH_SECONDS", "1.5"))
+    
+    # hot/cold tiering: closed tickets older than this move to the tickets_archive collection, checked every interval
+    ARCHIVE_AFTER_HOURS = float(os.getenv("ARCHIVE_AFTER_HOURS", "1"))
+    ARCHIVE_INTERVAL_MINUTES = float(os.getenv("ARCHIVE_INTERVAL_MINUTES", "15"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "200"))
+    
+    # schema migrations (migrate.py): Firestore reads plus writes per second, so a run leaves room for live traffic
+    MIGRATION_OPS_PER_SECOND = float(os.getenv("MIGRATION_OPS_PER_SECOND", "100"))
+    
+    # mentor-channel notifications: above this many new tickets per minute they are posted as digests,
+    # each digest waiting at most NOTIFY_DIGEST_MAX_DELAY_SECONDS or until it holds NOTIFY_DIGEST_MAX_TICKETS
+    NOTIFY_DIGEST_RATE_PER_MINUTE = int(os.getenv("NOTIFY_DIGEST_RATE_PER_MINUTE", "10"))
+    NOTIFY_DIGEST_MAX_DELAY_SECONDS = float(os.getenv("NOTIFY_DIGEST_MAX_DELAY_SECONDS", "5"))
+    NOTIFY_DIGEST_MAX_TICKETS = int(os.getenv("NOTIFY_DIGEST_MAX_TICKETS", "10"))
+    
+    # escalation of unaccepted tickets, in minutes after posting (0 skips a step): re-ping mentors,
+    # then ping the ticket's category leads, then alert organisers (the admin role)
+    ESCALATE_REPING_MINUTES = float(os.getenv("ESCALATE_REPING_MINUTES", "5"))
+    ESCALATE_LEADS_MINUTES = float(os.getenv("ESCALATE_LEADS_MINUTES", "15"))
+    ESCALATE_ORGANISERS_MINUTES = float(os.getenv("ESCALATE_ORGANISERS_MINUTES", "30"))
+    
+    # minimum seconds between edits of the pinned mentor-queue dashboard
+    DASHBOARD_EDIT_SECONDS = float(os.getenv("DASHBOARD_EDIT_SECONDS", "5"))
+    
+    # how long a guild's category catalogue is cached before it is re-read
+    CATEGORY_CACHE_SECONDS = float(os.getenv("CATEGORY_CACHE_SECONDS", "300"))
+    # how long dev configs (channels, role names, auto-assign) are served from memory; preloaded at startup
+    DEV_CONFIG_CACHE_SECONDS = float(os.getenv("DEV_CONFIG_CACHE_SECONDS", "60"))
+    
+    # tracing: share of interactions traced (changeable with /trace_sample) and where spans go (empty, the default, disables)
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+    TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+    # the export file is rotated to <path>.1 at this size; 0 never rotates
+    TRACE_EXPORT_MAX_MB = float(os.getenv("TRACE_EXPORT_MAX_MB", "20"))
     
     @classmethod
     def validate(cls):
@@ -26,8 +99,11 @@ class Config:
         if not cls.DISCORD_TOKEN:
             errors.append("DISCORD_TOKEN is required")
         
-        if not any([cls.FIREBASE_CREDENTIALS_PATH, cls.FIREBASE_PROJECT_ID, cls.FIREBASE_CREDENTIALS]):
-            errors.append("Firebase credentials not provided. Set FIREBASE_CREDENTIALS_PATH, FIREBASE_PROJECT_ID, or FIREBASE_CREDENTIALS")
+        if not cls.FIREBASE_PROJECT_ID:
+            errors.append("FIREBASE_PROJECT_ID is required")
+        
+        if not any([cls.FIREBASE_CREDENTIALS_PATH, cls.FIREBASE_CREDENTIALS]):
+            errors.append("Either FIREBASE_CREDENTIALS or FIREBASE_CREDENTIALS_PATH must be set")
         
         return errors
     
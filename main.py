@@ -1,120 +1,276 @@
+import time
+_process_started = time.perf_counter()
+
 import os
+import signal
+import asyncio
+import logging
 import discord
+from discord import app_commands
 from discord.ext import commands
-from dotenv import load_dotenv
-import logging
-import ssl
-import certifi
-import json
+from config import Config
+from utils.log import setup_logging
+from utils.startup import StartupReport
+from utils.lifecycle import get_lifecycle
+from utils.health import HealthServer, CachedProbe
+from utils.tracing import get_tracer, trace_http
+from utils.leader import LeaderElector, LocalLeaseStore
+from utils.dashboard import init_dashboard
+from utils.escalation import init_escalations
+from utils.roles import admin_only
 from utils.styles import Colors, Emojis, Titles, Messages, Footers
 
-load_dotenv()
+setup_logging(Config.LOG_LEVEL, Config.LOG_FORMAT)
+logger = logging.getLogger('discord')
 
-# Environment variables
-TOKEN = os.getenv("DISCORD_TOKEN")
-FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH")
-FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID")
-FIREBASE_CREDENTIALS_JSON = os.getenv("FIREBASE_CREDENTIALS")
+# set in main() once storage is up; followers wait on it until they are elected
+elector: LeaderElector = None
+# scheduled archiving of closed tickets, started once the leader is ready
+archiver: asyncio.Task = None
+# storage half of the warm-up, started as soon as we are elected so it overlaps the gateway handshake
+warmup: asyncio.Task = None
+# set once every cache is warm; /readyz reports unavailable until then
+warmed = asyncio.Event()
 
-# Validate required environment variables
-if not TOKEN:
-    raise ValueError("DISCORD_TOKEN environment variable is required")
+startup = StartupReport(Config.STARTUP_TARGET_SECONDS, started_at=_process_started)
+lifecycle = get_lifecycle()
 
-if not FIREBASE_PROJECT_ID:
-    raise ValueError("FIREBASE_PROJECT_ID environment variable is required")
+# bot setup: slash commands only, so no message content and no message events
+intents = discord.Intents.default()
+intents.messages = False
+intents.message_content = False
+intents.guilds = True
+intents.reactions = True
+# privileged; needed to see idle mentors who haven't used a mentor command yet
+intents.members = Config.ENABLE_MEMBERS_INTENT
 
-# Validate Firebase credentials
-if FIREBASE_CREDENTIALS_JSON:
-    credentials_path = "/tmp/firebase-credentials.json"
-    with open(credentials_path, 'w') as f:
-        json.dump(json.loads(FIREBASE_CREDENTIALS_JSON), f)
-    FIREBASE_CREDENTIALS_PATH = credentials_path
-elif not FIREBASE_CREDENTIALS_PATH:
-    raise ValueError("Either FIREBASE_CREDENTIALS or FIREBASE_CREDENTIALS_PATH must be set")
+# title of the public ticket interface, used to find one that is already posted
+INTERFACE_TITLE = "Need 1:1 mentor help?"
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger('discord')
+bot = commands.Bot(command_prefix=commands.when_mentioned, intents=intents, help_command=None)
+trace_http(bot.http)
+dashboard = init_dashboard(bot, Config.DASHBOARD_EDIT_SECONDS)
+escalations = init_escalations(bot, [
+    ('reping', Config.ESCALATE_REPING_MINUTES),
+    ('leads', Config.ESCALATE_LEADS_MINUTES),
+    ('organisers', Config.ESCALATE_ORGANISERS_MINUTES)
+])
 
-# initialize firebase
-from utils.db import init_firebase_db
-init_firebase_db(FIREBASE_CREDENTIALS_PATH, FIREBASE_PROJECT_ID)
-logger.info("Firebase database initialized successfully")
+def validate_environment():
+    """Validate required environment variables before any network work starts"""
+    errors = Config.validate()
+    if errors:
+        raise ValueError("; ".join(errors))
 
-# bot setup
-intents = discord.Intents.default()
-intents.messages = True
-intents.message_content = True
-intents.guilds = True
-intents.reactions = True
+def init_database(journal_path: str = Config.JOURNAL_PATH, client=None):
+    """Initialize Firebase (runs in a worker thread so the heavy SDK import overlaps the gateway login)"""
+    from utils.db import init_firebase_db
+    init_firebase_db(
+        Config.FIREBASE_CREDENTIALS_PATH,
+        Config.FIREBASE_PROJECT_ID,
+        Config.FIREBASE_CREDENTIALS,
+        journal_path,
+        client=client,
+        config_ttl=Config.DEV_CONFIG_CACHE_SECONDS
+    )
+    from utils.db import get_firebase_db
+    from utils.ticket_index import get_ticket_index
+    from utils.search import get_search_index
+    from utils.duplicates import get_duplicate_detector
+    from utils.mentor_load import get_mentor_load
+    get_firebase_db().add_listener(get_ticket_index().apply)
+    get_firebase_db().add_listener(get_search_index().apply)
+    get_firebase_db().add_listener(get_duplicate_detector().apply)
+    get_firebase_db().add_listener(get_mentor_load().apply)
+    logger.info("Firebase database initialized successfully")
+
+def register_persistent_views():
+    """Handle components on messages posted before this process started: the ticket interface, accept buttons and the DM ticket actions"""
+    from views.create_ticket import PublicCategorySelectionView
+    from views.manage_ticket import AcceptTicketButton, DigestAcceptButton
+    from views.mentor_action import ResolveTicketButton, ReassignTicketButton
+    from views.hacker_action import CloseTicketButton
+    from utils.categories import get_category_catalogue
+    # the select's callback reads the guild's catalogue, so the defaults do here
+    bot.add_view(PublicCategorySelectionView(get_category_catalogue().get(None)))
+    bot.add_dynamic_items(AcceptTicketButton, DigestAcceptButton, ResolveTicketButton, ReassignTicketButton, CloseTicketButton)
 
-# Configure SSL context
-ssl_context = ssl.create_default_context(cafile=certifi.where())
-ssl_context.check_hostname = False
-ssl_context.verify_mode = ssl.CERT_NONE
+def database_reachable() -> bool:
+    """Blocking Firestore connectivity check used by /readyz"""
+    from utils.db import firebase_db
+    return firebase_db is not None and firebase_db.ping()
 
-bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
+async def gateway_ready() -> bool:
+    # followers don't own the gateway; they stay ready to serve HTTP and health traffic
+    if elector is not None and not elector.is_leader and not elector.lost.is_set():
+        return True
+    return bot.is_ready() and not bot.is_closed()
+
+async def accepting_work() -> bool:
+    return lifecycle.accepting
+
+async def caches_warm() -> bool:
+    # followers warm up once elected
+    if elector is not None and not elector.is_leader and not elector.lost.is_set():
+        return True
+    return warmed.is_set()
 
 @bot.event
 async def on_ready():
     """Called when the bot is ready"""
+    global archiver
     logger.info(f'{bot.user} has connected to Discord!')
     logger.info(f'Bot is in {len(bot.guilds)} guilds')
     
-    await bot.change_presence(activity=discord.Game(name="!help for commands"))
+    # first connection only; reconnects fire on_ready again
+    if archiver is None:
+        startup.stop('gateway')
+        lifecycle.spawn(finish_startup())
+        dashboard.start()
+        archiver = asyncio.create_task(archive_closed_tickets())
+    
+    await bot.change_presence(activity=discord.Game(name="/help for commands"))
+
+async def finish_startup():
+    """Finish the warm-up once the gateway is up, then post the interface and report ready"""
+    try:
+        await warmup
+        await startup.timed('warm_guilds', warm_guilds())
+    except Exception as e:
+        logger.error(f"Warm-up failed, serving with cold caches: {e}")
+    # needs the open ticket index to pick up tickets that were already waiting
+    escalations.start()
+    startup.mark_ready()
+    warmed.set()
+    if startup.within_target:
+        logger.info(startup.summary())
+    else:
+        logger.warning(f"Startup exceeded target: {startup.summary()}")
     await post_ticket_interface_in_channels()
 
-async def post_ticket_interface_in_channels():
-    """Post the ticket creation interface in configured channels"""
+async def warm_storage():
+    """Everything the first interactions read from Firestore, loaded concurrently"""
+    from utils.db import get_firebase_db
+    from utils.roles import get_role_registry
+
+    def load_configs():
+        get_firebase_db().load_dev_configs()
+        # role names live in dev configs, so this is served from the cache just filled
+        get_role_registry().names()
+
+    await asyncio.gather(
+        startup.timed('warm_configs', asyncio.to_thread(load_configs)),
+        # open tickets, per-user open counts, mentor loads and duplicate shingles
+        startup.timed('warm_tickets', load_ticket_index())
+    )
+
+async def warm_guilds():
+    """Caches that need the gateway's guild data: roster and role ids, category catalogues, posted messages"""
+    from utils.categories import get_category_catalogue
+    from utils.roles import get_role_registry
+    # role names are read from Firestore, so resolve them off the loop before the roster needs them
+    await asyncio.to_thread(get_role_registry().warm, bot.guilds)
+    seed_mentor_roster()
+    catalogue = get_category_catalogue()
+    await asyncio.gather(
+        *(asyncio.to_thread(catalogue.get, guild.id) for guild in bot.guilds),
+        index_posted_messages()
+    )
+
+async def index_posted_messages():
+    """Find the posted ticket interface and each ticket's mentor-channel message"""
+    from utils.db import get_firebase_db
+    from utils.ticket_messages import get_ticket_messages
+    db = get_firebase_db()
+    messages = get_ticket_messages()
+    ticket_channel_id = await asyncio.to_thread(db.get_dev_config, 'ticket_channel')
+    mentor_channel_id = await asyncio.to_thread(db.get_dev_config, 'mentor_channel')
+    scans = []
+    for guild in bot.guilds:
+        ticket_channel = guild.get_channel(int(ticket_channel_id)) if ticket_channel_id else None
+        mentor_channel = guild.get_channel(int(mentor_channel_id)) if mentor_channel_id else None
+        if ticket_channel:
+            scans.append(messages.scan(ticket_channel, bot.user, interface_title=INTERFACE_TITLE, limit=50))
+        if mentor_channel:
+            scans.append(messages.scan(mentor_channel, bot.user))
+    found = await asyncio.gather(*scans, return_exceptions=True)
+    for result in found:
+        if isinstance(result, Exception):
+            logger.warning(f"Couldn't scan channel history: {result}")
+    logger.info(f"Indexed {sum(result for result in found if isinstance(result, int))} posted ticket message(s)")
+
+def seed_mentor_roster():
+    """Register every member with the Mentor role for load balancing (needs the members intent)"""
+    from utils.mentor_load import get_mentor_load
+    from utils.roles import get_role_registry
+    tracker = get_mentor_load()
+    registry = get_role_registry()
+    for guild in bot.guilds:
+        mentor_role = registry.role(guild, 'mentor')
+        if mentor_role:
+            for member in mentor_role.members:
+                tracker.register(member.id, member.display_name)
+
+async def post_ticket_interface_in_channels(rescan: bool = False):
+    """Post the ticket creation interface in configured channels that don't have it yet"""
     from utils.db import get_firebase_db
     from views.create_ticket import PublicCategorySelectionView
+    from utils.categories import get_category_catalogue
+    from utils.ticket_messages import get_ticket_messages
     from utils.styles import Colors
     
     db = get_firebase_db()
-    ticket_channel_id = db.get_dev_config('ticket_channel')
+    messages = get_ticket_messages()
+    ticket_channel_id = await asyncio.to_thread(db.get_dev_config, 'ticket_channel')
     
     if not ticket_channel_id:
-        logger.info("No ticket channel configured. Use !setup to set up channels.")
+        logger.info("No ticket channel configured. Use /setup to set up channels.")
         return
     
     try:
         for guild in bot.guilds:
             ticket_channel = guild.get_channel(int(ticket_channel_id))
             if ticket_channel:
-                async for message in ticket_channel.history(limit=50):
-                    if message.author == bot.user and message.embeds:
-                        for embed in message.embeds:
-                            if embed.title == "Need 1:1 mentor help?":
-                                logger.info(f"Ticket interface already exists in {guild.name}")
-                                return
+                # the warm-up already scanned the channel; /post_interface looks again in case it was deleted
+                if rescan or not messages.scanned(ticket_channel.id):
+                    await messages.scan(ticket_channel, bot.user, interface_title=INTERFACE_TITLE, limit=50)
+                if messages.interface(ticket_channel.id):
+                    logger.info(f"Ticket interface already exists in {guild.name}")
+                    return
                 
                 embed = discord.Embed(
-                    title="Need 1:1 mentor help?",
-                    description="Select a technology you need help with and follow the instructions!",
+                    title=INTERFACE_TITLE,
+                    description="Select the area you need help with, then the technology, and follow the instructions!",
                     color=Colors.GREEN
                 )
                 
-                view = PublicCategorySelectionView()
-                await ticket_channel.send(embed=embed, view=view)
+                # the catalogue read hits Firestore on a cold cache, so do it off the event loop
+                catalogue = await asyncio.to_thread(get_category_catalogue().get, guild.id)
+                view = PublicCategorySelectionView(catalogue)
+                messages.record_interface(await ticket_channel.send(embed=embed, view=view))
                 logger.info(f"Posted ticket interface in {guild.name}")
                 
     except Exception as e:
         logger.error(f"Failed to post ticket interface: {e}")
 
-@bot.event
-async def on_command_error(ctx, error):
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
     """Global error handler"""
-    if isinstance(error, commands.CommandNotFound):
-        await ctx.send(f"{Emojis.ERROR} Command not found. Use `!help` to see available commands.")
-    elif isinstance(error, commands.MissingPermissions):
-        await ctx.send(f"{Emojis.ERROR} You don't have permission to use this command.")
-    elif isinstance(error, commands.MissingRequiredArgument):
-        await ctx.send(f"{Emojis.ERROR} Missing required argument: {error.param}")
+    if isinstance(error, app_commands.MissingPermissions):
+        message = f"{Emojis.ERROR} You don't have permission to use this command."
+    elif isinstance(error, app_commands.CheckFailure):
+        message = f"{Emojis.ERROR} You can't use this command here."
     else:
         logger.error(f"Unhandled error: {error}")
-        await ctx.send(f"{Emojis.ERROR} An unexpected error occurred. Please try again.")
+        message = f"{Emojis.ERROR} An unexpected error occurred. Please try again."
+
+    if interaction.response.is_done():
+        await interaction.followup.send(message, ephemeral=True)
+    else:
+        await interaction.response.send_message(message, ephemeral=True)
 
-@bot.command(name='help')
-async def help_command(ctx):
+@bot.tree.command(name='help', description="Display help information")
+async def help_command(interaction: discord.Interaction):
     """Display help information"""
     embed = discord.Embed(
         title="🎫 Ticket Bot Help",
@@ -125,10 +281,10 @@ async def help_command(ctx):
     embed.add_field(
         name=f"{Emojis.HACKER_COMMANDS} Hacker Commands",
         value="""
-        `!create` - Create a new ticket (with category selection)
-        `!list` - List your tickets
-        `!close_ticket <ticket_id>` - Close your ticket
-        `!info <ticket_id>` - Get ticket information
+        `/create` - Create a new ticket (with category selection)
+        `/list` - List your tickets
+        `/close_ticket <ticket_id>` - Close your ticket
+        `/info <ticket_id>` - Get ticket information
         """,
         inline=False
     )
@@ -136,11 +292,13 @@ async def help_command(ctx):
     embed.add_field(
         name=f"{Emojis.MENTOR_COMMANDS} Mentor Commands",
         value="""
-        `!mentor tickets` - View all open tickets
-        `!mentor accept <ticket_id>` - Accept a ticket
-        `!mentor resolve <ticket_id>` - Close a ticket as mentor
-        `!mentor assign <ticket_id> <user>` - Assign ticket to another mentor
-        `!mentor my` - View your assigned tickets
+        `/mentor tickets` - View all open tickets
+        `/mentor accept <ticket_id>` - Accept a ticket
+        `/mentor resolve <ticket_id>` - Close a ticket as mentor
+        `/mentor assign <ticket_id> <user>` - Assign ticket to another mentor
+        `/mentor my` - View your assigned tickets
+        `/mentor suggest <ticket_id>` - Suggest the least-busy mentor for a ticket
+        `/search <terms>` - Search tickets by title, description and location
         """,
         inline=False
     )
@@ -148,39 +306,195 @@ async def help_command(ctx):
     embed.add_field(
         name=f"{Emojis.ADMIN_COMMANDS} Admin Commands",
         value="""
-        `!setup` - Configure channels interactively (Admin only)
-        `!post` - Post the interactive ticket creation interface (Admin only)
-        `!post_interface` - Manually post ticket interface in configured channels (Admin only)
+        `/setup` - Configure channels interactively (Admin only)
+        `/roles` - Choose the Mentor and Admin roles (Admin only)
+        `/category` - List, add or remove ticket categories (Admin only)
+        `/post` - Post the interactive ticket creation interface (Admin only)
+        `/post_interface` - Manually post ticket interface in configured channels (Admin only)
+        `/sync` - Resync slash commands with Discord (Admin only)
+        `/trace_sample <rate>` - Set the share of interactions traced (Admin only)
         """,
         inline=False
     )
     
-    await ctx.send(embed=embed)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
 
-@bot.command(name='post_interface')
-@commands.has_permissions(administrator=True)
-async def post_interface(ctx):
+@bot.tree.command(name='post_interface', description="Post the ticket interface in configured channels (Admin only)")
+@admin_only()
+async def post_interface(interaction: discord.Interaction):
     """Manually post the ticket creation interface (Admin only)"""
-    await post_ticket_interface_in_channels()
-    await ctx.send(f"{Emojis.SUCCESS} Ticket interface posted in configured channels!")
+    await interaction.response.defer(ephemeral=True)
+    await post_ticket_interface_in_channels(rescan=True)
+    await interaction.followup.send(f"{Emojis.SUCCESS} Ticket interface posted in configured channels!", ephemeral=True)
+
+@bot.tree.command(name='sync', description="Resync slash commands with Discord (Admin only)")
+@admin_only()
+async def sync_command(interaction: discord.Interaction):
+    """Resync the application command tree (Admin only)"""
+    await interaction.response.defer(ephemeral=True)
+    await bot.tree.sync()
+    await interaction.followup.send(f"{Emojis.SYNC} {Messages.SYNC_SUCCESS}", ephemeral=True)
+
+@bot.tree.command(name='trace_sample', description="Set the share of interactions traced, 0-1 (Admin only)")
+@admin_only()
+async def trace_sample_command(interaction: discord.Interaction, rate: app_commands.Range[float, 0.0, 1.0]):
+    """Change the trace sample rate at runtime (Admin only)"""
+    tracer = get_tracer()
+    tracer.set_sample_rate(rate)
+    if tracer.exporter is None:
+        await interaction.response.send_message(f"{Emojis.WARNING} Sample rate set to {tracer.sample_rate:.0%}, but tracing is off: set TRACE_EXPORT_PATH to export spans.", ephemeral=True)
+        return
+    await interaction.response.send_message(f"{Emojis.SUCCESS} Tracing {tracer.sample_rate:.0%} of interactions.", ephemeral=True)
+
+async def sync_commands():
+    """Push the slash command definitions to Discord"""
+    try:
+        synced = await bot.tree.sync()
+        logger.info(f"Synced {len(synced)} slash command(s)")
+    except Exception as e:
+        logger.error(f"Failed to sync slash commands: {e}")
+
+async def load_ticket_index():
+    """Seed the open ticket index, duplicate detector and mentor load counts"""
+    from utils.db import get_firebase_db
+    from utils.ticket_index import get_ticket_index
+    from utils.duplicates import get_duplicate_detector
+    from utils.mentor_load import get_mentor_load
+    tickets = await asyncio.to_thread(get_firebase_db().get_open_tickets)
+    get_ticket_index().load(tickets)
+    get_mentor_load().load(tickets)
+    await asyncio.to_thread(get_duplicate_detector().load, tickets)
+    logger.info(f"Loaded {len(tickets)} open ticket(s) into the index")
+    dashboard.refresh()
+
+async def load_search_index():
+    """Seed the full-text search index with every ticket"""
+    from utils.db import get_firebase_db
+    from utils.search import get_search_index
+    # search covers past events too, so its index is seeded from both tiers
+    tickets = await asyncio.to_thread(get_firebase_db().get_all_tickets, True)
+    await asyncio.to_thread(get_search_index().load, tickets)
+    logger.info(f"Indexed {len(tickets)} ticket(s) for search")
+
+async def archive_closed_tickets():
+    """Move old closed tickets to the archive tier on a schedule (leader only, started from on_ready)"""
+    from utils.db import get_firebase_db, StorageError
+    while True:
+        await asyncio.sleep(Config.ARCHIVE_INTERVAL_MINUTES * 60)
+        try:
+            await asyncio.to_thread(get_firebase_db().archive_closed_tickets, Config.ARCHIVE_AFTER_HOURS * 3600, Config.ARCHIVE_BATCH_SIZE)
+        except StorageError as e:
+            logger.warning(f"Archiving closed tickets failed, retrying next run: {e}")
 
 # Load command cogs
 async def load_extensions():
-    """Load all command extensions"""
-    for filename in os.listdir('./commands'):
-        if filename.endswith('.py'):
-            try:
-                await bot.load_extension(f'commands.{filename[:-3]}')
-                logger.info(f'Loaded extension: {filename}')
-            except Exception as e:
-                logger.error(f'Failed to load extension {filename}: {e}')
+    """Load all command extensions concurrently"""
+    async def load(filename):
+        try:
+            await bot.load_extension(f'commands.{filename[:-3]}')
+            logger.info(f'Loaded extension: {filename}')
+        except Exception as e:
+            logger.error(f'Failed to load extension {filename}: {e}')
+
+    filenames = [f for f in os.listdir('./commands') if f.endswith('.py')]
+    await asyncio.gather(*(load(filename) for filename in filenames))
 
 # Run the bot
+async def shutdown(health: HealthServer, election: asyncio.Task = None):
+    """Stop taking interactions, drain pending work within the grace period, then close"""
+    logger.info("Shutting down, draining pending work")
+    started = time.monotonic()
+    drained = await lifecycle.drain(Config.SHUTDOWN_GRACE_SECONDS)
+    await dashboard.stop()
+    await escalations.stop()
+    if archiver is not None:
+        archiver.cancel()
+    logger.info("Drain complete" if drained else "Drain deadline reached, closing anyway")
+    from utils.db import firebase_db
+    if firebase_db is not None:
+        # the journal only outlives the instance on a persistent volume, so spend the rest of the grace period on it
+        budget = max(Config.JOURNAL_FLUSH_SECONDS, Config.SHUTDOWN_GRACE_SECONDS - (time.monotonic() - started))
+        flushed = await asyncio.to_thread(firebase_db.replayer.flush, budget)
+        if not flushed:
+            logger.error(f"{firebase_db.journal.pending_count()} journaled write(s) not in Firestore after {budget:.1f}s; "
+                         f"they replay on next start only if {Config.JOURNAL_PATH} is on a persistent volume, otherwise they are lost")
+    await bot.close()
+    if election is not None:
+        election.cancel()
+        await elector.release()
+    await health.stop()
+
 async def main():
+    global elector, warmup
+    with startup.phase('validate'):
+        validate_environment()
+
+    health = HealthServer(Config.PORT, {
+        'gateway': gateway_ready,
+        'database': CachedProbe(database_reachable, Config.DB_PROBE_INTERVAL_SECONDS),
+        'accepting': accepting_work,
+        'warm': caches_warm
+    })
+    await startup.timed('health_server', health.start())
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
     async with bot:
-        await load_extensions()
-        await bot.start(TOKEN)
+        # Firebase init and the Discord REST login don't depend on each other
+        await asyncio.gather(
+            startup.timed('firebase', asyncio.to_thread(init_database)),
+            startup.timed('discord_login', bot.login(Config.DISCORD_TOKEN))
+        )
+        await startup.timed('extensions', load_extensions())
+        register_persistent_views()
+
+        from utils.db import get_firebase_db
+        store = get_firebase_db() if Config.LEADER_ELECTION else LocalLeaseStore()
+        elector = LeaderElector(store, ttl=Config.LEASE_TTL_SECONDS, renew_interval=Config.LEASE_RENEW_SECONDS)
+        startup.start('election')
+        election = asyncio.create_task(elector.run())
+        stopping = asyncio.create_task(stop.wait())
+
+        # followers serve health checks here until they win the lease or are stopped
+        elected = asyncio.create_task(elector.elected.wait())
+        await asyncio.wait({elected, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        if stop.is_set():
+            elected.cancel()
+            await shutdown(health, election)
+            return
+        startup.stop('election')
+
+        # singleton jobs: only the leader syncs commands and posts the interface
+        if Config.SYNC_COMMANDS_ON_STARTUP:
+            lifecycle.spawn(sync_commands())
+        # the storage warm-up overlaps the gateway handshake; on_ready finishes it and reports ready
+        warmup = asyncio.create_task(warm_storage())
+        lifecycle.spawn(load_search_index())
+        startup.start('gateway')
+
+        gateway = asyncio.create_task(bot.connect())
+        lost = asyncio.create_task(elector.lost.wait())
+        await asyncio.wait({gateway, stopping, lost}, return_when=asyncio.FIRST_COMPLETED)
+
+        if lost.done():
+            # another instance may already be connecting; drop the gateway and let the platform restart us
+            logger.error("Leader lease lost, giving up the gateway")
+            lifecycle.begin_drain()
+            await bot.close()
+            await shutdown(health, election)
+            raise SystemExit(1)
+        if stop.is_set():
+            await shutdown(health, election)
+        else:
+            stopping.cancel()
+            lost.cancel()
+            election.cancel()
+            await elector.release()
+            await health.stop()
+        await gateway
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -0,0 +1,66 @@
+import sys
+import logging
+import argparse
+from config import Config
+from utils.log import setup_logging
+from utils.migrations import MIGRATIONS, MAX_BATCH_SIZE, MigrationError, MigrationRunner
+from utils.retry import StorageError
+
+"""
+Run a ticket schema migration against the configured Firestore project
+
+    python migrate.py --list
+    python migrate.py 1 --dry-run
+    python migrate.py 1 --ops-per-second 50
+    python migrate.py 1 --collection tickets_archive
+
+Interrupted runs resume from their checkpoint; --restart starts over from the first document.
+"""
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a versioned ticket migration")
+    parser.add_argument('version', type=int, nargs='?', help="migration to run (see --list)")
+    parser.add_argument('--list', action='store_true', help="show the migrations and their progress")
+    parser.add_argument('--collection', default="tickets", help="collection to migrate (tickets or tickets_archive)")
+    parser.add_argument('--ops-per-second', type=float, default=Config.MIGRATION_OPS_PER_SECOND,
+                        help="Firestore reads plus writes per second (0 for no limit)")
+    parser.add_argument('--batch-size', type=int, default=MAX_BATCH_SIZE, help="documents per page and write batch")
+    parser.add_argument('--dry-run', action='store_true', help="read and transform, but write nothing")
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint and start from the first document")
+    args = parser.parse_args()
+
+    listener = setup_logging(Config.LOG_LEVEL, "text")
+    logger = logging.getLogger('discord')
+    try:
+        from utils.db import connect_firestore
+        db = connect_firestore(Config.FIREBASE_CREDENTIALS_PATH, Config.FIREBASE_PROJECT_ID, Config.FIREBASE_CREDENTIALS)
+
+        if args.list:
+            for version, migration in sorted(MIGRATIONS.items()):
+                checkpoint = MigrationRunner(db, migration, args.collection).load_checkpoint()
+                if checkpoint.get('done'):
+                    status = "applied"
+                elif checkpoint:
+                    status = f"interrupted after {checkpoint.get('scanned', 0)} documents"
+                else:
+                    status = "not run"
+                print(f"{version:3d}  {migration.name:<24} {status:<36} {migration.description}")
+            return 0
+
+        migration = MIGRATIONS.get(args.version)
+        if migration is None:
+            parser.error(f"unknown migration {args.version}; known: {', '.join(map(str, sorted(MIGRATIONS))) or 'none'}")
+        runner = MigrationRunner(db, migration, args.collection, args.ops_per_second, args.batch_size, args.dry_run)
+        try:
+            runner.run(restart=args.restart)
+        except (MigrationError, StorageError) as e:
+            logger.error(f"{e}" if args.dry_run else f"{e}; progress up to the last page is saved, run again to resume")
+            return 1
+        except KeyboardInterrupt:
+            logger.warning("Interrupted; run again to resume from the last saved page")
+            return 130
+        return 0
+    finally:
+        listener.stop()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,22 @@
+from typing import Iterable, List
+from discord import app_commands
+from utils.ticket_model import Ticket
+
+"""
+Autocomplete helpers for ticket-id arguments
+"""
+MAX_CHOICES = 25
+
+def ticket_choices(tickets: Iterable[Ticket], current: str) -> List[app_commands.Choice[str]]:
+    """Choices for tickets whose id or title matches what the user has typed so far"""
+    current = current.strip().lstrip('#').lower()
+    choices = []
+    for ticket in tickets:
+        ticket_id = ticket.id
+        title = ticket.title
+        if current and not ticket_id.startswith(current) and current not in title.lower():
+            continue
+        choices.append(app_commands.Choice(name=f"#{ticket_id} · {title}"[:100], value=ticket_id))
+        if len(choices) == MAX_CHOICES:
+            break
+    return choices
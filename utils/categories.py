@@ -0,0 +1,198 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import discord
+
+"""
+Per-guild ticket category catalogue, grouped for a two-step (group -> technology) picker
+"""
+# Discord allows at most 25 options per select menu
+MAX_OPTIONS = 25
+MAX_NAME_LENGTH = 100
+
+# used until a guild saves its own catalogue
+DEFAULT_GROUPS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("Frontend", ("Frontend", "React", "HTML/CSS", "Javascript/TypeScript")),
+    ("Backend", ("Backend", "Python", "Java", "C++", "C#", "Go")),
+    ("Mobile", ("Mobile", "Swift", "Kotlin")),
+    ("Data & AI", ("Database", "SQL", "AI/ML")),
+    ("Infrastructure", ("Cloud", "CI/CD", "Git", "Cybersecurity")),
+    ("Hardware & Web3", ("Hardware", "Web3")),
+    ("General", ("Ideation", "Pitching", "Other"))
+)
+
+class GuildCategories:
+    """
+    Immutable snapshot of one guild's catalogue with its select options prebuilt.
+
+    Views take their options from here instead of building SelectOption lists per
+    instance; a new snapshot replaces this one whenever the catalogue changes.
+    """
+
+    def __init__(self, groups: Sequence[Tuple[str, Sequence[str]]]):
+        self.groups: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+            (name, tuple(categories)) for name, categories in groups if categories
+        )
+        self.names = tuple(category for _, categories in self.groups for category in categories)
+        self._known = frozenset(self.names)
+        # give every catalogue category its bit up front, in catalogue order
+        get_category_bits().mask(self.names)
+        self.group_options = [
+            discord.SelectOption(label=name, value=name, description=", ".join(categories)[:100])
+            for name, categories in self.groups
+        ]
+        self.category_options: Dict[str, List[discord.SelectOption]] = {
+            name: [discord.SelectOption(label=category, value=category) for category in categories]
+            for name, categories in self.groups
+        }
+
+    @classmethod
+    def from_documents(cls, groups: List[Dict[str, Any]]) -> "GuildCategories":
+        return cls([(group['name'], group.get('categories') or []) for group in groups])
+
+    def to_documents(self) -> List[Dict[str, Any]]:
+        return [{'name': name, 'categories': list(categories)} for name, categories in self.groups]
+
+    def __contains__(self, category: str) -> bool:
+        return category in self._known
+
+    def group_of(self, category: str) -> Optional[str]:
+        return next((name for name, categories in self.groups if category in categories), None)
+
+    def categories_in(self, group: str) -> Tuple[str, ...]:
+        return next((categories for name, categories in self.groups if name == group), ())
+
+class CategoryCatalogue:
+    """Caches each guild's categories from Firestore for `ttl` seconds"""
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self._default = GuildCategories(DEFAULT_GROUPS)
+        self._cache: Dict[int, Tuple[float, GuildCategories]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, guild_id: Optional[int]) -> GuildCategories:
+        """The guild's catalogue, read from Firestore on a miss or once the entry is older than the TTL"""
+        if guild_id is None:
+            return self._default
+        now = time.monotonic()
+        entry = self._cache.get(guild_id)
+        if entry and now - entry[0] < self.ttl:
+            return entry[1]
+
+        from utils.db import get_firebase_db, StorageError
+        try:
+            groups = get_firebase_db().get_category_groups(guild_id)
+        except StorageError:
+            groups = None
+        if groups:
+            snapshot = GuildCategories.from_documents(groups)
+        else:
+            # missing document or failed read: keep what we had, else the defaults
+            snapshot = entry[1] if entry else self._default
+        with self._lock:
+            self._cache[guild_id] = (now, snapshot)
+        return snapshot
+
+    def _save(self, guild_id: int, groups: List[Tuple[str, List[str]]]) -> bool:
+        snapshot = GuildCategories(groups)
+        from utils.db import get_firebase_db
+        if not get_firebase_db().set_category_groups(guild_id, snapshot.to_documents()):
+            return False
+        with self._lock:
+            self._cache[guild_id] = (time.monotonic(), snapshot)
+        return True
+
+    def add(self, guild_id: int, group: str, category: str) -> bool:
+        """Add a category to a group (creating the group if needed); raises ValueError if it can't fit"""
+        group, category = group.strip(), category.strip()
+        if not group or not category or len(group) > MAX_NAME_LENGTH or len(category) > MAX_NAME_LENGTH:
+            raise ValueError(f"Names must be 1-{MAX_NAME_LENGTH} characters.")
+        current = self.get(guild_id)
+        if category in current:
+            raise ValueError(f"**{category}** is already in **{current.group_of(category)}**.")
+
+        groups = [(name, list(categories)) for name, categories in current.groups]
+        existing = next((categories for name, categories in groups if name == group), None)
+        if existing is None:
+            if len(groups) >= MAX_OPTIONS:
+                raise ValueError(f"There are already {MAX_OPTIONS} groups; add it to an existing one.")
+            groups.append((group, [category]))
+        elif len(existing) >= MAX_OPTIONS:
+            raise ValueError(f"**{group}** already has {MAX_OPTIONS} categories; use another group.")
+        else:
+            existing.append(category)
+        return self._save(guild_id, groups)
+
+    def remove(self, guild_id: int, category: str) -> bool:
+        """Remove a category (and its group once empty); raises ValueError if it doesn't exist"""
+        current = self.get(guild_id)
+        if category not in current:
+            raise ValueError(f"**{category}** is not a category.")
+        groups = [(name, [c for c in categories if c != category]) for name, categories in current.groups]
+        return self._save(guild_id, groups)
+
+    def invalidate(self, guild_id: int):
+        with self._lock:
+            self._cache.pop(guild_id, None)
+
+class CategoryBits:
+    """
+    Category name <-> bit position, for storing a ticket's categories as one int.
+
+    Append-only and shared by every guild, so a mask stays valid when a catalogue
+    is edited: removed categories keep their bit and new ones get the next free one.
+    """
+
+    def __init__(self):
+        self._bits: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def bit(self, name: str) -> int:
+        bit = self._bits.get(name)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.get(name)
+                if bit is None:
+                    bit = self._bits[name] = len(self._names)
+                    self._names.append(name)
+        return bit
+
+    def mask(self, names: Sequence[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= 1 << self.bit(name)
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        """Category names in a mask, in the order they were first seen"""
+        names = []
+        bit = 0
+        while mask:
+            if mask & 1:
+                names.append(self._names[bit])
+            mask >>= 1
+            bit += 1
+        return names
+
+# Global category bit assignment
+category_bits = None
+
+def get_category_bits() -> CategoryBits:
+    """Get the global category bit assignment, creating it on first use"""
+    global category_bits
+    if category_bits is None:
+        category_bits = CategoryBits()
+    return category_bits
+
+# Global category catalogue
+category_catalogue = None
+
+def get_category_catalogue() -> CategoryCatalogue:
+    """Get the global category catalogue, creating it on first use"""
+    global category_catalogue
+    if category_catalogue is None:
+        from config import Config
+        category_catalogue = CategoryCatalogue(ttl=Config.CATEGORY_CACHE_SECONDS)
+    return category_catalogue
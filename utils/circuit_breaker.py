@@ -0,0 +1,65 @@
+import time
+import logging
+import threading
+from utils.metrics import get_metrics
+
+logger = logging.getLogger('discord')
+
+"""
+Circuit breaker that stops calling a backend after repeated failures
+"""
+class CircuitBreaker:
+    """
+    Closed while calls succeed; opens after `failure_threshold` consecutive failures.
+
+    While open, allow() is False so callers go straight to their fallback. After
+    `reset_timeout` seconds one call is let through (half-open): its success closes
+    the breaker, its failure opens it again for another `reset_timeout`.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            self.state = state
+            get_metrics().increment('circuit_transitions_total', breaker=self.name, state=state)
+            logger.warning(f"Circuit {self.name} is now {state}")
+
+    @property
+    def degraded(self) -> bool:
+        return self.state != self.CLOSED
+
+    def allow(self) -> bool:
+        """Whether a call to the backend should be attempted now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            # one probe per reset_timeout, so a probe that never reports back can't wedge the breaker
+            if now - self._opened_at >= self.reset_timeout:
+                self._opened_at = now
+                self._set_state(self.HALF_OPEN)
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
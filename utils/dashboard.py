@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Dict, Optional
+import discord
+from utils.metrics import get_metrics
+from utils.styles import Colors, Emojis, Titles, Footers
+from utils.ticket_model import Ticket
+
+logger = logging.getLogger('discord')
+
+"""
+Pinned mentor-queue dashboard, edited in place as tickets change
+"""
+# how many waiting tickets and busy mentors are listed
+OLDEST_SHOWN = 5
+MENTORS_SHOWN = 10
+
+def _age(ticket: Ticket) -> str:
+    """Relative timestamp; Discord renders it client-side, so it stays current without edits"""
+    created = ticket.created
+    return discord.utils.format_dt(created, 'R') if created else "unknown"
+
+class QueueDashboard:
+    """
+    One dashboard message in the mentor channel showing queue depth by category,
+    the longest-waiting tickets and the mentors currently helping someone.
+
+    Ticket writes only mark the dashboard dirty; a single task re-renders it from
+    the open ticket index and edits the message at most once every `interval`
+    seconds, however many transitions happened in between.
+    """
+
+    def __init__(self, bot: discord.Client, interval: float = 5.0):
+        self.bot = bot
+        self.interval = interval
+        self._dirty = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._message: Optional[discord.PartialMessage] = None
+        self._last_rendered: Optional[Dict[str, Any]] = None
+
+    def apply(self, event: str, ticket: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+        """Database listener; runs on whichever thread made the write"""
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._dirty.set)
+            except RuntimeError:
+                # loop already closed during shutdown
+                pass
+
+    def refresh(self):
+        """Request a re-render (from the event loop), e.g. after the mentor channel changes"""
+        self._dirty.set()
+
+    def start(self):
+        """Subscribe to ticket changes and start the edit loop (leader only, once the gateway is ready)"""
+        if self._task is not None:
+            return
+        from utils.db import get_firebase_db
+        self._loop = asyncio.get_running_loop()
+        get_firebase_db().add_listener(self.apply)
+        self._task = asyncio.create_task(self._run())
+        self._dirty.set()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            try:
+                await self._publish()
+            except Exception as e:
+                logger.warning(f"Failed to update mentor dashboard: {e}")
+            # transitions during the pause set the event again and are folded into one edit
+            await asyncio.sleep(self.interval)
+
+    def build_embed(self) -> discord.Embed:
+        """Render the dashboard from the in-memory open ticket index and mentor loads"""
+        from utils.ticket_index import get_ticket_index
+        from utils.mentor_load import get_mentor_load
+        open_tickets = get_ticket_index().open_tickets()
+        waiting = [ticket for ticket in open_tickets if not ticket.mentor_id]
+
+        embed = discord.Embed(
+            title=Titles.MENTOR_DASHBOARD,
+            description=f"**{len(waiting)}** waiting · **{len(open_tickets) - len(waiting)}** in progress",
+            color=Colors.GREEN if not waiting else Colors.BLUE
+        )
+
+        depth = Counter(category for ticket in waiting for category in (ticket.categories or ["Uncategorized"]))
+        embed.add_field(
+            name="Waiting by category",
+            value="\n".join(f"**{category}**: {count}" for category, count in depth.most_common(15)) or "Nobody is waiting!",
+            inline=False
+        )
+
+        oldest = sorted(waiting, key=lambda ticket: (ticket.created_at or 0, ticket.number))[:OLDEST_SHOWN]
+        if oldest:
+            embed.add_field(
+                name="Waiting longest",
+                value="\n".join(
+                    f"{Emojis.TICKET} **#{ticket.id}** {ticket.title[:60]} · {ticket.location[:30]} · {_age(ticket)}"
+                    for ticket in oldest
+                ),
+                inline=False
+            )
+
+        tracker = get_mentor_load()
+        busy = sorted(((load, mentor_id) for mentor_id, load in tracker.snapshot().items() if load), reverse=True)
+        embed.add_field(
+            name="Active mentors",
+            value="\n".join(
+                f"{tracker.name(mentor_id) or f'<@{mentor_id}>'}: {load} ticket(s)"
+                for load, mentor_id in busy[:MENTORS_SHOWN]
+            ) or "No mentor has a ticket right now.",
+            inline=False
+        )
+        embed.set_footer(text=Footers.DASHBOARD)
+        return embed
+
+    async def _publish(self):
+        from utils.db import get_firebase_db
+        db = get_firebase_db()
+        channel_id = await asyncio.to_thread(db.get_dev_config, 'mentor_channel')
+        channel = self.bot.get_channel(int(channel_id)) if channel_id else None
+        if channel is None:
+            return
+
+        embed = self.build_embed()
+        rendered = embed.to_dict()
+        if self._message is not None and self._message.channel.id == channel.id and rendered == self._last_rendered:
+            return
+        # timestamp is left out of the comparison so unchanged queues cost no edit
+        embed.timestamp = discord.utils.utcnow()
+
+        if self._message is None or self._message.channel.id != channel.id:
+            self._message = await self._load_message(channel)
+        if self._message is not None:
+            try:
+                await self._message.edit(embed=embed)
+            except discord.NotFound:
+                self._message = None
+        if self._message is None:
+            self._message = await self._post(channel, embed)
+        self._last_rendered = rendered
+        get_metrics().increment('dashboard_edits_total')
+
+    async def _load_message(self, channel) -> Optional[discord.PartialMessage]:
+        """The dashboard message saved for this channel, if any (not fetched; an edit tells us if it's gone)"""
+        from utils.db import get_firebase_db
+        saved = await asyncio.to_thread(get_firebase_db().get_dev_config, 'dashboard_message')
+        if saved:
+            saved_channel, _, message_id = saved.partition(':')
+            if saved_channel == str(channel.id) and message_id.isdigit():
+                return channel.get_partial_message(int(message_id))
+        return None
+
+    async def _post(self, channel, embed: discord.Embed) -> discord.Message:
+        message = await channel.send(embed=embed)
+        try:
+            await message.pin(reason="Mentor queue dashboard")
+        except discord.HTTPException as e:
+            logger.warning(f"Couldn't pin the mentor dashboard: {e}")
+        from utils.db import get_firebase_db
+        await asyncio.to_thread(get_firebase_db().set_dev_config, 'dashboard_message', f"{channel.id}:{message.id}")
+        logger.info(f"Posted mentor dashboard in #{channel}")
+        return message
+
+# Global dashboard instance
+dashboard = None
+
+def init_dashboard(bot: discord.Client, interval: float = 5.0) -> QueueDashboard:
+    """Initialize the global dashboard instance"""
+    global dashboard
+    dashboard = QueueDashboard(bot, interval)
+    return dashboard
+
+def get_dashboard() -> QueueDashboard:
+    """Get the global dashboard instance"""
+    if dashboard is None:
+        raise RuntimeError("Dashboard not initialized. Call init_dashboard() first.")
+    return dashboard
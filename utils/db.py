@@ -1,69 +1,248 @@
 import os
 import json
-from datetime import datetime
-from typing import List, Dict, Optional, Any
+import time
+import logging
+from datetime import timedelta
+from typing import Callable, List, Dict, Optional, Any
 import firebase_admin
 from firebase_admin import credentials, firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
+from utils.idempotency import IdempotencyStore, PENDING
+from utils.journal import WriteJournal, JournalReplayer
+from utils.circuit_breaker import CircuitBreaker
+from utils.retry import StorageError, StorageUnavailable, get_interactive_policy, get_background_policy
+from utils.metrics import get_metrics
+from utils.timestamps import utcnow, normalize, sort_key
 
-categories = {
-    "Frontend", "React", "HTML/CSS", "Javascript/TypeScript", "Backend", 
-    "Python", "Java", "C++", "C#", "Go", "Ideation",
-    "Swift", "Kotlin", "Database", "SQL", "Pitching", "Cloud", "CI/CD", 
-    "Hardware", "Mobile", "AI/ML", "Web3", "Cybersecurity", "Git", "Other"
-}
+logger = logging.getLogger('discord')
+
+class DuplicateTicketError(Exception):
+    """Raised when create_ticket is called again with an idempotency key that was already used"""
+
+    def __init__(self, ticket: Optional[Dict[str, Any]]):
+        super().__init__("Ticket already created for this submission")
+        # None while the first submission is still being written
+        self.ticket = ticket
+
+def connect_firestore(credentials_path: str = None, project_id: str = None, credentials_json: str = None):
+    """Initialize the Firebase app (once per process) and return a Firestore client"""
+    if not firebase_admin._apps:
+        if credentials_json:
+            cred = credentials.Certificate(json.loads(credentials_json))
+            firebase_admin.initialize_app(cred)
+        elif credentials_path and os.path.exists(credentials_path):
+            cred = credentials.Certificate(credentials_path)
+            firebase_admin.initialize_app(cred)
+        elif project_id:
+            firebase_admin.initialize_app(project=project_id)
+        else:
+            cred_json = os.getenv('FIREBASE_CREDENTIALS')
+            if cred_json:
+                cred_dict = json.loads(cred_json)
+                cred = credentials.Certificate(cred_dict)
+                firebase_admin.initialize_app(cred)
+            else:
+                raise ValueError("Firebase credentials not found. Please provide credentials_path, project_id, or FIREBASE_CREDENTIALS environment variable.")
+    return firestore.client()
 
 class FirebaseTicketDatabase:
     """Firebase Firestore database interface to manage tickets"""
     
-    def __init__(self, credentials_path: str = None, project_id: str = None):
+    def __init__(self, credentials_path: str = None, project_id: str = None, credentials_json: str = None, journal_path: str = "journal.sqlite3", client=None, config_ttl: float = 0.0):
         """
         Initialize Firebase connection
         
         Args:
             credentials_path: Path to Firebase service account key JSON file
             project_id: Firebase project ID (optional if using service account)
+            credentials_json: Service account key as a JSON string (takes precedence over credentials_path)
+            journal_path: SQLite file for the local write-behind journal and ticket cache
+            client: Firestore client to use instead of connecting (e.g. utils.local_store.LocalFirestore)
+            config_ttl: Seconds a dev config read is served from memory (0 reads Firestore every time)
         """
         self.db = None
         self.tickets_collection = "tickets"
+        # closed tickets are moved here by archive_closed_tickets, so queries on the hot tier only see live ones
+        self.archive_collection = "tickets_archive"
         self.dev_configs = "dev_configs"
+        self.categories_collection = "categories"
+        self.leases_collection = "leases"
+        self.idempotency = IdempotencyStore()
+        self._listeners: List[Callable[[str, Dict[str, Any], Optional[Dict[str, Any]]], None]] = []
+        # ticket writes land in the journal first and reach Firestore from the replay thread
+        self.breaker = CircuitBreaker('firestore')
+        # every Firestore call below runs under one of these (deadline, retries, metrics)
+        self.policy = get_interactive_policy()
+        self.background_policy = get_background_policy()
+        self.journal = WriteJournal(journal_path)
+        self.replayer = JournalReplayer(self.journal, self._replay, self.breaker)
+        self._configs: Dict[str, Optional[str]] = {}
+        self.config_ttl = config_ttl
+        self._config_read_at: Dict[str, float] = {}
+        # when load_dev_configs last read the whole collection (keys missing from it are unset)
+        self._configs_loaded_at: Optional[float] = None
         
-        if not firebase_admin._apps:
-            if credentials_path and os.path.exists(credentials_path):
-                cred = credentials.Certificate(credentials_path)
-                firebase_admin.initialize_app(cred)
-            elif project_id:
-                firebase_admin.initialize_app(project=project_id)
-            else:
-                cred_json = os.getenv('FIREBASE_CREDENTIALS')
-                if cred_json:
-                    cred_dict = json.loads(cred_json)
-                    cred = credentials.Certificate(cred_dict)
-                    firebase_admin.initialize_app(cred)
-                else:
-                    raise ValueError("Firebase credentials not found. Please provide credentials_path, project_id, or FIREBASE_CREDENTIALS environment variable.")
+        # a local backend has nothing to connect to
+        self.db = client if client is not None else connect_firestore(credentials_path, project_id, credentials_json)
+        self.replayer.start()
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any], Optional[Dict[str, Any]]], None]):
+        """
+        Subscribe to ticket state changes
+        
+        The listener is called with (event, ticket, previous) after each successful write,
+        where event is one of 'created', 'assigned', 'reassigned', 'released' or 'closed',
+        ticket is the ticket after the write and previous is the ticket before it
+        (None for 'created').
+        """
+        self._listeners.append(listener)
+
+    def _emit(self, event: str, ticket: Dict[str, Any], previous: Optional[Dict[str, Any]]):
+        for listener in self._listeners:
+            try:
+                listener(event, ticket, previous)
+            except Exception as e:
+                logger.error(f"Ticket listener failed on {event} for ticket {ticket.get('id')}: {e}")
+
+    def ping(self, timeout: float = 2.0) -> bool:
+        """Check that Firestore is reachable"""
+        try:
+            self.db.collection(self.dev_configs).document('counter').get(retry=None, timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def _read_failed(self, error: StorageError):
+        self.breaker.record_failure()
+        logger.warning(f"Firestore read failed, serving from the local cache: {error}")
+
+    @staticmethod
+    def _ordered(query, order: Optional[str], limit: Optional[int]):
+        """Apply ORDER BY created_at ('asc' or 'desc') and LIMIT to a Firestore query"""
+        if order:
+            direction = firestore.Query.DESCENDING if order == 'desc' else firestore.Query.ASCENDING
+            query = query.order_by('created_at', direction=direction)
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    @staticmethod
+    def _sorted(tickets: List[Dict[str, Any]], order: Optional[str], limit: Optional[int]) -> List[Dict[str, Any]]:
+        """The same ordering and limit applied in memory (cache fallbacks and merged results)"""
+        if order:
+            tickets = sorted(tickets, key=sort_key, reverse=order == 'desc')
+        return tickets[:limit] if limit else tickets
+
+    def _cached(self, predicate: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        if not self.journal.seeded:
+            raise StorageUnavailable("Firestore is unavailable and the local ticket cache has not been loaded")
+        get_metrics().increment('ticket_cache_reads_total')
+        return [normalize(ticket) for ticket in self.journal.cached_tickets() if predicate(ticket)]
+
+    def _query(self, operation: str, query: Callable[[], Any], predicate: Callable[[Dict[str, Any]], bool], policy=None,
+               order: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run a ticket query against Firestore, falling back to the local cache
         
-        self.db = firestore.client()
+        Results are ordered by created_at when `order` is 'asc' or 'desc' and cut to
+        `limit`; the ordered queries are backed by the composite indexes in
+        firestore.indexes.json. Tickets with unflushed local writes always come from
+        the cache, so callers see their own writes before they reach Firestore.
+        Raises StorageError if Firestore fails and the cache has never been loaded.
+        """
+        if self.breaker.allow():
+            try:
+                tickets = (policy or self.policy).call(operation, lambda timeout: [
+                    normalize(ticket.to_dict()) for ticket in self._ordered(query(), order, limit).stream(retry=None, timeout=timeout)
+                ])
+            except StorageError as e:
+                self._read_failed(e)
+            else:
+                self.breaker.record_success()
+                self.journal.cache_put(tickets)
+                pending = self.journal.pending_tickets()
+                if not pending:
+                    return tickets
+                merged = [t for t in tickets if str(t.get('id')) not in pending] + [normalize(t) for t in pending.values() if predicate(t)]
+                return self._sorted(merged, order, limit)
+        return self._sorted(self._cached(predicate), order, limit)
+
+    def _archived(self, operation: str, query: Callable[[Any], Any], order: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Run `query` against the archive collection; no cache fallback, so a failure raises StorageError"""
+        archive = self.db.collection(self.archive_collection)
+        return self.policy.call(operation, lambda timeout: [
+            normalize(ticket.to_dict()) for ticket in self._ordered(query(archive), order, limit).stream(retry=None, timeout=timeout)
+        ])
+
+    def _write(self, event: str, previous: Dict[str, Any], changes: Dict[str, Any]):
+        """Journal a ticket update, then notify listeners; Firestore is updated by the replay thread"""
+        ticket = {**previous, **changes}
+        self.journal.append(str(previous['id']), 'update', changes, ticket)
+        self.replayer.notify()
+        self._emit(event, ticket, previous)
 
-    def create_ticket(self, user_id: int, user_name: str, title: str, description: str, location: str, categories: List[str] = None) -> Dict[str, Any]:
-        """Create a new ticket with a counter-based ID"""
-        counter_doc = self.db.collection(self.dev_configs).document('counter').get()
-        if counter_doc.exists:
-            current_counter = counter_doc.to_dict().get('value', 0)
+    def _replay(self, op: str, ticket_id: str, payload: Dict[str, Any]):
+        """Apply one journaled write to Firestore (safe to repeat)"""
+        self.background_policy.call(f"replay_{op}", lambda timeout: self._apply(op, ticket_id, payload, timeout))
+
+    def _apply(self, op: str, ticket_id: str, payload: Dict[str, Any], timeout: float):
+        ticket_ref = self.db.collection(self.tickets_collection).document(ticket_id)
+        if op == 'create':
+            counter_ref = self.db.collection(self.dev_configs).document('counter')
+            counter_doc = counter_ref.get(retry=None, timeout=timeout)
+            current_counter = int(counter_doc.to_dict().get('value', 0)) if counter_doc.exists else 0
+            if int(ticket_id) > current_counter:
+                counter_ref.set({
+                    'value': int(ticket_id),
+                    'updated_at': utcnow()
+                }, retry=None, timeout=timeout)
+            ticket_ref.set(payload, retry=None, timeout=timeout)
         else:
-            current_counter = 0
+            ticket_ref.set(payload, merge=True, retry=None, timeout=timeout)
+
+    def _next_ticket_id(self) -> str:
+        """Next counter-based id; allocated locally so ids keep coming while Firestore is down"""
+        floor = 0
+        if self.breaker.allow():
+            counter_ref = self.db.collection(self.dev_configs).document('counter')
+            try:
+                counter_doc = self.policy.call('read_counter', lambda timeout: counter_ref.get(retry=None, timeout=timeout))
+            except StorageError as e:
+                self._read_failed(e)
+            else:
+                self.breaker.record_success()
+                if counter_doc.exists:
+                    floor = int(counter_doc.to_dict().get('value', 0))
+        return str(self.journal.next_counter(floor))
+
+    def create_ticket(self, user_id: int, user_name: str, title: str, description: str, location: str, categories: List[str] = None, idempotency_key: str = None) -> Dict[str, Any]:
+        """
+        Create a new ticket with a counter-based ID
         
-        ticket_id = str(current_counter + 1)
+        Repeated calls with the same idempotency_key raise DuplicateTicketError
+        carrying the ticket from the first call, without writing anything.
+        """
+        if idempotency_key:
+            existing = self.idempotency.claim(idempotency_key)
+            if existing is not None:
+                raise DuplicateTicketError(None if existing is PENDING else existing)
         
-        self.db.collection(self.dev_configs).document('counter').set({
-            'value': current_counter + 1,
-            'updated_at': datetime.now().isoformat()
-        })
+        try:
+            ticket = self._create_ticket(user_id, user_name, title, description, location, categories)
+        except Exception:
+            if idempotency_key:
+                self.idempotency.release(idempotency_key)
+            raise
         
-        if categories is None:
-            categories = []
-        else:
-            categories = [cat for cat in categories if cat in globals()["categories"]]
+        if idempotency_key:
+            self.idempotency.complete(idempotency_key, ticket)
+        return ticket
+
+    def _create_ticket(self, user_id: int, user_name: str, title: str, description: str, location: str, categories: List[str] = None) -> Dict[str, Any]:
+        ticket_id = self._next_ticket_id()
+        
+        # callers pick categories from the guild catalogue, see utils/categories.py
+        categories = list(categories or [])
         
         ticket = {
             'id': ticket_id,
@@ -74,187 +253,349 @@ class FirebaseTicketDatabase:
             'location': location,
             'categories': categories,
             'status': 'open',
-            'created_at': datetime.now().isoformat(),
+            'created_at': utcnow(),
             'mentor_id': None,
             'mentor_name': None,
             'closed_at': None
         }
         
-        self.db.collection(self.tickets_collection).document(ticket_id).set(ticket)
+        self.journal.append(ticket_id, 'create', ticket, ticket)
+        self.replayer.notify()
+        self._emit('created', ticket, None)
         return ticket
 
     def get_ticket_by_id(self, ticket_id: int) -> Optional[Dict[str, Any]]:
         """Get ticket by ID"""
-        try:
-            doc = self.db.collection(self.tickets_collection).document(str(ticket_id)).get()
-            if doc.exists:
-                return doc.to_dict()
-            return None
-        except Exception:
-            return None
+        ticket_id = str(ticket_id)
+        pending = self.journal.pending_ticket(ticket_id)
+        if pending is not None:
+            return normalize(pending)
+        if self.breaker.allow():
+            ticket_ref = self.db.collection(self.tickets_collection).document(ticket_id)
+            try:
+                doc = self.policy.call('get_ticket', lambda timeout: ticket_ref.get(retry=None, timeout=timeout))
+            except StorageError as e:
+                self._read_failed(e)
+            else:
+                self.breaker.record_success()
+                if doc.exists:
+                    ticket = normalize(doc.to_dict())
+                    self.journal.cache_put([ticket])
+                    return ticket
+                # only a miss in the hot tier pays for the archive lookup
+                archive_ref = self.db.collection(self.archive_collection).document(ticket_id)
+                try:
+                    doc = self.policy.call('get_archived_ticket', lambda timeout: archive_ref.get(retry=None, timeout=timeout))
+                except StorageError as e:
+                    # archived tickets aren't in the local cache, so this ends up as not found
+                    self._read_failed(e)
+                else:
+                    self.breaker.record_success()
+                    return normalize(doc.to_dict()) if doc.exists else None
+        ticket = self.journal.cache_get(ticket_id)
+        if ticket is None and not self.journal.seeded:
+            raise StorageUnavailable("Firestore is unavailable and the local ticket cache has not been loaded")
+        get_metrics().increment('ticket_cache_reads_total')
+        return normalize(ticket) if ticket else None
 
-    def get_user_tickets(self, user_id: int) -> List[Dict[str, Any]]:
-        """Returns all tickets for a specific user"""
-        try:
-            tickets = self.db.collection(self.tickets_collection).where(
-                filter=FieldFilter("user_id", "==", user_id)
-            ).stream()
-            return [ticket.to_dict() for ticket in tickets]
-        except Exception:
-            return []
+    def get_user_tickets(self, user_id: int, include_archive: bool = False, limit: int = None) -> List[Dict[str, Any]]:
+        """Returns a user's live tickets (plus archived ones if include_archive), newest first, at most `limit`"""
+        tickets = self._query(
+            'user_tickets',
+            lambda: self.db.collection(self.tickets_collection).where(filter=FieldFilter("user_id", "==", user_id)),
+            lambda ticket: ticket.get('user_id') == user_id,
+            order='desc', limit=limit
+        )
+        if include_archive:
+            tickets = self._sorted(tickets + self._archived(
+                'archived_user_tickets', lambda archive: archive.where(filter=FieldFilter("user_id", "==", user_id)), 'desc', limit
+            ), 'desc', limit)
+        return tickets
 
-    def get_open_tickets(self) -> List[Dict[str, Any]]:
-        """Returns all unresolved tickets"""
-        try:
-            tickets = self.db.collection(self.tickets_collection).where(
-                filter=FieldFilter("status", "==", "open")
-            ).stream()
-            return [ticket.to_dict() for ticket in tickets]
-        except Exception:
-            return []
+    def get_all_tickets(self, include_archive: bool = False) -> List[Dict[str, Any]]:
+        """Returns every live ticket, plus archived ones if include_archive (used to seed in-memory indexes and the local cache)"""
+        tickets = self._query(
+            'all_tickets',
+            lambda: self.db.collection(self.tickets_collection),
+            lambda ticket: True,
+            self.background_policy
+        )
+        if not self.breaker.degraded:
+            self.journal.mark_seeded()
+        if include_archive:
+            archive = self.db.collection(self.archive_collection)
+            tickets += self.background_policy.call('archived_tickets', lambda timeout: [
+                normalize(ticket.to_dict()) for ticket in archive.stream(retry=None, timeout=timeout)
+            ])
+        return tickets
 
-    def get_mentor_tickets(self, mentor_id: int) -> List[Dict[str, Any]]:
-        """Get all tickets assigned to a mentor"""
-        try:
-            tickets = self.db.collection(self.tickets_collection).where(
-                filter=FieldFilter("mentor_id", "==", mentor_id)
-            ).stream()
-            return [ticket.to_dict() for ticket in tickets]
-        except Exception:
-            return []
+    def get_open_tickets(self, limit: int = None) -> List[Dict[str, Any]]:
+        """Returns unresolved tickets, oldest first (queue order), at most `limit`"""
+        return self._query(
+            'open_tickets',
+            lambda: self.db.collection(self.tickets_collection).where(filter=FieldFilter("status", "==", "open")),
+            lambda ticket: ticket.get('status') == 'open',
+            order='asc', limit=limit
+        )
+
+    def get_mentor_tickets(self, mentor_id: int, include_archive: bool = False, limit: int = None) -> List[Dict[str, Any]]:
+        """Get a mentor's live tickets (plus archived ones if include_archive), newest first, at most `limit`"""
+        tickets = self._query(
+            'mentor_tickets',
+            lambda: self.db.collection(self.tickets_collection).where(filter=FieldFilter("mentor_id", "==", mentor_id)),
+            lambda ticket: ticket.get('mentor_id') == mentor_id,
+            order='desc', limit=limit
+        )
+        if include_archive:
+            tickets = self._sorted(tickets + self._archived(
+                'archived_mentor_tickets', lambda archive: archive.where(filter=FieldFilter("mentor_id", "==", mentor_id)), 'desc', limit
+            ), 'desc', limit)
+        return tickets
 
     # Assign a ticket to a specific mentor, changes status to 'pending'
     def assign_ticket(self, ticket_id: int, mentor_id: int, mentor_name: str) -> bool:
         """Assign a ticket to a mentor"""
+        ticket_data = self.get_ticket_by_id(ticket_id)
         try:
-            ticket_ref = self.db.collection(self.tickets_collection).document(str(ticket_id))
-            ticket_doc = ticket_ref.get()
-            
-            if not ticket_doc.exists:
+            if not ticket_data or ticket_data['status'] != 'open':
                 return False
             
-            ticket_data = ticket_doc.to_dict()
-            if ticket_data['status'] != 'open':
-                return False
-            
-            # Update the ticket
-            ticket_ref.update({
+            self._write('assigned', ticket_data, {
                 'mentor_id': mentor_id,
                 'mentor_name': mentor_name
             })
             return True
-        except Exception:
+        except Exception as e:
+            logger.error(f"Failed to assign ticket {ticket_id}: {e}")
             return False
 
     def close_ticket(self, ticket_id: int) -> bool:
         """Closes a pending ticket, changes status to 'closed'"""
+        ticket_data = self.get_ticket_by_id(ticket_id)
         try:
-            ticket_ref = self.db.collection(self.tickets_collection).document(str(ticket_id))
-            ticket_doc = ticket_ref.get()
-            
-            if not ticket_doc.exists:
+            if not ticket_data or ticket_data['status'] == 'closed':
                 return False
             
-            ticket_data = ticket_doc.to_dict()
-            if ticket_data['status'] == 'closed':
-                return False
-            
-            # Update the ticket
-            ticket_ref.update({
+            self._write('closed', ticket_data, {
                 'status': 'closed',
-                'closed_at': datetime.now().isoformat()
+                'closed_at': utcnow()
             })
             return True
-        except Exception:
+        except Exception as e:
+            logger.error(f"Failed to close ticket {ticket_id}: {e}")
             return False
 
     def reassign_ticket(self, ticket_id: int, new_mentor_id: int, new_mentor_name: str) -> bool:
         """Reassign a ticket to a different mentor"""
+        ticket_data = self.get_ticket_by_id(ticket_id)
         try:
-            ticket_ref = self.db.collection(self.tickets_collection).document(str(ticket_id))
-            ticket_doc = ticket_ref.get()
-            
-            if not ticket_doc.exists:
-                return False
-            
-            ticket_data = ticket_doc.to_dict()
-            if ticket_data['status'] != 'open':
+            if not ticket_data or ticket_data['status'] != 'open':
                 return False
             
-            # Update the ticket
-            ticket_ref.update({
+            self._write('reassigned', ticket_data, {
                 'mentor_id': new_mentor_id,
                 'mentor_name': new_mentor_name
             })
             return True
-        except Exception:
+        except Exception as e:
+            logger.error(f"Failed to reassign ticket {ticket_id}: {e}")
             return False
 
     def release_ticket(self, ticket_id: int) -> bool:
         """Release a ticket back to the queue by removing mentor assignment"""
+        ticket_data = self.get_ticket_by_id(ticket_id)
         try:
-            ticket_ref = self.db.collection(self.tickets_collection).document(str(ticket_id))
-            ticket_doc = ticket_ref.get()
-            
-            if not ticket_doc.exists:
-                return False
-            
-            ticket_data = ticket_doc.to_dict()
-            if ticket_data['status'] != 'open':
+            if not ticket_data or ticket_data['status'] != 'open':
                 return False
             
-            # Update the ticket to remove mentor assignment
-            ticket_ref.update({
+            self._write('released', ticket_data, {
                 'mentor_id': None,
                 'mentor_name': None
             })
             return True
-        except Exception:
+        except Exception as e:
+            logger.error(f"Failed to release ticket {ticket_id}: {e}")
             return False
 
-    def get_tickets_by_category(self, category: str) -> List[Dict[str, Any]]:
-        """Get all tickets for a specific category"""
-        try:
-            tickets = self.db.collection(self.tickets_collection).where(
-                filter=FieldFilter("categories", "array_contains", category)
-            ).stream()
-            return [ticket.to_dict() for ticket in tickets]
-        except Exception:
-            return []
+    def get_tickets_by_category(self, category: str, include_archive: bool = False, limit: int = None) -> List[Dict[str, Any]]:
+        """Get the live tickets for a category (plus archived ones if include_archive), newest first, at most `limit`"""
+        tickets = self._query(
+            'category_tickets',
+            lambda: self.db.collection(self.tickets_collection).where(filter=FieldFilter("categories", "array_contains", category)),
+            lambda ticket: category in (ticket.get('categories') or []),
+            order='desc', limit=limit
+        )
+        if include_archive:
+            tickets = self._sorted(tickets + self._archived(
+                'archived_category_tickets', lambda archive: archive.where(filter=FieldFilter("categories", "array_contains", category)), 'desc', limit
+            ), 'desc', limit)
+        return tickets
+
+    def archive_closed_tickets(self, older_than: float, batch_size: int = 200) -> int:
+        """
+        Move tickets closed more than `older_than` seconds ago into the archive collection
+
+        Due tickets are read a page at a time with a range scan on closed_at
+        (status == closed AND closed_at < cutoff ORDER BY closed_at), and each page is
+        copied and deleted in one atomic batch (Firestore allows 500 writes per batch,
+        two per ticket). Tickets with unflushed journal writes are left for the next
+        run. Returns the number of tickets moved.
+        """
+        batch_size = max(1, min(batch_size, 250))
+        cutoff = utcnow() - timedelta(seconds=older_than)
+        hot = self.db.collection(self.tickets_collection)
+        archive = self.db.collection(self.archive_collection)
+        due = (hot.where(filter=FieldFilter("status", "==", "closed"))
+                  .where(filter=FieldFilter("closed_at", "<", cutoff))
+                  .order_by('closed_at')
+                  .limit(batch_size))
+        moved = 0
+        cursor = None
+        while True:
+            page_query = due.start_after(cursor) if cursor is not None else due
+            page = self.background_policy.call('closed_tickets', lambda timeout: list(page_query.stream(retry=None, timeout=timeout)))
+            if not page:
+                break
+            cursor = page[-1]
+            pending = self.journal.pending_tickets()
+            chunk = [doc.to_dict() for doc in page if doc.id not in pending]
+            if chunk:
+                archived_at = utcnow()
+
+                def commit(timeout: float):
+                    batch = self.db.batch()
+                    for ticket in chunk:
+                        ticket_id = str(ticket['id'])
+                        batch.set(archive.document(ticket_id), {**ticket, 'archived_at': archived_at})
+                        batch.delete(hot.document(ticket_id))
+                    batch.commit(retry=None, timeout=timeout)
+
+                self.background_policy.call('archive_batch', commit)
+                self.journal.cache_evict(str(ticket['id']) for ticket in chunk)
+                moved += len(chunk)
+                get_metrics().increment('tickets_archived_total', amount=len(chunk))
+            if len(page) < batch_size:
+                break
+        if moved:
+            logger.info(f"Archived {moved} closed ticket(s)")
+        return moved
+
+    def _fresh_config(self, config_key: str) -> bool:
+        read_at = self._config_read_at.get(config_key, self._configs_loaded_at)
+        return read_at is not None and time.monotonic() - read_at < self.config_ttl
 
     def get_dev_config(self, config_key: str) -> Optional[str]:
-        """Get development configuration from Firebase"""
-        try:
-            doc = self.db.collection(self.dev_configs).document(config_key).get()
-            if doc.exists:
-                return doc.to_dict().get('value')
-            return None
-        except Exception:
-            return None
+        """Get development configuration from Firebase (cached for config_ttl; last known value while Firestore is degraded)"""
+        if self._fresh_config(config_key):
+            return self._configs.get(config_key)
+        if self.breaker.allow():
+            config_ref = self.db.collection(self.dev_configs).document(config_key)
+            try:
+                doc = self.policy.call('get_config', lambda timeout: config_ref.get(retry=None, timeout=timeout))
+            except StorageError as e:
+                self._read_failed(e)
+            else:
+                self.breaker.record_success()
+                value = doc.to_dict().get('value') if doc.exists else None
+                self._configs[config_key] = value
+                self._config_read_at[config_key] = time.monotonic()
+                return value
+        if config_key not in self._configs:
+            raise StorageUnavailable(f"Firestore is unavailable and {config_key} has not been read yet")
+        return self._configs[config_key]
+
+    def load_dev_configs(self) -> Dict[str, Optional[str]]:
+        """Read every dev config in one query, so the next config_ttl seconds of reads are served from memory"""
+        collection = self.db.collection(self.dev_configs)
+        docs = self.background_policy.call('load_configs', lambda timeout: list(collection.stream(retry=None, timeout=timeout)))
+        loaded_at = time.monotonic()
+        for doc in docs:
+            self._configs[doc.id] = (doc.to_dict() or {}).get('value')
+            self._config_read_at[doc.id] = loaded_at
+        self._configs_loaded_at = loaded_at
+        return {doc.id: self._configs[doc.id] for doc in docs}
 
     def set_dev_config(self, config_key: str, value: str) -> bool:
         """Set development configuration in Firebase"""
+        config_ref = self.db.collection(self.dev_configs).document(config_key)
         try:
-            self.db.collection(self.dev_configs).document(config_key).set({
+            self.policy.call('set_config', lambda timeout: config_ref.set({
                 'value': value,
-                'updated_at': datetime.now().isoformat()
-            })
+                'updated_at': utcnow()
+            }, retry=None, timeout=timeout))
+        except StorageError as e:
+            logger.error(f"Failed to set {config_key}: {e}")
+            return False
+        self._configs[config_key] = value
+        self._config_read_at[config_key] = time.monotonic()
+        if config_key == 'counter':
+            self.journal.set_counter(int(value))
+        return True
+
+    def get_category_groups(self, guild_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Get a guild's category groups as [{'name': ..., 'categories': [...]}], or None if never set"""
+        doc_ref = self.db.collection(self.categories_collection).document(str(guild_id))
+        doc = self.policy.call('get_categories', lambda timeout: doc_ref.get(retry=None, timeout=timeout))
+        if doc.exists:
+            return doc.to_dict().get('groups')
+        return None
+
+    def set_category_groups(self, guild_id: int, groups: List[Dict[str, Any]]) -> bool:
+        """Replace a guild's category groups"""
+        doc_ref = self.db.collection(self.categories_collection).document(str(guild_id))
+        try:
+            self.policy.call('set_categories', lambda timeout: doc_ref.set({
+                'groups': groups,
+                'updated_at': utcnow()
+            }, retry=None, timeout=timeout))
             return True
-        except Exception:
+        except StorageError as e:
+            logger.error(f"Failed to save categories for guild {guild_id}: {e}")
             return False
 
+    def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        """
+        Take or renew the named lease for `ttl` seconds; False if another holder's lease is still live
+
+        Runs in a transaction, so two instances racing for an expired lease can't both win.
+        """
+        lease_ref = self.db.collection(self.leases_collection).document(name)
+
+        @firestore.transactional
+        def claim(transaction, timeout: float) -> bool:
+            snapshot = lease_ref.get(transaction=transaction, retry=None, timeout=timeout)
+            lease = snapshot.to_dict() if snapshot.exists else {}
+            now = time.time()
+            if lease.get('holder') not in (None, holder) and lease.get('expires_at', 0) > now:
+                return False
+            transaction.set(lease_ref, {'holder': holder, 'expires_at': now + ttl, 'renewed_at': now})
+            return True
+
+        return self.policy.call('acquire_lease', lambda timeout: claim(self.db.transaction(), timeout))
+
+    def release_lease(self, name: str, holder: str):
+        """Give up the named lease if we still hold it, so another instance can take over at once"""
+        lease_ref = self.db.collection(self.leases_collection).document(name)
+
+        @firestore.transactional
+        def drop(transaction, timeout: float):
+            snapshot = lease_ref.get(transaction=transaction, retry=None, timeout=timeout)
+            if snapshot.exists and snapshot.to_dict().get('holder') == holder:
+                transaction.delete(lease_ref)
+
+        self.policy.call('release_lease', lambda timeout: drop(self.db.transaction(), timeout))
+
 # Global Firebase database instance
 firebase_db = None
 
-def init_firebase_db(credentials_path: str = None, project_id: str = None):
+def init_firebase_db(credentials_path: str = None, project_id: str = None, credentials_json: str = None, journal_path: str = "journal.sqlite3", client=None, config_ttl: float = 0.0):
     """Initialize the global Firebase database instance"""
     global firebase_db
-    firebase_db = FirebaseTicketDatabase(credentials_path, project_id)
+    firebase_db = FirebaseTicketDatabase(credentials_path, project_id, credentials_json, journal_path, client, config_ttl)
     return firebase_db
 
 def get_firebase_db() -> FirebaseTicketDatabase:
     """Get the global Firebase database instance"""
-    global firebase_db
     if firebase_db is None:
         raise RuntimeError("Firebase database not initialized. Call init_firebase_db() first.")
     return firebase_db 
\ No newline at end of file
@@ -0,0 +1,114 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List
+from utils.lifecycle import get_lifecycle
+from utils.metrics import get_metrics
+
+logger = logging.getLogger('discord')
+
+"""
+Adaptive batching of mentor-channel notifications: one message per ticket when it's quiet,
+digests when tickets arrive faster than the channel can take messages
+"""
+# Discord shows at most 25 buttons (5 rows of 5) and 25 embed fields per message
+MAX_DIGEST_SIZE = 25
+
+class NotificationBatcher:
+    """
+    Posts each item on its own while fewer than `rate_threshold` arrived in the last
+    `window` seconds. Above that, items for a channel are buffered and posted together
+    by `send_digest` once `max_batch` are waiting or `max_delay` seconds after the
+    first one, whichever comes first, so no item waits longer than `max_delay`.
+
+    While a channel has a digest pending, new items join it even if the rate has
+    dropped, so notifications are never posted out of order.
+    """
+
+    def __init__(self, send_one: Callable[[Any, Any], Awaitable[None]], send_digest: Callable[[Any, List[Any]], Awaitable[None]],
+                 rate_threshold: int = 10, window: float = 60.0, max_delay: float = 5.0, max_batch: int = 10):
+        self.send_one = send_one
+        self.send_digest = send_digest
+        self.rate_threshold = rate_threshold
+        self.window = window
+        self.max_delay = max_delay
+        self.max_batch = max(2, min(max_batch, MAX_DIGEST_SIZE))
+        self._arrivals: Deque[float] = deque()
+        self._pending: Dict[int, List[Any]] = {}
+        self._timers: Dict[int, asyncio.Task] = {}
+
+    def recent_arrivals(self) -> int:
+        """Items submitted in the last `window` seconds"""
+        cutoff = time.monotonic() - self.window
+        while self._arrivals and self._arrivals[0] < cutoff:
+            self._arrivals.popleft()
+        return len(self._arrivals)
+
+    @property
+    def bursting(self) -> bool:
+        return self.recent_arrivals() > self.rate_threshold
+
+    async def submit(self, channel, item: Any):
+        """Post the item now, or queue it for the channel's next digest"""
+        self._arrivals.append(time.monotonic())
+        if channel.id not in self._pending and not self.bursting:
+            await self._send(channel, [item])
+            return
+
+        pending = self._pending.setdefault(channel.id, [])
+        if not pending:
+            logger.info(f"Notification burst in #{channel}, switching to digests")
+        pending.append(item)
+        if len(pending) >= self.max_batch:
+            await self.flush(channel)
+        elif channel.id not in self._timers:
+            # spawned through the lifecycle so a digest that's waiting is still posted on shutdown
+            self._timers[channel.id] = get_lifecycle().spawn(self._flush_later(channel))
+
+    async def _flush_later(self, channel):
+        await asyncio.sleep(self.max_delay)
+        self._timers.pop(channel.id, None)
+        await self.flush(channel)
+
+    async def flush(self, channel):
+        """Post whatever is waiting for the channel"""
+        timer = self._timers.pop(channel.id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        items = self._pending.pop(channel.id, [])
+        if items:
+            await self._send(channel, items)
+
+    async def _send(self, channel, items: List[Any]):
+        mode = 'single' if len(items) == 1 else 'digest'
+        try:
+            if mode == 'single':
+                await self.send_one(channel, items[0])
+            else:
+                await self.send_digest(channel, items)
+        except Exception as e:
+            logger.error(f"Failed to post {len(items)} notification(s) in #{channel}: {e}")
+            get_metrics().increment('notifications_failed_total', mode=mode)
+            return
+        metrics = get_metrics()
+        metrics.increment('notification_messages_total', mode=mode)
+        metrics.increment('notification_items_total', amount=len(items), mode=mode)
+
+# Global mentor-channel batcher
+notification_batcher = None
+
+def get_notification_batcher() -> NotificationBatcher:
+    """Get the batcher for new-ticket notifications, creating it on first use"""
+    global notification_batcher
+    if notification_batcher is None:
+        from config import Config
+        from views.manage_ticket import post_ticket_notification, post_ticket_digest
+        notification_batcher = NotificationBatcher(
+            post_ticket_notification,
+            post_ticket_digest,
+            rate_threshold=Config.NOTIFY_DIGEST_RATE_PER_MINUTE,
+            max_delay=Config.NOTIFY_DIGEST_MAX_DELAY_SECONDS,
+            max_batch=Config.NOTIFY_DIGEST_MAX_TICKETS
+        )
+    return notification_batcher
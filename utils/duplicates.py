@@ -0,0 +1,113 @@
+import random
+import threading
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from utils.search import tokenize
+
+"""
+Near-duplicate detection for open tickets using MinHash signatures and LSH banding
+"""
+PRIME = (1 << 61) - 1
+MASK = (1 << 61) - 1
+
+def shingles(title: str, description: str) -> FrozenSet[str]:
+    """Word unigrams and bigrams of the ticket text"""
+    tokens = tokenize(f"{title} {description}")
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return frozenset(grams)
+
+class DuplicateDetector:
+    """
+    Keeps a MinHash signature per open ticket, bucketed by LSH band.
+
+    A lookup hashes the new ticket once, collects tickets that share any band
+    bucket and confirms each candidate with the exact Jaccard similarity, so
+    the cost depends on the number of near matches, not on the number of open tickets.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 2, threshold: float = 0.5, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, PRIME), rng.randrange(0, PRIME)) for _ in range(bands * rows)]
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = defaultdict(set)
+        self._entries: Dict[str, Tuple[FrozenSet[str], Tuple[Tuple[int, ...], ...]]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _bands(self, grams: FrozenSet[str]) -> Tuple[Tuple[int, ...], ...]:
+        hashes = [hash(gram) & MASK for gram in grams]
+        signature = [min((a * h + b) % PRIME for h in hashes) for a, b in self._perms]
+        return tuple(tuple(signature[i:i + self.rows]) for i in range(0, len(signature), self.rows))
+
+    def add(self, ticket: Dict[str, Any]):
+        ticket_id = str(ticket['id'])
+        grams = shingles(ticket.get('title', ''), ticket.get('description', ''))
+        if not grams:
+            return
+        bands = self._bands(grams)
+        with self._lock:
+            self.remove(ticket_id)
+            self._entries[ticket_id] = (grams, bands)
+            for index, band in enumerate(bands):
+                self._buckets[(index, band)].add(ticket_id)
+
+    def remove(self, ticket_id: str):
+        ticket_id = str(ticket_id)
+        with self._lock:
+            entry = self._entries.pop(ticket_id, None)
+            if entry is None:
+                return
+            for index, band in enumerate(entry[1]):
+                bucket = self._buckets.get((index, band))
+                if bucket is not None:
+                    bucket.discard(ticket_id)
+                    if not bucket:
+                        del self._buckets[(index, band)]
+
+    def load(self, tickets):
+        """Index a snapshot of open tickets"""
+        for ticket in tickets:
+            if ticket.get('status') == 'open':
+                self.add(ticket)
+
+    def apply(self, event: str, ticket: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+        """Database listener: track tickets while they are open"""
+        if event == 'created':
+            self.add(ticket)
+        elif event == 'closed':
+            self.remove(ticket['id'])
+
+    def find(self, title: str, description: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """Open tickets similar to the given text as (ticket_id, similarity), most similar first"""
+        grams = shingles(title, description)
+        if not grams:
+            return []
+        bands = self._bands(grams)
+        matches = []
+        with self._lock:
+            candidates = set()
+            for index, band in enumerate(bands):
+                candidates.update(self._buckets.get((index, band), ()))
+            for ticket_id in candidates:
+                other = self._entries[ticket_id][0]
+                similarity = len(grams & other) / len(grams | other)
+                if similarity >= self.threshold:
+                    matches.append((ticket_id, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
+
+# Global duplicate detector
+duplicate_detector = None
+
+def get_duplicate_detector() -> DuplicateDetector:
+    """Get the global duplicate detector, creating it on first use"""
+    global duplicate_detector
+    if duplicate_detector is None:
+        from config import Config
+        duplicate_detector = DuplicateDetector(threshold=Config.DUPLICATE_THRESHOLD)
+    return duplicate_detector
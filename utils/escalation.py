@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+import discord
+from utils.lifecycle import get_lifecycle
+from utils.metrics import get_metrics
+from utils.styles import Emojis
+from utils.timer_wheel import Timer, TimerWheel
+from utils.timestamps import utcnow
+
+logger = logging.getLogger('discord')
+
+"""
+Escalation of tickets nobody has accepted: re-ping mentors, then category leads, then organisers
+"""
+# a category's lead role, e.g. "Python Lead"; without one the category's skill role is pinged
+LEAD_ROLE_NAME = "{category} Lead"
+
+class EscalationScheduler:
+    """
+    One timer per waiting ticket on a shared TimerWheel, for the ticket's next step.
+
+    Database events keep it current: a created or released ticket starts from the
+    first step, and accepting, reassigning or closing it cancels its timer (a dict
+    pop and a slot delete). When a step fires the next one is scheduled, so a ticket
+    never holds more than one timer, and a single task advances the wheel each tick.
+    """
+
+    def __init__(self, bot: discord.Client, steps: List[Tuple[str, float]], tick: float = 1.0):
+        self.bot = bot
+        # (step, seconds after posting), earliest first
+        self.steps = sorted(((step, minutes * 60) for step, minutes in steps if minutes > 0), key=lambda item: item[1])
+        self.wheel = TimerWheel(tick)
+        self._timers: Dict[str, Timer] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def apply(self, event: str, ticket: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+        """Database listener; runs on whichever thread made the write"""
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._on_event, event, str(ticket['id']), ticket.get('mentor_id'))
+            except RuntimeError:
+                # loop already closed during shutdown
+                pass
+
+    def _on_event(self, event: str, ticket_id: str, mentor_id: Optional[int]):
+        if event in ('created', 'released') and not mentor_id:
+            self.watch(ticket_id)
+        else:
+            self.cancel(ticket_id)
+
+    def watch(self, ticket_id: str, waited: float = 0.0):
+        """Escalate a ticket from the first step it hasn't reached after waiting `waited` seconds"""
+        self.cancel(ticket_id)
+        for index, (_, after) in enumerate(self.steps):
+            if after > waited:
+                self._timers[ticket_id] = self.wheel.schedule(after - waited, (ticket_id, index))
+                return
+
+    def cancel(self, ticket_id: str):
+        timer = self._timers.pop(ticket_id, None)
+        if timer is not None:
+            timer.cancel()
+
+    def start(self):
+        """Subscribe to ticket changes and watch the open unassigned tickets (leader only, after the ticket index loads)"""
+        if self._task is not None or not self.steps:
+            return
+        from utils.db import get_firebase_db
+        from utils.ticket_index import get_ticket_index
+        self._loop = asyncio.get_running_loop()
+        get_firebase_db().add_listener(self.apply)
+        # steps a ticket passed before a restart are not repeated
+        now = utcnow().timestamp()
+        for ticket in get_ticket_index().unassigned():
+            self.watch(ticket.id, now - ticket.created_at if ticket.created_at else 0.0)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Watching {len(self)} waiting ticket(s) for escalation")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.wheel.tick)
+            for ticket_id, index in self.wheel.advance():
+                self._timers.pop(ticket_id, None)
+                if index + 1 < len(self.steps):
+                    delay = self.steps[index + 1][1] - self.steps[index][1]
+                    self._timers[ticket_id] = self.wheel.schedule(delay, (ticket_id, index + 1))
+                get_lifecycle().spawn(self._escalate(ticket_id, *self.steps[index]))
+
+    async def _escalate(self, ticket_id: str, step: str, after: float):
+        from utils.db import get_firebase_db
+        from utils.ticket_index import get_ticket_index
+        from utils.ticket_messages import get_ticket_messages
+        ticket = get_ticket_index().get(ticket_id)
+        if ticket is None or ticket.mentor_id:
+            return
+        channel_id = await asyncio.to_thread(get_firebase_db().get_dev_config, 'mentor_channel')
+        channel = self.bot.get_channel(int(channel_id)) if channel_id else None
+        if channel is None:
+            return
+
+        mentions = [role.mention for role in self._roles(channel.guild, ticket, step)]
+        content = " ".join([Emojis.WAITING, *mentions, f"Ticket #{ticket.id} ({ticket.title[:80]}, {ticket.location[:40]}) "
+                                                       f"has been waiting {after / 60:g} minutes for a mentor."])
+        # reply to the ticket's notification so the accept button is one click away
+        reference = None
+        posted = get_ticket_messages().get(ticket_id)
+        if posted and posted[0] == channel.id:
+            reference = channel.get_partial_message(posted[1]).to_reference(fail_if_not_exists=False)
+        try:
+            await channel.send(content, reference=reference, mention_author=False)
+        except discord.HTTPException as e:
+            logger.warning(f"Couldn't escalate ticket #{ticket_id}: {e}", extra={'ticket_id': ticket_id})
+            return
+        get_metrics().increment('ticket_escalations_total', step=step)
+        logger.info(f"Escalated ticket #{ticket_id} ({step}) after {after / 60:g} minutes", extra={'ticket_id': ticket_id})
+
+    @staticmethod
+    def _roles(guild, ticket, step: str) -> List[discord.Role]:
+        """Who a step pings: mentors, then the leads of the ticket's categories, then the admin role"""
+        from utils.roles import get_role_registry
+        registry = get_role_registry()
+        if step == 'organisers':
+            roles = [registry.role(guild, 'admin')]
+        elif step == 'leads':
+            roles = [
+                discord.utils.get(guild.roles, name=LEAD_ROLE_NAME.format(category=category))
+                or discord.utils.get(guild.roles, name=category)
+                for category in ticket.categories
+            ] or [registry.role(guild, 'mentor')]
+        else:
+            roles = [registry.role(guild, 'mentor')]
+        # categories can share a lead
+        return list(dict.fromkeys(role for role in roles if role is not None))
+
+# Global escalation scheduler
+escalations = None
+
+def init_escalations(bot: discord.Client, steps: List[Tuple[str, float]], tick: float = 1.0) -> EscalationScheduler:
+    """Initialize the global escalation scheduler"""
+    global escalations
+    escalations = EscalationScheduler(bot, steps, tick)
+    return escalations
+
+def get_escalations() -> EscalationScheduler:
+    """Get the global escalation scheduler"""
+    if escalations is None:
+        raise RuntimeError("Escalations not initialized. Call init_escalations() first.")
+    return escalations
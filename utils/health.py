@@ -0,0 +1,75 @@
+import asyncio
+import time
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+from aiohttp import web
+from utils.metrics import get_metrics
+
+logger = logging.getLogger('discord')
+
+"""
+HTTP health and readiness endpoints for Cloud Run
+"""
+class CachedProbe:
+    """Runs a blocking check in a worker thread and caches the result for `interval` seconds"""
+
+    def __init__(self, check: Callable[[], bool], interval: float):
+        self.check = check
+        self.interval = interval
+        self._result = False
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def __call__(self) -> bool:
+        async with self._lock:
+            now = time.monotonic()
+            if self._checked_at is None or now - self._checked_at >= self.interval:
+                try:
+                    self._result = bool(await asyncio.to_thread(self.check))
+                except Exception:
+                    self._result = False
+                self._checked_at = now
+            return self._result
+
+class HealthServer:
+    """Serves /healthz (process is alive) and /readyz (every readiness check passes)"""
+
+    def __init__(self, port: int, readiness_checks: Dict[str, Callable[[], Awaitable[bool]]]):
+        self.port = port
+        self.readiness_checks = readiness_checks
+        self.app = web.Application()
+        self.app.router.add_get('/healthz', self.healthz)
+        self.app.router.add_get('/readyz', self.readyz)
+        self.app.router.add_get('/metrics', self.metrics)
+        self._runner: Optional[web.AppRunner] = None
+
+    async def healthz(self, request: web.Request) -> web.Response:
+        return web.json_response({'status': 'ok'})
+
+    async def readyz(self, request: web.Request) -> web.Response:
+        results = {}
+        for name, check in self.readiness_checks.items():
+            try:
+                results[name] = bool(await check())
+            except Exception:
+                results[name] = False
+        ready = all(results.values())
+        return web.json_response(
+            {'status': 'ready' if ready else 'unavailable', 'checks': results},
+            status=200 if ready else 503
+        )
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=get_metrics().render(), content_type='text/plain')
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '0.0.0.0', self.port)
+        await site.start()
+        logger.info(f"Health server listening on port {self.port}")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
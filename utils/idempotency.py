@@ -0,0 +1,51 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+"""
+Short-lived store that deduplicates repeated submissions of the same interaction
+"""
+PENDING = object()
+
+class IdempotencyStore:
+    """Maps idempotency keys to their result for `ttl` seconds"""
+
+    def __init__(self, ttl: float = 600, max_keys: int = 10000):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        while self._entries:
+            key, (_, expires_at) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_keys:
+                break
+            self._entries.popitem(last=False)
+
+    def claim(self, key: str) -> Optional[Any]:
+        """
+        Claim a key before doing the work.
+
+        Returns None if the caller now owns the key, PENDING if another call is
+        still working on it, or the stored result of an earlier call.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry[0]
+            self._entries[key] = (PENDING, now + self.ttl)
+            return None
+
+    def complete(self, key: str, result: Any):
+        """Store the result for a claimed key"""
+        with self._lock:
+            self._entries[key] = (result, time.monotonic() + self.ttl)
+
+    def release(self, key: str):
+        """Forget a claim whose work failed so the next attempt can retry"""
+        with self._lock:
+            self._entries.pop(key, None)
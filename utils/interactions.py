@@ -0,0 +1,115 @@
+import functools
+import logging
+import discord
+from utils.lifecycle import get_lifecycle
+from utils.log import bind
+from utils.metrics import get_metrics
+from utils.retry import StorageError
+from utils.styles import Emojis, Messages
+from utils.tracing import span
+
+logger = logging.getLogger('discord')
+
+"""
+Shared wrapper for view, modal and select callbacks
+"""
+# Discord fails an interaction that isn't acknowledged within 3 seconds
+ACK_DEADLINE_SECONDS = 3.0
+
+def _answered(interaction: discord.Interaction):
+    interaction.extras.setdefault('answered_at', discord.utils.utcnow())
+
+async def reply(interaction: discord.Interaction, content: str = None, **kwargs):
+    """Send a response, or a followup if the interaction was already acknowledged (e.g. deferred); returns the followup message"""
+    _answered(interaction)
+    if interaction.response.is_done():
+        # the first followup takes over a deferred "thinking..." message and its visibility,
+        # so a private answer (e.g. an error) to a public command replaces it instead
+        if interaction.extras.pop('public_thinking', False) and kwargs.get('ephemeral'):
+            with span('discord.delete_original_response'):
+                await interaction.delete_original_response()
+        with span('discord.followup.send'):
+            return await interaction.followup.send(content, **kwargs)
+    else:
+        with span('discord.response.send_message'):
+            await interaction.response.send_message(content, **kwargs)
+
+async def update_message(interaction: discord.Interaction, **kwargs):
+    """Edit the message a component belongs to, before or after deferring"""
+    _answered(interaction)
+    if interaction.response.is_done():
+        with span('discord.edit_original_response'):
+            await interaction.edit_original_response(**kwargs)
+    else:
+        with span('discord.response.edit_message'):
+            await interaction.response.edit_message(**kwargs)
+
+def interaction_handler(func=None, *, defer: str = None, ephemeral: bool = True):
+    """
+    Reject interactions while shutting down and track running handlers so shutdown can drain them.
+
+    With defer='reply' (a "thinking..." response) or defer='update' (components only;
+    the message is edited later) the interaction is acknowledged before the handler
+    runs, so slow storage can't push it past Discord's 3-second window. Handlers that
+    defer must answer through reply() and update_message(); with ephemeral=False the
+    "thinking..." message is public, and reply() replaces it for private answers. When the first answer
+    comes after the window (or, for handlers answering directly, when they finish
+    after it) it is counted as interaction_deadline_missed_total, or as
+    interaction_deadline_saved_total when deferring kept the interaction alive.
+
+    A StorageError from the handler is answered with a "try again" message instead of
+    leaving the interaction to fail. Log records from the handler carry the ticket,
+    guild, user and command, and each handled interaction is logged with its latency.
+    Sampled interactions are traced as a root span covering the handler, with child
+    spans for the storage and Discord calls made inside it.
+    """
+    if func is None:
+        return functools.partial(interaction_handler, defer=defer, ephemeral=ephemeral)
+
+    @functools.wraps(func)
+    async def wrapper(self, interaction: discord.Interaction, *args, **kwargs):
+        command = interaction.command.qualified_name if interaction.command else func.__qualname__
+        bind(
+            ticket_id=kwargs.get('ticket_id') or getattr(self, 'ticket_id', None),
+            guild_id=interaction.guild_id,
+            user_id=interaction.user.id,
+            command=command,
+            interaction_id=interaction.id
+        )
+        lifecycle = get_lifecycle()
+        if not lifecycle.accepting:
+            await interaction.response.send_message(f"{Emojis.WARNING} {Messages.SHUTTING_DOWN}", ephemeral=True)
+            return
+        # time from the user's click to the handler starting (gateway + event loop queueing)
+        queued_ms = round((discord.utils.utcnow() - interaction.created_at).total_seconds() * 1000, 1)
+        with span(f"interaction {command}", root=True, command=command, queued_ms=queued_ms,
+                  guild_id=interaction.guild_id, interaction_id=interaction.id) as trace:
+            async with lifecycle.inflight():
+                if defer:
+                    with span(f"discord.defer.{defer}"):
+                        if defer == 'reply':
+                            await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+                            interaction.extras['public_thinking'] = not ephemeral
+                        else:
+                            await interaction.response.defer()
+                outcome = 'ok'
+                try:
+                    return await func(self, interaction, *args, **kwargs)
+                except StorageError as e:
+                    outcome = 'storage_error'
+                    logger.warning(f"Storage error in {func.__qualname__}: {e}")
+                    await reply(interaction, f"{Emojis.WARNING} {Messages.STORAGE_UNAVAILABLE}", ephemeral=True)
+                except Exception:
+                    outcome = 'error'
+                    raise
+                finally:
+                    now = discord.utils.utcnow()
+                    answered_at = interaction.extras.get('answered_at') or now
+                    elapsed = (answered_at - interaction.created_at).total_seconds()
+                    if elapsed > ACK_DEADLINE_SECONDS:
+                        get_metrics().increment(f"interaction_deadline_{'saved' if defer else 'missed'}_total", handler=func.__qualname__)
+                    latency_ms = round((now - interaction.created_at).total_seconds() * 1000, 1)
+                    if trace:
+                        trace.set(outcome=outcome, answered_ms=round(elapsed * 1000, 1))
+                    logger.info("Interaction handled", extra={'latency_ms': latency_ms, 'outcome': outcome})
+    return wrapper
@@ -0,0 +1,255 @@
+import json
+import time
+import random
+import sqlite3
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from utils.circuit_breaker import CircuitBreaker
+from utils.metrics import get_metrics
+from utils.tracing import span
+from utils.timestamps import json_default, json_object_hook
+
+logger = logging.getLogger('discord')
+
+"""
+Local write-behind journal for ticket writes, replayed to Firestore in order
+"""
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS writes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_id TEXT NOT NULL,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS writes_ticket ON writes (ticket_id);
+CREATE TABLE IF NOT EXISTS tickets (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=json_default)
+
+def _loads(data: str) -> Any:
+    return json.loads(data, object_hook=json_object_hook)
+
+class WriteJournal:
+    """
+    SQLite (WAL mode) store holding unflushed ticket writes, with a cache of every known ticket.
+
+    A write and the ticket it produces are committed in one transaction, so tickets
+    with unflushed writes survive a restart along with the writes. Tickets read from
+    Firestore are only cached in memory: reads are far more frequent than writes and
+    Firestore has them anyway. Cached tickets with unflushed writes are never
+    overwritten by (older) Firestore reads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        # ticket id of each unflushed write, by sequence number
+        self._pending: Dict[int, str] = dict(self._conn.execute("SELECT seq, ticket_id FROM writes").fetchall())
+        self._seeded = False
+
+    def append(self, ticket_id: str, op: str, payload: Dict[str, Any], ticket: Dict[str, Any]) -> int:
+        """Record a write and the resulting ticket; returns the write's sequence number"""
+        with span('journal.append', op=op, ticket_id=ticket_id), self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO writes (ticket_id, op, payload, created_at) VALUES (?, ?, ?, ?)",
+                    (ticket_id, op, _dumps(payload), time.time())
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tickets (id, data) VALUES (?, ?)",
+                    (ticket_id, _dumps(ticket))
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._pending[cursor.lastrowid] = ticket_id
+            self._cache[ticket_id] = dict(ticket)
+            return cursor.lastrowid
+
+    def pending(self, limit: int = 50) -> List[Tuple[int, str, str, Dict[str, Any]]]:
+        """Oldest unflushed writes as (seq, ticket_id, op, payload)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, ticket_id, op, payload FROM writes ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+        return [(seq, ticket_id, op, _loads(payload)) for seq, ticket_id, op, payload in rows]
+
+    def ack(self, seq: int):
+        with self._lock:
+            self._conn.execute("DELETE FROM writes WHERE seq = ?", (seq,))
+            self._pending.pop(seq, None)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0]
+
+    def pending_tickets(self) -> Dict[str, Dict[str, Any]]:
+        """Cached tickets that still have unflushed writes, by id"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, data FROM tickets WHERE id IN (SELECT ticket_id FROM writes)"
+            ).fetchall()
+        return {ticket_id: _loads(data) for ticket_id, data in rows}
+
+    def pending_ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """The cached ticket if it has unflushed writes, else None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM tickets WHERE id = ? AND EXISTS (SELECT 1 FROM writes WHERE ticket_id = ?)",
+                (ticket_id, ticket_id)
+            ).fetchone()
+        return _loads(row[0]) if row else None
+
+    def cache_put(self, tickets: Iterable[Dict[str, Any]]):
+        """Cache tickets read from Firestore in memory, skipping any with unflushed local writes"""
+        with self._lock:
+            pending = set(self._pending.values())
+            for ticket in tickets:
+                if ticket.get('id') is not None and str(ticket['id']) not in pending:
+                    self._cache[str(ticket['id'])] = dict(ticket)
+
+    def cache_evict(self, ticket_ids: Iterable[str]):
+        """Drop tickets from the cache (e.g. once archived), keeping any with unflushed local writes"""
+        rows = [(str(ticket_id),) for ticket_id in ticket_ids]
+        with self._lock:
+            pending = set(self._pending.values())
+            for ticket_id, in rows:
+                if ticket_id not in pending:
+                    self._cache.pop(ticket_id, None)
+            self._conn.executemany(
+                "DELETE FROM tickets WHERE id = ? AND id NOT IN (SELECT ticket_id FROM writes)", rows
+            )
+
+    def cache_get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            ticket = self._cache.get(str(ticket_id))
+            if ticket is not None:
+                return dict(ticket)
+            # written before a restart and not read from Firestore since
+            row = self._conn.execute("SELECT data FROM tickets WHERE id = ?", (str(ticket_id),)).fetchone()
+        return _loads(row[0]) if row else None
+
+    def cached_tickets(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            tickets = {ticket_id: dict(ticket) for ticket_id, ticket in self._cache.items()}
+        # tickets with writes from before a restart are only on disk
+        for ticket_id, ticket in self.pending_tickets().items():
+            tickets.setdefault(ticket_id, ticket)
+        return list(tickets.values())
+
+    def next_counter(self, floor: int = 0) -> int:
+        """Allocate the next ticket number, never below `floor` (the last number Firestore has seen)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT value FROM meta WHERE key = 'counter'").fetchone()
+                value = max(row[0] if row else 0, floor) + 1
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('counter', ?)", (value,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return value
+
+    @property
+    def seeded(self) -> bool:
+        """Whether the cache has been filled from a full Firestore read since this process started"""
+        return self._seeded
+
+    def mark_seeded(self):
+        self._seeded = True
+
+    def set_counter(self, value: int):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('counter', ?)", (value,))
+
+class JournalReplayer:
+    """
+    Background thread that applies journaled writes to Firestore strictly in order.
+
+    A failed write stays at the head of the journal and is retried with jittered
+    exponential backoff; the circuit breaker keeps the thread from hammering a
+    backend that is down.
+    """
+
+    def __init__(self, journal: WriteJournal, apply: Callable[[str, str, Dict[str, Any]], None], breaker: CircuitBreaker, min_backoff: float = 0.5, max_backoff: float = 30.0):
+        self.journal = journal
+        self.apply = apply
+        self.breaker = breaker
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._idle = threading.Event()
+        self._retry_now = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='journal-replay', daemon=True)
+            self._thread.start()
+
+    def notify(self):
+        """Wake the replay thread after a new write"""
+        self._idle.clear()
+        self._wake.set()
+
+    def flush(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for the journal to drain; True if it did"""
+        self.notify()
+        # a write waiting out its backoff is retried now rather than after the deadline
+        self._retry_now.set()
+        return self._idle.wait(timeout)
+
+    def stop(self):
+        self._stopping.set()
+        self._retry_now.set()
+        self._wake.set()
+
+    def _run(self):
+        backoff = self.min_backoff
+        metrics = get_metrics()
+        while not self._stopping.is_set():
+            self._wake.clear()
+            batch = self.journal.pending()
+            if not batch:
+                self._idle.set()
+                self._wake.wait()
+                continue
+
+            for seq, ticket_id, op, payload in batch:
+                if not self.breaker.allow():
+                    self._stopping.wait(backoff)
+                    break
+                try:
+                    self.apply(op, ticket_id, payload)
+                except Exception as e:
+                    self.breaker.record_failure()
+                    metrics.increment('journal_replay_failures_total', op=op)
+                    logger.warning(f"Replaying {op} for ticket {ticket_id} failed, retrying in {backoff:.1f}s: {e}")
+                    self._retry_now.wait(backoff * random.uniform(0.5, 1.0))
+                    self._retry_now.clear()
+                    backoff = min(backoff * 2, self.max_backoff)
+                    break
+                self.journal.ack(seq)
+                self.breaker.record_success()
+                metrics.increment('journal_replayed_total', op=op)
+                backoff = self.min_backoff
@@ -0,0 +1,107 @@
+import os
+import time
+import uuid
+import socket
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from utils.metrics import get_metrics
+
+logger = logging.getLogger('discord')
+
+"""
+Lease-based leader election so only one instance owns the gateway and singleton jobs
+"""
+def instance_id() -> str:
+    """A holder id unique to this process"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+class LocalLeaseStore:
+    """
+    In-process stand-in for the Firestore lease (single instance, local development and tests).
+
+    Same interface as FirebaseTicketDatabase.acquire_lease / release_lease.
+    """
+
+    def __init__(self):
+        self._leases: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        with self._lock:
+            now = time.time()
+            current = self._leases.get(name)
+            if current and current[0] != holder and current[1] > now:
+                return False
+            self._leases[name] = (holder, now + ttl)
+            return True
+
+    def release_lease(self, name: str, holder: str):
+        with self._lock:
+            if self._leases.get(name, (None,))[0] == holder:
+                del self._leases[name]
+
+class LeaderElector:
+    """
+    Holds a lease that is renewed every `renew_interval` seconds and lapses after `ttl`.
+
+    Followers retry at the same interval, so one takes over within roughly
+    ttl + renew_interval of the leader dying (at once if it released the lease).
+    A leader that can't renew before its own lease would have run out sets `lost`
+    and stops; it must give up the gateway, since another instance may already
+    have been elected.
+    """
+
+    def __init__(self, store, name: str = 'leader', holder: str = None, ttl: float = 15.0, renew_interval: float = 5.0):
+        self.store = store
+        self.name = name
+        self.holder = holder or instance_id()
+        self.ttl = ttl
+        self.renew_interval = renew_interval
+        self.is_leader = False
+        self.elected = asyncio.Event()
+        self.lost = asyncio.Event()
+        # monotonic time our lease is known to last until (measured from before the renewal call)
+        self._held_until = 0.0
+
+    async def _try_acquire(self) -> Optional[bool]:
+        """True if we hold the lease, False if someone else does, None if the store couldn't say"""
+        try:
+            return bool(await asyncio.to_thread(self.store.acquire_lease, self.name, self.holder, self.ttl))
+        except Exception as e:
+            logger.warning(f"Lease {self.name} request failed: {e}")
+            return None
+
+    async def run(self):
+        """Campaign until elected, then keep renewing until the lease is lost or the task is cancelled"""
+        metrics = get_metrics()
+        while True:
+            started = time.monotonic()
+            acquired = await self._try_acquire()
+            if acquired:
+                self._held_until = started + self.ttl
+                if not self.is_leader:
+                    self.is_leader = True
+                    self.elected.set()
+                    metrics.increment('leader_transitions_total', state='leader')
+                    logger.info(f"Elected leader as {self.holder}")
+            elif self.is_leader and (acquired is False or time.monotonic() >= self._held_until - self.renew_interval):
+                # taken over, or the next renewal could land after the lease ran out: stop acting as leader now
+                self.is_leader = False
+                self.lost.set()
+                metrics.increment('leader_transitions_total', state='lost')
+                logger.error(f"Lost leader lease {self.name}")
+                return
+            await asyncio.sleep(self.renew_interval)
+
+    async def release(self):
+        """Hand the lease back on shutdown so a follower takes over without waiting for the TTL"""
+        if not self.is_leader:
+            return
+        self.is_leader = False
+        try:
+            await asyncio.to_thread(self.store.release_lease, self.name, self.holder)
+            logger.info(f"Released leader lease {self.name}")
+        except Exception as e:
+            logger.warning(f"Failed to release lease {self.name}: {e}")
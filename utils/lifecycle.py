@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Set
+
+logger = logging.getLogger('discord')
+
+"""
+Tracks in-flight work so the bot can drain cleanly on SIGTERM
+"""
+class Lifecycle:
+    """Gate for new interactions plus a registry of work that must finish before shutdown"""
+
+    def __init__(self):
+        self.accepting = True
+        self._inflight = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def pending(self) -> int:
+        """Number of handlers and background tasks still running"""
+        return self._inflight + len(self._tasks)
+
+    def _update_idle(self):
+        if self.pending == 0:
+            self._idle.set()
+        else:
+            self._idle.clear()
+
+    def acquire(self):
+        """Mark one handler as running"""
+        self._inflight += 1
+        self._update_idle()
+
+    def release(self):
+        """Mark one handler as finished"""
+        self._inflight = max(0, self._inflight - 1)
+        self._update_idle()
+
+    @asynccontextmanager
+    async def inflight(self):
+        """Mark a handler as running until the block exits"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def spawn(self, coro) -> asyncio.Task:
+        """Run a background coroutine that shutdown should wait for"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        self._update_idle()
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        self._update_idle()
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background task failed: {task.exception()}")
+
+    def begin_drain(self):
+        """Stop accepting new interactions"""
+        self.accepting = False
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait for pending work to finish; returns False if the deadline passed first"""
+        self.begin_drain()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Shutdown deadline reached with {self.pending} pending task(s)")
+            for task in list(self._tasks):
+                task.cancel()
+            return False
+
+# Global lifecycle instance
+lifecycle = None
+
+def get_lifecycle() -> Lifecycle:
+    """Get the global lifecycle instance, creating it on first use"""
+    global lifecycle
+    if lifecycle is None:
+        lifecycle = Lifecycle()
+    return lifecycle
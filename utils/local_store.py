@@ -0,0 +1,205 @@
+import copy
+import time
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from google.api_core import exceptions as api_exceptions
+
+"""
+In-memory stand-in for the part of the Firestore client FirebaseTicketDatabase uses (benchmarks and local runs)
+"""
+DESCENDING = "DESCENDING"
+# FieldPath.document_id()
+DOCUMENT_ID = "__name__"
+
+def _rank(value: Any) -> Tuple[int, Any]:
+    """Firestore's cross-type ordering: null < booleans < numbers < timestamps < strings"""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (3, value.timestamp())
+    if isinstance(value, str):
+        return (4, value)
+    return (5, str(value))
+
+def _matches(data: Dict[str, Any], field: str, op: str, value: Any) -> bool:
+    if field not in data:
+        return False
+    actual = data[field]
+    if op == '==':
+        return actual == value
+    if op == 'array_contains':
+        return isinstance(actual, list) and value in actual
+    if op == 'in':
+        return actual in value
+    # range filters only match values of the same type, as in Firestore
+    if _rank(actual)[0] != _rank(value)[0]:
+        return False
+    left, right = _rank(actual)[1], _rank(value)[1]
+    return {'<': left < right, '<=': left <= right, '>': left > right, '>=': left >= right}[op]
+
+class LocalSnapshot:
+    def __init__(self, doc_id: str, data: Optional[Dict[str, Any]]):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data)
+
+    def get(self, field: str) -> Any:
+        return (self._data or {}).get(field)
+
+class LocalFirestore:
+    """
+    Collections of documents held in memory.
+
+    `latency` seconds are slept on every read and commit (in the calling worker
+    thread, like a real round trip) so benchmarks see realistic storage cost.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.reads = 0
+        self.writes = 0
+        self._collections: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def collection(self, name: str) -> "LocalCollection":
+        return LocalCollection(self, name)
+
+    def batch(self) -> "LocalBatch":
+        return LocalBatch(self)
+
+    def _round_trip(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _read(self, collection: str, doc_id: str) -> LocalSnapshot:
+        self._round_trip()
+        with self._lock:
+            self.reads += 1
+            data = self._collections[collection].get(doc_id)
+            return LocalSnapshot(doc_id, copy.deepcopy(data) if data is not None else None)
+
+    def _apply(self, writes: List[Tuple[str, str, str, Optional[Dict[str, Any]], bool]]):
+        """Apply (op, collection, doc_id, data, merge) writes atomically"""
+        self._round_trip()
+        with self._lock:
+            for op, collection, doc_id, _, _ in writes:
+                if op == 'update' and doc_id not in self._collections[collection]:
+                    raise api_exceptions.NotFound(f"No document to update: {collection}/{doc_id}")
+            for op, collection, doc_id, data, merge in writes:
+                self.writes += 1
+                documents = self._collections[collection]
+                if op == 'delete':
+                    documents.pop(doc_id, None)
+                elif (merge or op == 'update') and doc_id in documents:
+                    documents[doc_id].update(copy.deepcopy(data))
+                else:
+                    documents[doc_id] = copy.deepcopy(data)
+
+class LocalDocument:
+    def __init__(self, store: LocalFirestore, collection: str, doc_id: str):
+        self._store = store
+        self._collection = collection
+        self.id = doc_id
+
+    def get(self, field_paths=None, transaction=None, retry=None, timeout=None) -> LocalSnapshot:
+        return self._store._read(self._collection, self.id)
+
+    def set(self, data: Dict[str, Any], merge: bool = False, retry=None, timeout=None):
+        self._store._apply([('set', self._collection, self.id, data, merge)])
+
+    def update(self, data: Dict[str, Any], retry=None, timeout=None):
+        self._store._apply([('update', self._collection, self.id, data, False)])
+
+    def delete(self, retry=None, timeout=None):
+        self._store._apply([('delete', self._collection, self.id, None, False)])
+
+class LocalQuery:
+    def __init__(self, store: LocalFirestore, collection: str, filters=(), order=None, limit=None, cursor=None):
+        self._store = store
+        self._collection = collection
+        self._filters: Tuple[Tuple[str, str, Any], ...] = tuple(filters)
+        self._order: Optional[Tuple[str, bool]] = order
+        self._limit: Optional[int] = limit
+        self._cursor: Optional[LocalSnapshot] = cursor
+
+    def _copy(self, **changes) -> "LocalQuery":
+        state = {'filters': self._filters, 'order': self._order, 'limit': self._limit, 'cursor': self._cursor, **changes}
+        return LocalQuery(self._store, self._collection, **state)
+
+    def where(self, field_path: str = None, op_string: str = None, value: Any = None, *, filter=None) -> "LocalQuery":
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path: str, direction: str = "ASCENDING") -> "LocalQuery":
+        return self._copy(order=(field_path, direction == DESCENDING))
+
+    def limit(self, count: int) -> "LocalQuery":
+        return self._copy(limit=count)
+
+    def start_after(self, snapshot) -> "LocalQuery":
+        """After a snapshot, or after field values given as a dict (e.g. {'__name__': doc_id})"""
+        if isinstance(snapshot, dict):
+            snapshot = LocalSnapshot(snapshot.get(DOCUMENT_ID, ''), snapshot)
+        return self._copy(cursor=snapshot)
+
+    def stream(self, retry=None, timeout=None) -> Iterator[LocalSnapshot]:
+        store = self._store
+        store._round_trip()
+        with store._lock:
+            items = [
+                (doc_id, copy.deepcopy(data)) for doc_id, data in store._collections[self._collection].items()
+                if all(_matches(data, *condition) for condition in self._filters)
+            ]
+            store.reads += max(1, len(items))
+        if self._order and self._order[0] != DOCUMENT_ID:
+            field, descending = self._order
+            # like Firestore, ordering on a field drops documents that don't have it
+            items = [(doc_id, data) for doc_id, data in items if field in data]
+            items.sort(key=lambda item: (_rank(item[1][field]), item[0]), reverse=descending)
+            if self._cursor is not None:
+                after = (_rank(self._cursor.get(field)), self._cursor.id)
+                items = [item for item in items if ((_rank(item[1][field]), item[0]) < after if descending else (_rank(item[1][field]), item[0]) > after)]
+        else:
+            descending = bool(self._order and self._order[1])
+            items.sort(key=lambda item: item[0], reverse=descending)
+            if self._cursor is not None:
+                items = [item for item in items if (item[0] < self._cursor.id if descending else item[0] > self._cursor.id)]
+        if self._limit:
+            items = items[:self._limit]
+        return iter([LocalSnapshot(doc_id, data) for doc_id, data in items])
+
+class LocalCollection(LocalQuery):
+    def __init__(self, store: LocalFirestore, name: str):
+        super().__init__(store, name)
+
+    def document(self, doc_id: str) -> LocalDocument:
+        return LocalDocument(self._store, self._collection, str(doc_id))
+
+class LocalBatch:
+    def __init__(self, store: LocalFirestore):
+        self._store = store
+        self._writes: List[Tuple[str, str, str, Optional[Dict[str, Any]], bool]] = []
+
+    def set(self, reference: LocalDocument, data: Dict[str, Any], merge: bool = False):
+        self._writes.append(('set', reference._collection, reference.id, data, merge))
+
+    def update(self, reference: LocalDocument, data: Dict[str, Any]):
+        self._writes.append(('update', reference._collection, reference.id, data, False))
+
+    def delete(self, reference: LocalDocument):
+        self._writes.append(('delete', reference._collection, reference.id, None, False))
+
+    def commit(self, retry=None, timeout=None):
+        if len(self._writes) > 500:
+            raise ValueError("A batch can contain at most 500 writes")
+        self._store._apply(self._writes)
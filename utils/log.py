@@ -0,0 +1,86 @@
+import sys
+import json
+import queue
+import atexit
+import logging
+import contextvars
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict
+
+"""
+Non-blocking JSON logging with per-interaction context (ticket, guild, user, command)
+"""
+# fields carried on every record logged while they are bound
+CONTEXT_FIELDS = ('ticket_id', 'guild_id', 'user_id', 'command', 'interaction_id')
+# extra= fields copied into the JSON payload when present
+EXTRA_FIELDS = CONTEXT_FIELDS + ('latency_ms', 'event', 'outcome')
+
+log_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar('log_context', default={})
+
+def bind(**fields):
+    """Attach fields to every log record from the current task (and threads it starts with to_thread)"""
+    log_context.set({**log_context.get(), **{key: value for key, value in fields.items() if value is not None}})
+
+class ContextFilter(logging.Filter):
+    """Copies the bound context onto the record in the calling thread, before it is queued"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+class ContextQueueHandler(QueueHandler):
+    """Queue handler that keeps the exception apart from the message so it lands in its own field"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, using the field names Cloud Logging understands"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'severity': record.levelname,
+            'message': record.getMessage(),
+            'logger': record.name
+        }
+        for key in EXTRA_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                payload[key] = str(value) if key.endswith('_id') else value
+        if record.exc_text:
+            payload['stack_trace'] = record.exc_text
+        return json.dumps(payload, default=str)
+
+def setup_logging(level: str = "INFO", fmt: str = "json") -> QueueListener:
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Handlers only enqueue the record, so a slow stdout never blocks the event loop.
+    """
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s: %(message)s"
+    ))
+
+    handler = ContextQueueHandler(records)
+    handler.addFilter(ContextFilter())
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+
+    listener = QueueListener(records, stream, respect_handler_level=True)
+    listener.start()
+    # flush whatever is still queued on exit
+    atexit.register(listener.stop)
+    return listener
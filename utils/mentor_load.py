@@ -0,0 +1,144 @@
+import heapq
+import itertools
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+"""
+Active ticket counts per mentor, used to spread tickets across the mentor roster
+"""
+class MentorLoadTracker:
+    """
+    Min-heap of (active tickets, mentor) kept current from ticket state changes.
+
+    Updates push a fresh heap entry and leave the old one behind; an entry is
+    current only if it carries its mentor's latest sequence number (a load that goes
+    1 -> 2 -> 1 leaves two entries with the same load), and stale ones are skipped
+    when they surface, so every update is O(log n) and finding the
+    least-loaded eligible mentor only pops the mentors it has to look at.
+    """
+
+    def __init__(self):
+        self._load: Dict[int, int] = {}
+        self._names: Dict[int, str] = {}
+        self._heap: List[Tuple[int, int, int]] = []
+        # sequence number of each mentor's current heap entry
+        self._entries: Dict[int, int] = {}
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+
+    def _push(self, mentor_id: int):
+        seq = next(self._seq)
+        self._entries[mentor_id] = seq
+        heapq.heappush(self._heap, (self._load[mentor_id], seq, mentor_id))
+        # rebuild once stale entries dominate so the heap stays proportional to the roster
+        if len(self._heap) > 4 * len(self._load) + 64:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._entries = {mentor_id: next(self._seq) for mentor_id in self._load}
+        self._heap = [(load, self._entries[mentor_id], mentor_id) for mentor_id, load in self._load.items()]
+        heapq.heapify(self._heap)
+
+    def register(self, mentor_id: int, name: str = None):
+        """Add a mentor to the roster with no tickets (no-op if already known)"""
+        with self._lock:
+            if name:
+                self._names[mentor_id] = name
+            if mentor_id not in self._load:
+                self._load[mentor_id] = 0
+                self._push(mentor_id)
+
+    def unregister(self, mentor_id: int):
+        """Remove a mentor from the roster (e.g. the Mentor role was taken away)"""
+        with self._lock:
+            self._load.pop(mentor_id, None)
+            self._names.pop(mentor_id, None)
+            self._entries.pop(mentor_id, None)
+
+    def _adjust(self, mentor_id: Optional[int], delta: int, name: str = None):
+        if not mentor_id:
+            return
+        with self._lock:
+            if name:
+                self._names[mentor_id] = name
+            self._load[mentor_id] = max(0, self._load.get(mentor_id, 0) + delta)
+            self._push(mentor_id)
+
+    def load(self, open_tickets: Iterable[Dict[str, Any]]):
+        """Rebuild counts from a snapshot of open tickets, keeping registered mentors at zero"""
+        with self._lock:
+            counts = {mentor_id: 0 for mentor_id in self._load}
+            for ticket in open_tickets:
+                mentor_id = ticket.get('mentor_id')
+                if mentor_id:
+                    counts[mentor_id] = counts.get(mentor_id, 0) + 1
+                    if ticket.get('mentor_name'):
+                        self._names[mentor_id] = ticket['mentor_name']
+            self._load = counts
+            self._rebuild()
+
+    def apply(self, event: str, ticket: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+        """Database listener: move ticket counts between mentors"""
+        previous_mentor = previous.get('mentor_id') if previous else None
+        if event == 'assigned':
+            self._adjust(ticket.get('mentor_id'), 1, ticket.get('mentor_name'))
+        elif event == 'reassigned':
+            self._adjust(previous_mentor, -1)
+            self._adjust(ticket.get('mentor_id'), 1, ticket.get('mentor_name'))
+        elif event in ('released', 'closed'):
+            self._adjust(previous_mentor, -1)
+
+    def get_load(self, mentor_id: int) -> int:
+        with self._lock:
+            return self._load.get(mentor_id, 0)
+
+    def name(self, mentor_id: int) -> Optional[str]:
+        return self._names.get(mentor_id)
+
+    def least_loaded(self, eligible: Callable[[int], bool] = None, count: int = 1) -> List[Tuple[int, int]]:
+        """Up to `count` (mentor_id, active tickets) pairs, least loaded first, among mentors passing `eligible`"""
+        found = []
+        popped = []
+        with self._lock:
+            while self._heap and len(found) < count:
+                entry = heapq.heappop(self._heap)
+                load, seq, mentor_id = entry
+                if self._entries.get(mentor_id) != seq:
+                    continue  # stale entry
+                popped.append(entry)
+                if eligible is None or eligible(mentor_id):
+                    found.append((mentor_id, load))
+            for entry in popped:
+                heapq.heappush(self._heap, entry)
+        return found
+
+    def snapshot(self) -> Dict[int, int]:
+        with self._lock:
+            return dict(self._load)
+
+# Global mentor load tracker
+mentor_load = None
+
+def get_mentor_load() -> MentorLoadTracker:
+    """Get the global mentor load tracker, creating it on first use"""
+    global mentor_load
+    if mentor_load is None:
+        mentor_load = MentorLoadTracker()
+    return mentor_load
+
+def suggest_mentors(guild, ticket: Dict[str, Any], count: int = 1) -> List[Tuple[int, int]]:
+    """
+    Least-loaded mentors for a ticket as (mentor_id, active tickets).
+
+    Mentors holding a guild role named after one of the ticket's categories are
+    preferred; if none of them is known, any mentor on the roster is suggested.
+    """
+    tracker = get_mentor_load()
+    wanted = {category.lower() for category in ticket.get('categories') or []}
+
+    def has_skill(mentor_id: int) -> bool:
+        member = guild.get_member(mentor_id) if guild else None
+        return member is not None and any(role.name.lower() in wanted for role in member.roles)
+
+    matches = tracker.least_loaded(has_skill, count) if wanted else []
+    return matches or tracker.least_loaded(count=count)
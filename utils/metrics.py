@@ -0,0 +1,52 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+"""
+In-process counters exposed on the health server's /metrics endpoint
+"""
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class Metrics:
+    """Thread-safe counters keyed by name and labels"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = defaultdict(lambda: defaultdict(float))
+
+    @staticmethod
+    def _key(labels: Dict[str, object]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def increment(self, name: str, amount: float = 1, **labels):
+        """Add `amount` to the counter `name` with the given labels"""
+        with self._lock:
+            self._counters[name][self._key(labels)] += amount
+
+    def get(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(self._key(labels), 0)
+
+    def snapshot(self) -> Dict[str, Dict[LabelKey, float]]:
+        with self._lock:
+            return {name: dict(series) for name, series in self._counters.items()}
+
+    def render(self) -> str:
+        """Render all counters in the Prometheus text format"""
+        lines = []
+        for name, series in sorted(self.snapshot().items()):
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels)
+                lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+# Global metrics instance
+metrics = None
+
+def get_metrics() -> Metrics:
+    """Get the global metrics registry, creating it on first use"""
+    global metrics
+    if metrics is None:
+        metrics = Metrics()
+    return metrics
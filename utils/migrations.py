@@ -0,0 +1,207 @@
+import time
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from google.api_core import exceptions as api_exceptions
+from google.cloud.firestore_v1.field_path import FieldPath
+from utils.rate_limit import TokenBucket
+from utils.retry import RetryPolicy, StorageError, get_background_policy
+from utils.metrics import get_metrics
+from utils.timestamps import TIMESTAMP_FIELDS, to_datetime, utcnow
+
+logger = logging.getLogger('discord')
+
+"""
+Versioned rewrites of every ticket document, paged, throttled and resumable so they can run during an event
+"""
+# Firestore allows 500 writes per batch
+MAX_BATCH_SIZE = 500
+
+class MigrationError(Exception):
+    """A migration's transform failed on a document; nothing after the last checkpoint was written"""
+
+class Migration:
+    """
+    A numbered transform over ticket documents.
+
+    `transform(ticket)` returns the fields to change, or None to leave the ticket
+    alone. It must return None for a ticket it has already migrated: after an
+    interruption the last page is read again.
+    """
+
+    __slots__ = ('version', 'name', 'transform')
+
+    def __init__(self, version: int, name: str, transform: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]):
+        self.version = version
+        self.name = name
+        self.transform = transform
+
+    @property
+    def description(self) -> str:
+        return (self.transform.__doc__ or '').strip()
+
+# Registered migrations by version
+MIGRATIONS: Dict[int, Migration] = {}
+
+def migration(version: int, name: str):
+    """Register a transform as migration `version`"""
+    def register(transform):
+        if version in MIGRATIONS:
+            raise ValueError(f"Migration {version} is already registered as {MIGRATIONS[version].name}")
+        MIGRATIONS[version] = Migration(version, name, transform)
+        return transform
+    return register
+
+@migration(1, 'native_timestamps')
+def native_timestamps(ticket: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Rewrite timestamps stored as isoformat strings or epoch seconds as native UTC timestamps"""
+    changes = {}
+    for field in TIMESTAMP_FIELDS:
+        value = ticket.get(field)
+        if value is not None and not isinstance(value, datetime):
+            changes[field] = to_datetime(value)
+    return changes or None
+
+class Throttle:
+    """Blocks the caller so operations average at most `rate` per second (0 disables it)"""
+
+    def __init__(self, rate: float):
+        self.bucket = TokenBucket(rate, rate, time.monotonic()) if rate > 0 else None
+
+    def take(self, count: int):
+        if self.bucket is None or count <= 0:
+            return
+        self.bucket.refill(time.monotonic())
+        # let the bucket go into debt so pages larger than one second's budget still get through
+        self.bucket.tokens -= count
+        if self.bucket.tokens < 0:
+            time.sleep(-self.bucket.tokens / self.bucket.rate)
+
+class MigrationRunner:
+    """
+    Applies one migration to a collection, a page of documents at a time.
+
+    Pages are read in document id order with a cursor, and each page's changes are
+    written as a single batch of updates, so tickets deleted or archived meanwhile
+    aren't recreated. Reads and writes both count against `ops_per_second`. After
+    every page the cursor and counters are saved to migrations/<version>_<collection>,
+    which is where a later run resumes. A dry run reads and transforms but writes
+    nothing, not even the checkpoint.
+    """
+
+    def __init__(self, db, migration: Migration, collection: str = "tickets", ops_per_second: float = 100,
+                 batch_size: int = MAX_BATCH_SIZE, dry_run: bool = False, policy: RetryPolicy = None):
+        self.db = db
+        self.migration = migration
+        self.collection = collection
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.dry_run = dry_run
+        self.throttle = Throttle(ops_per_second)
+        self.policy = policy or get_background_policy()
+        self.checkpoints_collection = "migrations"
+
+    @property
+    def checkpoint_id(self) -> str:
+        return f"{self.migration.version:03d}_{self.collection}"
+
+    def load_checkpoint(self) -> Dict[str, Any]:
+        """The saved progress of this migration on this collection ({} if it never ran)"""
+        checkpoint_ref = self.db.collection(self.checkpoints_collection).document(self.checkpoint_id)
+        doc = self.policy.call('migration_checkpoint', lambda timeout: checkpoint_ref.get(retry=None, timeout=timeout))
+        return doc.to_dict() if doc.exists else {}
+
+    def _save_checkpoint(self, state: Dict[str, Any]):
+        if self.dry_run:
+            return
+        checkpoint_ref = self.db.collection(self.checkpoints_collection).document(self.checkpoint_id)
+        state['updated_at'] = utcnow()
+        self.policy.call('migration_checkpoint', lambda timeout: checkpoint_ref.set(state, retry=None, timeout=timeout))
+
+    def _update(self, changes: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Write one page's changes; returns how many documents were updated"""
+        documents = self.db.collection(self.collection)
+
+        def commit(timeout: float):
+            batch = self.db.batch()
+            for doc_id, fields in changes:
+                batch.update(documents.document(doc_id), fields)
+            batch.commit(retry=None, timeout=timeout)
+
+        try:
+            self.policy.call('migration_batch', commit)
+            return len(changes)
+        except StorageError as e:
+            if not isinstance(e.__cause__, api_exceptions.NotFound):
+                raise
+        # a ticket on this page was archived or deleted since it was read, so the batch was refused
+        updated = 0
+        for doc_id, fields in changes:
+            document = documents.document(doc_id)
+            try:
+                self.policy.call('migration_update', lambda timeout: document.update(fields, retry=None, timeout=timeout))
+            except StorageError as e:
+                if not isinstance(e.__cause__, api_exceptions.NotFound):
+                    raise
+            else:
+                updated += 1
+        return updated
+
+    def run(self, restart: bool = False) -> Dict[str, Any]:
+        """
+        Run the migration to the end of the collection, resuming from the checkpoint unless `restart`.
+
+        Returns the progress: documents scanned, changed by the transform and updated
+        (changed minus those gone before the write, 0 in a dry run).
+        """
+        state = {} if restart else self.load_checkpoint()
+        if state.get('done'):
+            logger.info(f"Migration {self.migration.version} ({self.migration.name}) already applied to {self.collection}")
+            return state
+        if not state:
+            state = {'version': self.migration.version, 'name': self.migration.name, 'collection': self.collection,
+                     'cursor': None, 'scanned': 0, 'changed': 0, 'updated': 0, 'done': False, 'started_at': utcnow()}
+        elif state.get('cursor'):
+            logger.info(f"Resuming migration {self.migration.version} on {self.collection} after document {state['cursor']}")
+
+        mode = " (dry run)" if self.dry_run else ""
+        metrics = get_metrics()
+        query = self.db.collection(self.collection).order_by(FieldPath.document_id()).limit(self.batch_size)
+        while True:
+            cursor = state['cursor']
+            page_query = query.start_after({FieldPath.document_id(): cursor}) if cursor else query
+            page = self.policy.call('migration_page', lambda timeout: list(page_query.stream(retry=None, timeout=timeout)))
+            self.throttle.take(len(page))
+            if not page:
+                break
+
+            changes = []
+            for doc in page:
+                try:
+                    fields = self.migration.transform(doc.to_dict() or {})
+                except Exception as e:
+                    raise MigrationError(f"Migration {self.migration.version} failed on {self.collection}/{doc.id}: {e}") from e
+                if fields:
+                    changes.append((doc.id, fields))
+
+            if changes and self.dry_run:
+                doc_id, fields = changes[0]
+                logger.info(f"Migration {self.migration.version} would change {len(changes)} document(s), e.g. {doc_id}: {fields}")
+            elif changes:
+                self.throttle.take(len(changes))
+                state['updated'] += self._update(changes)
+                metrics.increment('migration_writes_total', amount=len(changes), migration=self.migration.name)
+            state['cursor'] = page[-1].id
+            state['scanned'] += len(page)
+            state['changed'] += len(changes)
+            self._save_checkpoint(state)
+            logger.info(f"Migration {self.migration.version}{mode}: {state['scanned']} scanned, "
+                        f"{state['changed']} changed, through {self.collection}/{state['cursor']}")
+            if len(page) < self.batch_size:
+                break
+
+        state['done'] = True
+        state['finished_at'] = utcnow()
+        self._save_checkpoint(state)
+        logger.info(f"Migration {self.migration.version} ({self.migration.name}){mode} finished on {self.collection}: "
+                    f"{state['scanned']} scanned, {state['changed']} changed, {state['updated']} updated")
+        return state
@@ -0,0 +1,129 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional
+from config import Config
+from utils.metrics import get_metrics
+
+"""
+In-memory token-bucket rate limiting keyed by user and guild
+"""
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`"""
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def retry_after(self, cost: float = 1) -> float:
+        """Seconds until `cost` tokens are available (0 if they are available now)"""
+        if self.tokens >= cost:
+            return 0.0
+        if self.rate <= 0:
+            return float('inf')
+        return (cost - self.tokens) / self.rate
+
+class RateLimiter:
+    """Per-user and per-guild token buckets; a request must fit in both to be allowed"""
+
+    def __init__(self, name: str, user_rate: float, user_burst: float, guild_rate: float, guild_burst: float, max_keys: int = 10000):
+        self.name = name
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.guild_rate = guild_rate
+        self.guild_burst = guild_burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[tuple, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: tuple, rate: float, capacity: float, now: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate, capacity, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.refill(now)
+        return bucket
+
+    def check(self, user_id: int, guild_id: Optional[int] = None, cost: float = 1, consume: bool = True) -> float:
+        """
+        Consume a token for this user/guild; returns 0 if allowed, otherwise seconds to wait.
+
+        With consume=False only looks, for steps that lead up to the charged action.
+        """
+        now = time.monotonic()
+        with self._lock:
+            user_bucket = self._bucket(('user', user_id), self.user_rate, self.user_burst, now)
+            wait = user_bucket.retry_after(cost)
+            if wait:
+                get_metrics().increment('ratelimit_rejected_total', limiter=self.name, scope='user')
+                return wait
+
+            guild_bucket = None
+            if guild_id is not None:
+                guild_bucket = self._bucket(('guild', guild_id), self.guild_rate, self.guild_burst, now)
+                wait = guild_bucket.retry_after(cost)
+                if wait:
+                    get_metrics().increment('ratelimit_rejected_total', limiter=self.name, scope='guild')
+                    return wait
+
+            if consume:
+                user_bucket.tokens -= cost
+                if guild_bucket:
+                    guild_bucket.tokens -= cost
+                get_metrics().increment('ratelimit_allowed_total', limiter=self.name)
+            return 0.0
+
+    def charge(self, user_id: int, guild_id: Optional[int] = None, cost: float = 1):
+        """
+        Consume tokens for an action already allowed by check(consume=False) and carried out.
+
+        Concurrent actions that all passed the check can take a bucket below zero;
+        the debt delays the next allowance instead of being forgiven.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._bucket(('user', user_id), self.user_rate, self.user_burst, now).tokens -= cost
+            if guild_id is not None:
+                self._bucket(('guild', guild_id), self.guild_rate, self.guild_burst, now).tokens -= cost
+        get_metrics().increment('ratelimit_allowed_total', limiter=self.name)
+
+# Global limiters for the ticket creation flow: tickets created, and times the picker is opened
+ticket_rate_limiter = None
+picker_rate_limiter = None
+
+def get_ticket_rate_limiter() -> RateLimiter:
+    """Get the limiter shared by every ticket creation entry point"""
+    global ticket_rate_limiter
+    if ticket_rate_limiter is None:
+        ticket_rate_limiter = RateLimiter(
+            'ticket_create',
+            user_rate=Config.TICKET_RATE_USER_PER_MINUTE / 60,
+            user_burst=Config.TICKET_RATE_USER_BURST,
+            guild_rate=Config.TICKET_RATE_GUILD_PER_MINUTE / 60,
+            guild_burst=Config.TICKET_RATE_GUILD_BURST
+        )
+    return ticket_rate_limiter
+
+def get_picker_rate_limiter() -> RateLimiter:
+    """Get the limiter charged each time the ticket flow is opened (public dropdown, /create)"""
+    global picker_rate_limiter
+    if picker_rate_limiter is None:
+        picker_rate_limiter = RateLimiter(
+            'ticket_picker',
+            user_rate=Config.TICKET_PICKER_RATE_USER_PER_MINUTE / 60,
+            user_burst=Config.TICKET_PICKER_RATE_USER_BURST,
+            guild_rate=Config.TICKET_PICKER_RATE_GUILD_PER_MINUTE / 60,
+            guild_burst=Config.TICKET_PICKER_RATE_GUILD_BURST
+        )
+    return picker_rate_limiter
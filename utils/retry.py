@@ -0,0 +1,109 @@
+import time
+import random
+import logging
+from typing import Callable, TypeVar
+from google.api_core import exceptions as api_exceptions
+from utils.metrics import get_metrics
+from utils.tracing import span
+
+logger = logging.getLogger('discord')
+
+"""
+Retry and deadline policy for Firestore calls, with typed storage errors
+"""
+T = TypeVar('T')
+
+class StorageError(Exception):
+    """A storage call failed and no usable fallback was available"""
+
+class StorageTimeout(StorageError):
+    """A storage call did not finish within its deadline"""
+
+class StorageUnavailable(StorageError):
+    """Firestore is unreachable or kept failing after retries"""
+
+# transient failures worth another attempt; anything else (bad request, permission) fails fast
+RETRYABLE = (
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.DeadlineExceeded,
+    api_exceptions.InternalServerError,
+    api_exceptions.TooManyRequests,
+    api_exceptions.Aborted,
+    api_exceptions.RetryError,
+    ConnectionError,
+    TimeoutError
+)
+TIMEOUTS = (api_exceptions.DeadlineExceeded, TimeoutError)
+
+class RetryPolicy:
+    """
+    Retries transient failures with jittered exponential backoff inside an overall deadline.
+
+    The wrapped call receives the time left as its per-attempt timeout, so no single
+    attempt can run past the deadline.
+    """
+
+    def __init__(self, attempts: int = 3, deadline: float = 2.0, base_delay: float = 0.1, max_delay: float = 1.0):
+        self.attempts = attempts
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def call(self, operation: str, fn: Callable[[float], T]) -> T:
+        """
+        Run fn(timeout) under this policy; raises StorageTimeout, StorageUnavailable or StorageError.
+
+        Blocks for the whole deadline, backoff included, so callers on the event loop go through asyncio.to_thread.
+        """
+        with span(f"firestore.{operation}", deadline_s=self.deadline) as current:
+            return self._call(operation, fn, current)
+
+    def _call(self, operation: str, fn: Callable[[float], T], current) -> T:
+        metrics = get_metrics()
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            attempt += 1
+            if current:
+                current.set(attempts=attempt)
+            remaining = deadline - time.monotonic()
+            try:
+                return fn(remaining)
+            except RETRYABLE as e:
+                error = e
+            except Exception as e:
+                metrics.increment('storage_errors_total', operation=operation)
+                raise StorageError(f"{operation} failed: {e}") from e
+
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            if attempt >= self.attempts or time.monotonic() + delay >= deadline:
+                break
+            metrics.increment('storage_retries_total', operation=operation)
+            logger.debug(f"Retrying {operation} (attempt {attempt + 1}) after {error}")
+            time.sleep(delay)
+
+        if isinstance(error, TIMEOUTS) or time.monotonic() >= deadline:
+            metrics.increment('storage_timeouts_total', operation=operation)
+            raise StorageTimeout(f"{operation} timed out after {self.deadline:g}s") from error
+        metrics.increment('storage_errors_total', operation=operation)
+        raise StorageUnavailable(f"{operation} failed after {attempt} attempt(s): {error}") from error
+
+# Global retry policies
+interactive_policy = None
+background_policy = None
+
+def get_interactive_policy() -> RetryPolicy:
+    """Policy for calls made while a user waits; the deadline leaves room inside Discord's 3s window"""
+    global interactive_policy
+    if interactive_policy is None:
+        from config import Config
+        interactive_policy = RetryPolicy(Config.STORAGE_ATTEMPTS, Config.STORAGE_DEADLINE_SECONDS)
+    return interactive_policy
+
+def get_background_policy() -> RetryPolicy:
+    """Policy for work nobody is waiting on (journal replay, index loads)"""
+    global background_policy
+    if background_policy is None:
+        from config import Config
+        background_policy = RetryPolicy(Config.STORAGE_ATTEMPTS + 2, Config.STORAGE_BACKGROUND_DEADLINE_SECONDS, max_delay=4.0)
+    return background_policy
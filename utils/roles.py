@@ -0,0 +1,147 @@
+import time
+import threading
+from typing import Dict, Iterable, Optional
+from discord import app_commands
+
+"""
+Per-guild cache of the mentor and admin role ids
+"""
+# dev_configs keys and defaults for the configurable role names; a guild's own
+# names are stored under "<key>:<guild id>" and fall back to the bot-wide key
+ROLE_CONFIGS = {
+    'mentor': ('mentor_role_name', "Mentor"),
+    'admin': ('admin_role_name', "Admin")
+}
+# how long the default names stand in when dev_configs can't be read
+FALLBACK_TTL_SECONDS = 30
+
+class RoleRegistry:
+    """
+    Resolves the configured role names to ids once per guild and checks membership by id.
+
+    Entries are dropped by the role update/delete listeners, so a renamed role keeps
+    working (its id is unchanged) and a deleted or newly created one is picked up.
+    """
+
+    def __init__(self):
+        self._names: Dict[Optional[int], Dict[str, str]] = {}
+        # monotonic expiry of names that are only the defaults standing in for a failed read
+        self._fallback_until: Dict[Optional[int], float] = {}
+        self._ids: Dict[int, Dict[str, Optional[int]]] = {}
+        self._lock = threading.Lock()
+
+    def names(self, guild_id: int = None) -> Dict[str, str]:
+        """
+        Role names configured for a guild (or bot-wide), read from dev_configs on first use.
+
+        The read blocks, so warm() does it off the event loop; it happens outside the
+        lock so a slow Firestore doesn't hold up lookups for guilds already cached.
+        """
+        names = self._names.get(guild_id)
+        if names is not None and self._fallback_until.get(guild_id, float('inf')) > time.monotonic():
+            return names
+        from utils.db import get_firebase_db, StorageError
+        db = get_firebase_db()
+        try:
+            fresh = {
+                kind: (guild_id and db.get_dev_config(f"{config_key}:{guild_id}")) or db.get_dev_config(config_key) or default
+                for kind, (config_key, default) in ROLE_CONFIGS.items()
+            }
+            fallback_until = None
+        except StorageError:
+            # serve the defaults for a short while instead of blocking on every lookup, then read again
+            fresh = {kind: default for kind, (_, default) in ROLE_CONFIGS.items()}
+            fallback_until = time.monotonic() + FALLBACK_TTL_SECONDS
+        with self._lock:
+            if fallback_until is None:
+                self._fallback_until.pop(guild_id, None)
+            else:
+                self._fallback_until[guild_id] = fallback_until
+            if self._names.get(guild_id) != fresh:
+                self._names[guild_id] = fresh
+                # ids resolved from the stand-in names may not match the configured ones
+                self._ids.pop(guild_id, None)
+            return self._names[guild_id]
+
+    def set_name(self, guild_id: int, kind: str, name: str):
+        """Change a guild's role name and forget its resolved ids (blocking: call through asyncio.to_thread)"""
+        from utils.db import get_firebase_db
+        get_firebase_db().set_dev_config(f"{ROLE_CONFIGS[kind][0]}:{guild_id}", name)
+        names = self.names(guild_id)
+        with self._lock:
+            self._names[guild_id] = dict(names, **{kind: name})
+            self._ids.pop(guild_id, None)
+
+    def role_id(self, guild, kind: str) -> Optional[int]:
+        """Id of the guild's `kind` role, resolving by name only on a cache miss"""
+        if guild is None:
+            return None
+        with self._lock:
+            guild_roles = self._ids.get(guild.id, {})
+            if kind in guild_roles:
+                return guild_roles[kind]
+        name = self.names(guild.id)[kind]
+        role = next((role for role in guild.roles if role.name == name), None)
+        with self._lock:
+            self._ids.setdefault(guild.id, {})[kind] = role.id if role else None
+        return role.id if role else None
+
+    def warm(self, guilds: Iterable):
+        """Read the role names and resolve every role kind for these guilds (blocking: call through asyncio.to_thread)"""
+        self.names()
+        for guild in guilds:
+            for kind in ROLE_CONFIGS:
+                self.role_id(guild, kind)
+
+    def role(self, guild, kind: str):
+        role_id = self.role_id(guild, kind)
+        return guild.get_role(role_id) if role_id else None
+
+    def has_role(self, member, kind: str) -> bool:
+        guild = getattr(member, 'guild', None)
+        role_id = self.role_id(guild, kind)
+        return role_id is not None and member.get_role(role_id) is not None
+
+    def is_mentor(self, member) -> bool:
+        return self.has_role(member, 'mentor')
+
+    def is_admin(self, member) -> bool:
+        permissions = getattr(member, 'guild_permissions', None)
+        return bool(permissions and permissions.administrator) or self.has_role(member, 'admin')
+
+    def invalidate(self, guild_id: int):
+        with self._lock:
+            self._ids.pop(guild_id, None)
+
+    def on_role_renamed(self, role):
+        """Keep a renamed role: store its new name for its guild so later lookups still resolve it (blocking)"""
+        with self._lock:
+            cached = dict(self._ids.get(role.guild.id, {}))
+        for kind, role_id in cached.items():
+            if role_id == role.id and self.names(role.guild.id)[kind] != role.name:
+                self.set_name(role.guild.id, kind, role.name)
+
+    def on_role_changed(self, role):
+        """A role appeared or disappeared; drop the guild entry if it could affect a lookup"""
+        cached = self._ids.get(role.guild.id, {})
+        # ids are only cached once the guild's names are, so this never reads Firestore
+        if role.id in cached.values() or role.name in self._names.get(role.guild.id, {}).values():
+            self.invalidate(role.guild.id)
+
+# Global role registry
+role_registry = None
+
+def get_role_registry() -> RoleRegistry:
+    """Get the global role registry, creating it on first use"""
+    global role_registry
+    if role_registry is None:
+        role_registry = RoleRegistry()
+    return role_registry
+
+def admin_only():
+    """App command check: Administrator permission or the guild's configured Admin role"""
+    def predicate(interaction) -> bool:
+        if not get_role_registry().is_admin(interaction.user):
+            raise app_commands.MissingPermissions(['administrator'])
+        return True
+    return app_commands.check(predicate)
@@ -0,0 +1,156 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+"""
+Full-text ticket search over an in-memory inverted index with BM25 ranking
+"""
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+STOPWORDS = {
+    "a", "an", "and", "are", "at", "be", "but", "by", "can", "for", "from", "help", "how",
+    "i", "in", "is", "it", "its", "me", "my", "need", "not", "of", "on", "or", "our",
+    "so", "that", "the", "this", "to", "we", "with", "you"
+}
+# title terms count more than description and location terms
+FIELD_WEIGHTS = (('title', 2), ('description', 1), ('location', 1))
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords; keeps symbols used in tech names (c++, c#, node.js)"""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        token = token.rstrip('.')
+        if token and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+class TicketSearchIndex:
+    """Inverted index over ticket title, description and location"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.loaded = False
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._lengths: Dict[str, int] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._total_length = 0
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._lengths)
+
+    @staticmethod
+    def _terms(ticket: Dict[str, Any]) -> Counter:
+        terms = Counter()
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(ticket.get(field) or ''):
+                terms[token] += weight
+        return terms
+
+    def load(self, tickets: Iterable[Dict[str, Any]]):
+        """Index a snapshot of tickets (existing entries for the same ids are replaced)"""
+        with self._lock:
+            for ticket in tickets:
+                self.add(ticket)
+            self.loaded = True
+
+    def add(self, ticket: Dict[str, Any]):
+        ticket_id = str(ticket['id'])
+        with self._lock:
+            self.remove(ticket_id)
+            terms = self._terms(ticket)
+            for term, tf in terms.items():
+                self._postings[term][ticket_id] = tf
+            length = sum(terms.values())
+            self._lengths[ticket_id] = length
+            self._doc_terms[ticket_id] = tuple(terms)
+            self._total_length += length
+            self._meta[ticket_id] = self._summary(ticket)
+
+    def remove(self, ticket_id: str):
+        ticket_id = str(ticket_id)
+        with self._lock:
+            if ticket_id not in self._lengths:
+                return
+            for term in self._doc_terms.pop(ticket_id, ()):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(ticket_id, None)
+                    if not postings:
+                        del self._postings[term]
+            self._total_length -= self._lengths.pop(ticket_id)
+            self._meta.pop(ticket_id, None)
+
+    @staticmethod
+    def _summary(ticket: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'id': str(ticket['id']),
+            'title': ticket.get('title', 'No title'),
+            'location': ticket.get('location', 'No location'),
+            'user_name': ticket.get('user_name'),
+            'mentor_name': ticket.get('mentor_name'),
+            'status': ticket.get('status', 'open'),
+            'categories': list(ticket.get('categories') or [])
+        }
+
+    def apply(self, event: str, ticket: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+        """Database listener: only creation changes the text, other events update metadata"""
+        ticket_id = str(ticket['id'])
+        with self._lock:
+            if event == 'created' or ticket_id not in self._meta:
+                self.add(ticket)
+            else:
+                self._meta[ticket_id].update(
+                    status=ticket.get('status', 'open'),
+                    mentor_name=ticket.get('mentor_name')
+                )
+
+    def search(self, query: str, category: Optional[str] = None, status: Optional[str] = None, limit: int = 10) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return up to `limit` (score, ticket summary) pairs, best match first"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            n = len(self._lengths)
+            if n == 0:
+                return []
+            avg_length = self._total_length / n
+            lengths = self._lengths
+            meta = self._meta
+            k1, b = self.k1, self.b
+            scores: Dict[str, float] = {}
+            rejected = set()
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for ticket_id, tf in postings.items():
+                    if ticket_id in rejected:
+                        continue
+                    if ticket_id not in scores:
+                        summary = meta[ticket_id]
+                        if (status and summary['status'] != status) or (category and category not in summary['categories']):
+                            rejected.add(ticket_id)
+                            continue
+                    norm = k1 * (1 - b + b * lengths[ticket_id] / avg_length)
+                    scores[ticket_id] = scores.get(ticket_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(score, dict(meta[ticket_id])) for ticket_id, score in best]
+
+# Global search index
+search_index = None
+
+def get_search_index() -> TicketSearchIndex:
+    """Get the global ticket search index, creating it on first use"""
+    global search_index
+    if search_index is None:
+        search_index = TicketSearchIndex()
+    return search_index
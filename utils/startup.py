@@ -0,0 +1,72 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+"""
+Startup phase timing for cold starts
+"""
+class StartupReport:
+    """Records how long each startup phase takes and the total time-to-ready"""
+
+    def __init__(self, target_seconds: float, started_at: float = None):
+        self.target_seconds = target_seconds
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.ready_at: Optional[float] = None
+        self._open: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a synchronous block of startup work"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    async def timed(self, name: str, awaitable):
+        """Time an awaitable so it can run concurrently with other phases"""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    def start(self, name: str):
+        """Open a phase that finishes in a different callback (e.g. the gateway handshake)"""
+        self._open[name] = time.perf_counter()
+
+    def stop(self, name: str):
+        """Close a phase opened with start(); unknown names are ignored"""
+        started = self._open.pop(name, None)
+        if started is not None:
+            self.phases[name] = time.perf_counter() - started
+
+    def mark_ready(self):
+        """Record the moment the bot became ready (only the first call counts)"""
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+
+    @property
+    def time_to_ready(self) -> Optional[float]:
+        if self.ready_at is None:
+            return None
+        return self.ready_at - self.started_at
+
+    @property
+    def within_target(self) -> bool:
+        return self.time_to_ready is not None and self.time_to_ready <= self.target_seconds
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            'phases': {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            'time_to_ready': round(self.time_to_ready, 3) if self.time_to_ready is not None else None,
+            'target': self.target_seconds,
+            'within_target': self.within_target
+        }
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{name}={seconds:.2f}s" for name, seconds in self.phases.items())
+        if self.time_to_ready is None:
+            return f"Startup in progress ({phases})"
+        return f"Ready in {self.time_to_ready:.2f}s (target {self.target_seconds:.2f}s): {phases}"
@@ -7,12 +7,14 @@ class Colors:
     BLUE = 0x0099ff
     GRAY = 0x808080
     DEFAULT = 0x2f3136
+    DISCORD_DEFAULT = 0x5865f2
 
 class Emojis:
     # Ticket status
     OPEN_TICKET = "🟢"
     CLOSED_TICKET = "🔴"
     TICKET = "🎫"
+    WAITING = "⏰"
     
     # Actions
     CREATE = "📝"
@@ -50,6 +52,7 @@ class Titles:
     ASSIGNED_TICKETS = "📝 Your Assigned Tickets"
     MY_TICKETS = "📝 My Assigned Tickets"
     SEARCH_RESULTS = "🔍 Search Results"
+    MENTOR_DASHBOARD = "📊 Mentor Queue"
     
     # Setup
     BOT_SETUP = "🔧 Bot Setup"
@@ -61,6 +64,8 @@ class Titles:
     TOO_MANY_TICKETS = "Too Many Open Tickets"
     TICKET_NOT_FOUND = "❌ Ticket Not Found"
     PERMISSION_ERROR = "❌ Permission Error"
+    RATE_LIMITED = "⏳ Slow Down"
+    POSSIBLE_DUPLICATES = "⚠️ Possible duplicates"
 
 # Common messages
 class Messages:
@@ -76,6 +81,12 @@ class Messages:
     TICKET_NOT_FOUND_MSG = "Ticket not found."
     PERMISSION_DENIED_MSG = "You need administrator permissions to configure channels."
     MENTOR_ROLE_REQUIRED = "You need the Mentor role to use this command."
+    SHUTTING_DOWN = "The bot is restarting. Please try again in a few seconds."
+    TICKET_IN_PROGRESS = "Your ticket is still being created. Please wait a moment."
+    STORAGE_UNAVAILABLE = "The ticket database is not responding right now. Please try again in a moment."
+    CATEGORY_GROUP_REMOVED = "That group no longer exists. Please pick another one."
+    POSSIBLE_DUPLICATES_MSG = "These open tickets look similar. If one is from your team, a mentor may already be on the way:"
+    RATE_LIMITED_MSG = "You're creating tickets too quickly. Please try again in"
     
     # Setup
     SETUP_COMPLETE = "The bot is ready to handle tickets!"
@@ -89,4 +100,5 @@ class Messages:
 
 # Footer messages
 class Footers:
-    CONFIG_NOTE = "Tickets can now be created in the ticket channel, and mentors will be notified in the mentor channel." 
\ No newline at end of file
+    CONFIG_NOTE = "Tickets can now be created in the ticket channel, and mentors will be notified in the mentor channel."
+    DASHBOARD = "Updates automatically as tickets change · Last updated" 
\ No newline at end of file
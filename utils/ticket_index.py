@@ -0,0 +1,96 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+from utils.ticket_model import Ticket
+
+"""
+In-memory index of open tickets, kept current from the database's state-change events
+"""
+class OpenTicketIndex:
+    """Open tickets by id, by hacker and by assigned mentor, held as compact Ticket objects"""
+
+    def __init__(self):
+        self.loaded = False
+        self._tickets: Dict[str, Ticket] = {}
+        self._by_user: Dict[int, Set[str]] = defaultdict(set)
+        self._by_mentor: Dict[int, Set[str]] = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def load(self, tickets: Iterable[Dict[str, Any]]):
+        """Replace the index contents with a snapshot of open tickets"""
+        with self._lock:
+            self._tickets.clear()
+            self._by_user.clear()
+            self._by_mentor.clear()
+            for ticket in tickets:
+                self._add(ticket)
+            self.loaded = True
+
+    def _add(self, data: Dict[str, Any]):
+        ticket_id = str(data['id'])
+        self._remove(ticket_id)
+        if data.get('status') != 'open':
+            return
+        ticket = self._tickets[ticket_id] = Ticket.from_dict(data)
+        self._by_user[ticket.user_id].add(ticket_id)
+        if ticket.mentor_id:
+            self._by_mentor[ticket.mentor_id].add(ticket_id)
+
+    def _remove(self, ticket_id: str):
+        ticket = self._tickets.pop(ticket_id, None)
+        if ticket is None:
+            return
+        self._by_user[ticket.user_id].discard(ticket_id)
+        if not self._by_user[ticket.user_id]:
+            del self._by_user[ticket.user_id]
+        mentor_id = ticket.mentor_id
+        if mentor_id:
+            self._by_mentor[mentor_id].discard(ticket_id)
+            if not self._by_mentor[mentor_id]:
+                del self._by_mentor[mentor_id]
+
+    def apply(self, event: str, ticket: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+        """Database listener: keep the index in step with ticket writes"""
+        with self._lock:
+            if event == 'closed':
+                self._remove(str(ticket['id']))
+            else:
+                self._add(ticket)
+
+    def get(self, ticket_id: str) -> Optional[Ticket]:
+        with self._lock:
+            return self._tickets.get(str(ticket_id))
+
+    def _collect(self, ids: Iterable[str]) -> List[Ticket]:
+        tickets = [self._tickets[ticket_id] for ticket_id in ids]
+        return sorted(tickets, key=lambda t: t.number)
+
+    def open_tickets(self) -> List[Ticket]:
+        with self._lock:
+            return self._collect(self._tickets)
+
+    def unassigned(self) -> List[Ticket]:
+        with self._lock:
+            return [t for t in self._collect(self._tickets) if not t.mentor_id]
+
+    def user_tickets(self, user_id: int) -> List[Ticket]:
+        with self._lock:
+            return self._collect(self._by_user.get(user_id, ()))
+
+    def mentor_tickets(self, mentor_id: int) -> List[Ticket]:
+        with self._lock:
+            return self._collect(self._by_mentor.get(mentor_id, ()))
+
+    def user_open_count(self, user_id: int) -> int:
+        with self._lock:
+            return len(self._by_user.get(user_id, ()))
+
+# Global open ticket index
+ticket_index = None
+
+def get_ticket_index() -> OpenTicketIndex:
+    """Get the global open ticket index, creating it on first use"""
+    global ticket_index
+    if ticket_index is None:
+        ticket_index = OpenTicketIndex()
+    return ticket_index
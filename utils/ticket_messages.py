@@ -0,0 +1,88 @@
+import re
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+"""
+Where ticket notifications and ticket interfaces were posted, so nothing has to scan channel history for them
+"""
+TICKET_REFERENCE = re.compile(r"Ticket #(\d+)")
+
+class TicketMessageIndex:
+    """
+    Ticket id -> (channel id, message id) of its latest mentor-channel post, and
+    channel id -> message id of the ticket interface posted there.
+
+    Kept current as messages are posted; scan() rebuilds it from recent history
+    after a restart.
+    """
+
+    def __init__(self):
+        self._tickets: Dict[str, Tuple[int, int]] = {}
+        self._interfaces: Dict[int, int] = {}
+        self._scanned = set()
+        self._lock = threading.Lock()
+
+    def record(self, ticket_ids: Iterable[str], message):
+        with self._lock:
+            for ticket_id in ticket_ids:
+                self._tickets[str(ticket_id)] = (message.channel.id, message.id)
+
+    def get(self, ticket_id: str) -> Optional[Tuple[int, int]]:
+        return self._tickets.get(str(ticket_id))
+
+    def forget(self, ticket_id: str):
+        with self._lock:
+            self._tickets.pop(str(ticket_id), None)
+
+    def record_interface(self, message):
+        with self._lock:
+            self._interfaces[message.channel.id] = message.id
+
+    def interface(self, channel_id: int) -> Optional[int]:
+        return self._interfaces.get(channel_id)
+
+    def interfaces(self) -> Dict[int, int]:
+        """Every known ticket interface as channel id -> message id"""
+        with self._lock:
+            return dict(self._interfaces)
+
+    def forget_interface(self, channel_id: int):
+        with self._lock:
+            self._interfaces.pop(channel_id, None)
+
+    def scanned(self, channel_id: int) -> bool:
+        return channel_id in self._scanned
+
+    async def scan(self, channel, author, interface_title: str = None, limit: int = 200) -> int:
+        """Index `author`'s recent messages in a channel; returns how many tickets were found"""
+        messages = [message async for message in channel.history(limit=limit)]
+        found = 0
+        if interface_title:
+            # forget an interface that has since been deleted
+            with self._lock:
+                self._interfaces.pop(channel.id, None)
+        # oldest first, so a ticket's newest post wins
+        for message in reversed(messages):
+            if message.author != author or not message.embeds:
+                continue
+            for embed in message.embeds:
+                if interface_title and embed.title == interface_title:
+                    self.record_interface(message)
+                    continue
+                names = [embed.title or ''] + [field.name for field in embed.fields]
+                ticket_ids = [match for name in names for match in TICKET_REFERENCE.findall(name)]
+                self.record(ticket_ids, message)
+                found += len(ticket_ids)
+        with self._lock:
+            self._scanned.add(channel.id)
+        return found
+
+# Global ticket message index
+ticket_messages = None
+
+def get_ticket_messages() -> TicketMessageIndex:
+    """Get the global ticket message index, creating it on first use"""
+    global ticket_messages
+    if ticket_messages is None:
+        ticket_messages = TicketMessageIndex()
+    return ticket_messages
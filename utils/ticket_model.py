@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from utils.categories import get_category_bits
+from utils.timestamps import to_datetime
+
+"""
+Compact in-memory form of a ticket, for the caches and indexes that hold thousands of them
+"""
+class TicketStatus(str, Enum):
+    OPEN = 'open'
+    CLOSED = 'closed'
+
+def _epoch(value: Any) -> Optional[int]:
+    """Whole seconds since the epoch from a stored timestamp (native, epoch or legacy string)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return int(value.timestamp())
+    moment = to_datetime(value)
+    return int(moment.timestamp()) if moment else None
+
+def _datetime(value: Optional[int]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
+
+class Ticket:
+    """
+    A ticket document without the per-key dict overhead.
+
+    Categories are a bitmask over utils.categories.CategoryBits and timestamps are
+    epoch seconds; both are converted back on the way out. Missing titles and
+    locations are filled in once here rather than at every use.
+    """
+
+    __slots__ = (
+        'id', 'user_id', 'user_name', 'title', 'description', 'location', 'category_mask',
+        'status', 'created_at', 'closed_at', 'mentor_id', 'mentor_name'
+    )
+
+    def __init__(self, id: str, user_id: int, user_name: str, title: str, description: str, location: str,
+                 category_mask: int = 0, status: TicketStatus = TicketStatus.OPEN, created_at: Optional[int] = None,
+                 closed_at: Optional[int] = None, mentor_id: Optional[int] = None, mentor_name: Optional[str] = None):
+        self.id = id
+        self.user_id = user_id
+        self.user_name = user_name
+        self.title = title
+        self.description = description
+        self.location = location
+        self.category_mask = category_mask
+        self.status = status
+        self.created_at = created_at
+        self.closed_at = closed_at
+        self.mentor_id = mentor_id
+        self.mentor_name = mentor_name
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Ticket":
+        """From a Firestore document, journal entry or listener payload"""
+        return cls(
+            str(data['id']),
+            data.get('user_id'),
+            data.get('user_name'),
+            data.get('title') or 'No title',
+            data.get('description') or '',
+            data.get('location') or 'No location',
+            get_category_bits().mask(data.get('categories') or ()),
+            TicketStatus.CLOSED if data.get('status') == 'closed' else TicketStatus.OPEN,
+            _epoch(data.get('created_at')),
+            _epoch(data.get('closed_at')),
+            data.get('mentor_id'),
+            data.get('mentor_name')
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "Ticket":
+        return cls.from_dict(snapshot.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The Firestore document form (native timestamps, category names)"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'user_name': self.user_name,
+            'title': self.title,
+            'description': self.description,
+            'location': self.location,
+            'categories': self.categories,
+            'status': self.status.value,
+            'created_at': _datetime(self.created_at),
+            'mentor_id': self.mentor_id,
+            'mentor_name': self.mentor_name,
+            'closed_at': _datetime(self.closed_at)
+        }
+
+    @property
+    def categories(self) -> List[str]:
+        return get_category_bits().names(self.category_mask)
+
+    def has_category(self, name: str) -> bool:
+        return bool(self.category_mask >> get_category_bits().bit(name) & 1)
+
+    @property
+    def is_open(self) -> bool:
+        return self.status is TicketStatus.OPEN
+
+    @property
+    def created(self) -> Optional[datetime]:
+        return _datetime(self.created_at)
+
+    @property
+    def closed(self) -> Optional[datetime]:
+        return _datetime(self.closed_at)
+
+    @property
+    def number(self) -> int:
+        """Numeric id for ordering (0 for ids that aren't counter-based)"""
+        return int(self.id) if self.id.isdigit() else 0
+
+    def __repr__(self):
+        return f"<Ticket #{self.id} {self.status.value} user={self.user_id} mentor={self.mentor_id}>"
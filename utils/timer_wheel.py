@@ -0,0 +1,95 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+"""
+Hierarchical timing wheel: many timers on one clock, O(1) to schedule and cancel
+"""
+class Timer:
+    """A scheduled payload; cancel() removes it from its slot"""
+
+    __slots__ = ('deadline', 'payload', '_slot')
+
+    def __init__(self, deadline: int, payload: Any):
+        # in ticks
+        self.deadline = deadline
+        self.payload = payload
+        self._slot: Optional[Dict["Timer", None]] = None
+
+    @property
+    def active(self) -> bool:
+        return self._slot is not None
+
+    def cancel(self):
+        if self._slot is not None:
+            del self._slot[self]
+            self._slot = None
+
+class TimerWheel:
+    """
+    Wheels of `sizes` slots, each slot of a level spanning a whole turn of the level
+    below (with the defaults: seconds, minutes and hours, a day in all). A timer sits
+    in the finest level that reaches its deadline and moves down a level each time
+    the wheel above it turns to its slot, so advancing one tick touches only the
+    timers that are due or cascading. Timers beyond the top level wait in an
+    overflow slot that is re-sorted once per top-level turn.
+    """
+
+    def __init__(self, tick: float = 1.0, sizes: Tuple[int, ...] = (60, 60, 24), clock: Callable[[], float] = time.monotonic):
+        self.tick = tick
+        self.clock = clock
+        self._sizes = sizes
+        self._spans = [1]
+        for size in sizes[:-1]:
+            self._spans.append(self._spans[-1] * size)
+        self._levels: List[List[Dict[Timer, None]]] = [[{} for _ in range(size)] for size in sizes]
+        self._overflow: Dict[Timer, None] = {}
+        self._now = self._ticks(clock())
+
+    def _ticks(self, moment: float) -> int:
+        return int(moment / self.tick)
+
+    def __len__(self) -> int:
+        return sum(len(slot) for level in self._levels for slot in level) + len(self._overflow)
+
+    def schedule(self, delay: float, payload: Any) -> Timer:
+        """Fire `payload` from advance() once `delay` seconds have passed (rounded up to a tick)"""
+        ticks = max(1, -int(-delay // self.tick))
+        timer = Timer(self._ticks(self.clock()) + ticks, payload)
+        self._place(timer)
+        return timer
+
+    def _place(self, timer: Timer):
+        # cascading timers are due now at the earliest, and the current level 0 slot is emptied after cascading
+        deadline = max(timer.deadline, self._now)
+        slot = self._overflow
+        for span, size, level in zip(self._spans, self._sizes, self._levels):
+            if deadline // span - self._now // span < size:
+                slot = level[deadline // span % size]
+                break
+        slot[timer] = None
+        timer._slot = slot
+
+    def advance(self) -> List[Any]:
+        """Move the wheel up to the current time; returns the payloads that came due, earliest tick first"""
+        target = self._ticks(self.clock())
+        due = []
+        while self._now < target:
+            self._now += 1
+            if self._now % (self._spans[-1] * self._sizes[-1]) == 0:
+                self._cascade(self._overflow)
+            # higher levels first, so timers they hand down are cascaded again if needed
+            for span, size, level in reversed(list(zip(self._spans, self._sizes, self._levels))[1:]):
+                if self._now % span == 0:
+                    self._cascade(level[self._now // span % size])
+            slot = self._levels[0][self._now % self._sizes[0]]
+            for timer in slot:
+                timer._slot = None
+                due.append(timer.payload)
+            slot.clear()
+        return due
+
+    def _cascade(self, slot: Dict[Timer, None]):
+        timers = list(slot)
+        slot.clear()
+        for timer in timers:
+            self._place(timer)
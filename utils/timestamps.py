@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+"""
+Ticket timestamps: stored as native Firestore timestamps (UTC datetimes) and shown through one formatter
+"""
+TIMESTAMP_FIELDS = ('created_at', 'closed_at', 'updated_at', 'archived_at')
+# sorts tickets without a usable timestamp first
+EPOCH = datetime.fromtimestamp(0, timezone.utc)
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def to_datetime(value: Any) -> Optional[datetime]:
+    """
+    UTC datetime from a Firestore timestamp, a datetime, epoch seconds or a legacy isoformat string.
+
+    Legacy strings were written with datetime.now() and carry no offset, so they are read as server local time.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value.astimezone(timezone.utc)
+
+def normalize(ticket: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a ticket's timestamp fields to UTC datetimes in place (documents written before timestamps were native)"""
+    for field in TIMESTAMP_FIELDS:
+        if field in ticket:
+            ticket[field] = to_datetime(ticket[field])
+    return ticket
+
+def sort_key(ticket: Dict[str, Any], field: str = 'created_at') -> datetime:
+    return to_datetime(ticket.get(field)) or EPOCH
+
+def format_date(value: Any) -> str:
+    """YYYY-MM-DD for ticket listings"""
+    moment = to_datetime(value)
+    return moment.strftime("%Y-%m-%d") if moment else "unknown"
+
+def format_datetime(value: Any) -> str:
+    """Full UTC date and time for ticket details and status embeds"""
+    moment = to_datetime(value)
+    return moment.strftime("%Y-%m-%d %H:%M:%S UTC") if moment else "unknown"
+
+def json_default(value: Any) -> Any:
+    """json.dumps hook that keeps datetimes recognisable (used by the local journal)"""
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def json_object_hook(obj: Dict[str, Any]) -> Any:
+    """json.loads hook reversing json_default"""
+    if len(obj) == 1 and '$datetime' in obj:
+        return datetime.fromisoformat(obj['$datetime'])
+    return obj
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import queue
+import random
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('discord')
+
+"""
+Lightweight tracing: sampled spans around interactions, storage calls and Discord REST calls
+"""
+class Span:
+    """One timed operation; children share the root's trace id"""
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'start_ns', 'end_ns', 'attributes', 'status')
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = 'OK'
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """OTLP/JSON field names, so the file can be fed to a collector"""
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id or '',
+            'name': self.name,
+            'startTimeUnixNano': self.start_ns,
+            'endTimeUnixNano': self.end_ns,
+            'durationMs': round((self.end_ns - self.start_ns) / 1e6, 3),
+            'attributes': self.attributes,
+            'status': self.status
+        }
+
+class JsonlExporter:
+    """
+    Appends finished spans to a file, one JSON object per line, from a background thread.
+
+    Once the file reaches `max_bytes` it is renamed to <path>.1 (replacing the
+    previous one) and a new file started, so at most twice that is kept on disk.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='trace-export', daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        self._queue.put(span)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if self.max_bytes and os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                    os.replace(self.path, f"{self.path}.1")
+                with open(self.path, 'a') as f:
+                    f.writelines(json.dumps(span.to_dict(), default=str) + "\n" for span in batch)
+            except OSError as e:
+                logger.warning(f"Failed to export {len(batch)} span(s): {e}")
+
+# the span new spans attach to; None outside a sampled trace
+current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('current_span', default=None)
+
+class Tracer:
+    """
+    Starts spans and hands finished ones to the exporter.
+
+    The sampling decision is made once per trace, at the root span; spans started
+    outside a sampled trace cost one context lookup.
+    """
+
+    def __init__(self, exporter: Optional[JsonlExporter], sample_rate: float = 0.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def set_sample_rate(self, rate: float):
+        """Change the share of new traces that are recorded (0.0 - 1.0)"""
+        self.sample_rate = min(1.0, max(0.0, rate))
+        logger.info(f"Trace sample rate set to {self.sample_rate:g}")
+
+    @contextmanager
+    def span(self, name: str, root: bool = False, **attributes):
+        """
+        Time the block as a span.
+
+        Only root=True spans start a trace (subject to sampling); other spans are
+        recorded only inside an already sampled trace.
+        """
+        parent = current_span.get()
+        if parent is None:
+            if not root or self.exporter is None or random.random() >= self.sample_rate:
+                yield None
+                return
+            span = Span(name, os.urandom(16).hex(), None, attributes)
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, attributes)
+
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = 'ERROR'
+            span.attributes['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self.exporter.export(span)
+
+# Global tracer
+tracer = None
+
+def get_tracer() -> Tracer:
+    """Get the global tracer, creating it on first use"""
+    global tracer
+    if tracer is None:
+        from config import Config
+        exporter = JsonlExporter(Config.TRACE_EXPORT_PATH, int(Config.TRACE_EXPORT_MAX_MB * 1024 * 1024)) if Config.TRACE_EXPORT_PATH else None
+        tracer = Tracer(exporter, Config.TRACE_SAMPLE_RATE)
+    return tracer
+
+def span(name: str, root: bool = False, **attributes):
+    """Shortcut for get_tracer().span(...)"""
+    return get_tracer().span(name, root=root, **attributes)
+
+def trace_http(http):
+    """Wrap a discord.py HTTPClient so each REST call inside a sampled trace gets a span"""
+    request = http.request
+
+    async def traced(route, **kwargs):
+        with span(f"discord.{route.method} {route.path}", method=route.method, path=route.path):
+            return await request(route, **kwargs)
+    http.request = traced
@@ -1,15 +1,89 @@
+import math
+import asyncio
+import logging
 import discord
-from datetime import datetime
-from utils.db import get_firebase_db, categories
+from utils.db import get_firebase_db, DuplicateTicketError
+from utils.categories import GuildCategories, get_category_catalogue
+from utils.rate_limit import get_picker_rate_limiter, get_ticket_rate_limiter
+from utils.duplicates import get_duplicate_detector
+from utils.ticket_index import get_ticket_index
+from utils.timestamps import format_datetime
+from utils.interactions import interaction_handler, reply
+from utils.log import bind
 from utils.styles import Colors, Emojis, Titles, Messages
 
+logger = logging.getLogger('discord')
+
 """
 Modal and views for creating tickets
 """
+def rate_limited_embed(retry_after: float) -> discord.Embed:
+    """Embed shown when the ticket creation rate limit rejects a request"""
+    return discord.Embed(
+        title=Titles.RATE_LIMITED,
+        description=f"{Messages.RATE_LIMITED_MSG} {math.ceil(retry_after)}s.",
+        color=Colors.RED
+    )
+
+def find_duplicates(title: str, description: str) -> list:
+    """Open tickets that look like the same problem, as (ticket_id, title) pairs"""
+    index = get_ticket_index()
+    duplicates = []
+    for ticket_id, _ in get_duplicate_detector().find(title, description):
+        ticket = index.get(ticket_id)
+        duplicates.append((ticket_id, ticket.title if ticket else 'No title'))
+    return duplicates
+
+def duplicates_text(duplicates: list) -> str:
+    return "\n".join(f"#{ticket_id} · {title}" for ticket_id, title in duplicates)[:1024]
+
+def ticket_created_embed(ticket: dict, description: str, duplicates: list = None) -> discord.Embed:
+    """Ephemeral confirmation shown to the hacker after submitting the modal"""
+    embed = discord.Embed(
+        title=Titles.TICKET_CREATED,
+        description=description,
+        color=Colors.GREEN
+    )
+    embed.add_field(name="Title", value=ticket['title'], inline=False)
+    embed.add_field(name="Description", value=ticket['description'][:200] + "..." if len(ticket['description']) > 200 else ticket['description'], inline=False)
+    embed.add_field(name="Location", value=ticket['location'], inline=True)
+    if ticket['categories']:
+        embed.add_field(name="Categories", value=", ".join(ticket['categories']), inline=True)
+    embed.add_field(name="Status", value=ticket['status'].title(), inline=True)
+    embed.add_field(name="Created", value=format_datetime(ticket['created_at']), inline=True)
+    if duplicates:
+        embed.add_field(
+            name=Titles.POSSIBLE_DUPLICATES,
+            value=f"{Messages.POSSIBLE_DUPLICATES_MSG}\n{duplicates_text(duplicates)}",
+            inline=False
+        )
+    return embed
+
+def picker_retry_after(user_id: int, guild_id: int = None) -> float:
+    """
+    Charge the picker limit for opening the ticket flow; returns 0 if allowed, otherwise seconds to wait.
+
+    The ticket limit is charged by the submit, once a ticket is created; it is only
+    looked at here so a user who can't create another ticket hears it before typing one.
+    """
+    return (get_ticket_rate_limiter().check(user_id, guild_id, consume=False)
+            or get_picker_rate_limiter().check(user_id, guild_id))
+
+async def open_ticket_count(user_id: int) -> int:
+    """Open tickets for a user, from the in-memory index once it is loaded"""
+    index = get_ticket_index()
+    if index.loaded:
+        return index.user_open_count(user_id)
+    user_tickets = await asyncio.to_thread(get_firebase_db().get_user_tickets, user_id)
+    return sum(1 for t in user_tickets if t['status'] == 'open')
+
 class TicketCreateModal(discord.ui.Modal, title="Create Ticket"):
-    def __init__(self, selected_categories: list):
+    def __init__(self, selected_categories: list, idempotency_key: str = None):
         super().__init__()
-        self.selected_categories = selected_categories
+        # copy so later selections on a shared view don't change this submission
+        self.selected_categories = list(selected_categories)
+        # derived from the interaction that opened the modal, so double submits and retries share it
+        self.idempotency_key = idempotency_key
         
         self.title_input = discord.ui.TextInput(
             label="Title",
@@ -37,104 +111,154 @@ class TicketCreateModal(discord.ui.Modal, title="Create Ticket"):
         self.add_item(self.description_input)
         self.add_item(self.location_input)
 
+    # the ticket write touches Firestore, so acknowledge first and answer with a followup
+    @interaction_handler(defer='reply')
     async def on_submit(self, interaction: discord.Interaction):
-        db = get_firebase_db()
+        # charged only once a ticket is created, so a repeated submit costs nothing
+        limiter = get_ticket_rate_limiter()
+        retry_after = limiter.check(interaction.user.id, interaction.guild_id, consume=False)
+        if retry_after:
+            await reply(interaction, embed=rate_limited_embed(retry_after), ephemeral=True)
+            return
         
-        ticket = db.create_ticket(
-            user_id=interaction.user.id,
-            user_name=interaction.user.display_name,
-            title=self.title_input.value,
-            description=self.description_input.value,
-            location=self.location_input.value,
-            categories=self.selected_categories
-        )
+        db = get_firebase_db()
         
-        embed = discord.Embed(
-            title=Titles.TICKET_CREATED,
-            description=f"Ticket #{ticket['id']} has been created successfully!",
-            color=Colors.GREEN
-        )
-        embed.add_field(name="Title", value=ticket['title'], inline=False)
-        embed.add_field(name="Description", value=ticket['description'][:200] + "..." if len(ticket['description']) > 200 else ticket['description'], inline=False)
-        embed.add_field(name="Location", value=ticket['location'], inline=True)
-        if ticket['categories']:
-            embed.add_field(name="Categories", value=", ".join(ticket['categories']), inline=True)
-        embed.add_field(name="Status", value="Open", inline=True)
-        embed.add_field(name="Created", value=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+        # checked before the write so the new ticket doesn't match itself
+        duplicates = find_duplicates(self.title_input.value, self.description_input.value)
+        catalogue = await asyncio.to_thread(get_category_catalogue().get, interaction.guild_id)
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        try:
+            ticket = await asyncio.to_thread(
+                db.create_ticket,
+                user_id=interaction.user.id,
+                user_name=interaction.user.display_name,
+                title=self.title_input.value,
+                description=self.description_input.value,
+                location=self.location_input.value,
+                categories=[c for c in self.selected_categories if c in catalogue],
+                idempotency_key=self.idempotency_key
+            )
+        except DuplicateTicketError as e:
+            # repeated submit: answer with the original ticket and skip the mentor notification
+            if e.ticket is None:
+                await reply(interaction, f"{Emojis.INFO} {Messages.TICKET_IN_PROGRESS}", ephemeral=True)
+            else:
+                embed = ticket_created_embed(e.ticket, f"Ticket #{e.ticket['id']} was already created for this submission.")
+                await reply(interaction, embed=embed, ephemeral=True)
+            return
+        limiter.charge(interaction.user.id, interaction.guild_id)
         
-        # Reset the selected categories
-        self.selected_categories.clear()
+        bind(ticket_id=ticket['id'])
+        embed = ticket_created_embed(ticket, f"Ticket #{ticket['id']} has been created successfully!", duplicates)
+        await reply(interaction, embed=embed, ephemeral=True)
         
         from views.manage_ticket import notify_mentors
-        await notify_mentors(interaction, ticket)
+        await notify_mentors(interaction, ticket, duplicates)
 
 class CategorySelectionView(discord.ui.View):
-    def __init__(self, user_id: int):
+    """Private picker: choosing a group swaps in that group's technologies"""
+    def __init__(self, user_id: int, catalogue: GuildCategories):
         super().__init__(timeout=300)
         self.user_id = user_id
-        self.selected_categories = []
+        self.catalogue = catalogue
         
-        self.add_item(CategorySelect(self.selected_categories))
+        self.add_item(CategoryGroupSelect(self.catalogue))
 
 class PublicCategorySelectionView(discord.ui.View):
-    def __init__(self):
-        super().__init__(timeout=None)  
-        self.selected_categories = []
+    """
+    Public picker: choosing a group answers with a private technology picker.
+
+    Persistent: registered once at startup with bot.add_view, it handles the select
+    on every posted interface. The callback re-reads the catalogue, so the one the
+    registered view was built with doesn't matter.
+    """
+    def __init__(self, catalogue: GuildCategories):
+        super().__init__(timeout=None)
+        self.catalogue = catalogue
         
-        self.add_item(PublicCategorySelect(self.selected_categories))
+        self.add_item(PublicCategoryGroupSelect(self.catalogue))
 
-class CategorySelect(discord.ui.Select):
-    def __init__(self, selected_categories: list):
-        self.selected_categories = selected_categories
+async def refresh_ticket_interfaces(guild, catalogue: GuildCategories) -> int:
+    """Swap in `catalogue`'s groups on the guild's posted ticket interfaces; returns how many were edited"""
+    from utils.ticket_messages import get_ticket_messages
+    messages = get_ticket_messages()
+    edited = 0
+    for channel_id, message_id in messages.interfaces().items():
+        channel = guild.get_channel(channel_id)
+        if channel is None:
+            continue
+        try:
+            await channel.get_partial_message(message_id).edit(view=PublicCategorySelectionView(catalogue))
+        except discord.NotFound:
+            messages.forget_interface(channel_id)
+        except discord.HTTPException as e:
+            logger.warning(f"Couldn't update the ticket interface in #{channel}: {e}")
+        else:
+            edited += 1
+    return edited
+
+class CategoryTechView(discord.ui.View):
+    def __init__(self, user_id: int, catalogue: GuildCategories, group: str):
+        super().__init__(timeout=300)
+        self.user_id = user_id
         
-        options = []
-        for category in categories:
-            options.append(discord.SelectOption(
-                label=category,
-                value=category
-            ))
+        self.add_item(CategorySelect(catalogue, group))
+
+async def open_ticket_modal(interaction: discord.Interaction, selected_categories: list):
+    modal = TicketCreateModal(selected_categories, idempotency_key=str(interaction.id))
+    await interaction.response.send_modal(modal)
+
+class CategoryGroupSelect(discord.ui.Select):
+    def __init__(self, catalogue: GuildCategories):
+        self.catalogue = catalogue
         
         super().__init__(
-            placeholder="Make a selection",
+            placeholder="Pick an area",
             min_values=1,
             max_values=1,
-            options=options
+            # prebuilt per catalogue; copied so the shared list is never mutated
+            options=list(catalogue.group_options)
         )
 
+    @interaction_handler
     async def callback(self, interaction: discord.Interaction):
         if interaction.user.id != self.view.user_id:
             await interaction.response.send_message("This selection is not for you!", ephemeral=True)
             return
         
-        self.selected_categories.clear()
-        self.selected_categories.extend(self.values)
+        group = self.values[0]
+        categories = self.catalogue.categories_in(group)
+        if len(categories) == 1:
+            await open_ticket_modal(interaction, list(categories))
+            return
         
-        modal = TicketCreateModal(self.selected_categories)
-        await interaction.response.send_modal(modal)
+        await interaction.response.edit_message(view=CategoryTechView(interaction.user.id, self.catalogue, group))
 
-class PublicCategorySelect(discord.ui.Select):
-    def __init__(self, selected_categories: list):
-        self.selected_categories = selected_categories
-        
-        options = []
-        for category in categories:
-            options.append(discord.SelectOption(
-                label=category,
-                value=category
-            ))
+class PublicCategoryGroupSelect(discord.ui.Select):
+    def __init__(self, catalogue: GuildCategories):
+        self.catalogue = catalogue
         
         super().__init__(
-            placeholder="Make a selection",
+            placeholder="Pick an area",
             min_values=1,
             max_values=1,
-            options=options
+            options=list(catalogue.group_options),
+            # fixed so the posted interface keeps working after a restart (see PublicCategorySelectionView)
+            custom_id="ticket_interface:group"
         )
 
+    @interaction_handler
     async def callback(self, interaction: discord.Interaction):
+        # the select is shared by every click on the interface, so read the choice before awaiting anything
+        group = self.values[0]
+        retry_after = picker_retry_after(interaction.user.id, interaction.guild_id)
+        if retry_after:
+            await interaction.response.send_message(embed=rate_limited_embed(retry_after), ephemeral=True)
+            return
+        
+        # can't defer here (a one-technology group answers with the modal), so keep storage off the event loop
         db = get_firebase_db()
-        ticket_channel_id = db.get_dev_config('ticket_channel')
+        ticket_channel_id = await asyncio.to_thread(db.get_dev_config, 'ticket_channel')
         if ticket_channel_id and str(interaction.channel_id) != ticket_channel_id:
             embed = discord.Embed(
                 title=Titles.WRONG_CHANNEL,
@@ -144,10 +268,7 @@ class PublicCategorySelect(discord.ui.Select):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        user_tickets = db.get_user_tickets(interaction.user.id)
-        open_tickets = [t for t in user_tickets if t['status'] == 'open']
-        
-        if len(open_tickets) > 5:
+        if await open_ticket_count(interaction.user.id) > 5:
             embed = discord.Embed(
                 title=Titles.TOO_MANY_TICKETS,
                 description=Messages.TOO_MANY_TICKETS_MSG,
@@ -156,8 +277,32 @@ class PublicCategorySelect(discord.ui.Select):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        self.selected_categories.clear()
-        self.selected_categories.extend(self.values)
+        # re-read so technologies added since the interface was posted show up
+        catalogue = await asyncio.to_thread(get_category_catalogue().get, interaction.guild_id)
+        categories = catalogue.categories_in(group)
+        if not categories:
+            await interaction.response.send_message(f"{Emojis.ERROR} {Messages.CATEGORY_GROUP_REMOVED}", ephemeral=True)
+            return
+        if len(categories) == 1:
+            await open_ticket_modal(interaction, list(categories))
+            return
+        
+        view = CategoryTechView(interaction.user.id, catalogue, group)
+        await interaction.response.send_message(f"**{group}**: pick a technology", view=view, ephemeral=True)
+
+class CategorySelect(discord.ui.Select):
+    def __init__(self, catalogue: GuildCategories, group: str):
+        super().__init__(
+            placeholder="Pick a technology",
+            min_values=1,
+            max_values=1,
+            options=list(catalogue.category_options[group])
+        )
+
+    @interaction_handler
+    async def callback(self, interaction: discord.Interaction):
+        if interaction.user.id != self.view.user_id:
+            await interaction.response.send_message("This selection is not for you!", ephemeral=True)
+            return
         
-        modal = TicketCreateModal(self.selected_categories)
-        await interaction.response.send_modal(modal) 
\ No newline at end of file
+        await open_ticket_modal(interaction, self.values)
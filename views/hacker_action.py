@@ -1,34 +1,40 @@
+import asyncio
 import discord
-from datetime import datetime
 from utils.db import get_firebase_db
+from utils.timestamps import utcnow, format_datetime
+from utils.interactions import interaction_handler, reply, update_message
 from utils.styles import Colors, Emojis, Titles, Messages
 
-class UserTicketView(discord.ui.View):
-    def __init__(self, ticket_id: str, ticket: dict):
-        super().__init__(timeout=None)
+class CloseTicketButton(discord.ui.DynamicItem[discord.ui.Button], template=r'ticket_close:(?P<ticket_id>[0-9]+)'):
+    """Close button on the hacker's DM; the ticket id lives in the custom_id so it survives a restart"""
+    def __init__(self, ticket_id: str):
+        super().__init__(discord.ui.Button(label="Close Ticket", style=discord.ButtonStyle.danger, custom_id=f"ticket_close:{ticket_id}"))
         self.ticket_id = ticket_id
-        self.ticket = ticket
 
-    @discord.ui.button(label="Close Ticket", style=discord.ButtonStyle.danger)
-    async def close_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.ticket['user_id']:
-            await interaction.response.send_message("You can only close your own tickets!", ephemeral=True)
-            return
-        
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['ticket_id'])
+
+    @interaction_handler(defer='update')
+    async def callback(self, interaction: discord.Interaction):
         db = get_firebase_db()
-        current_ticket = db.get_ticket_by_id(self.ticket_id)
+        current_ticket = await asyncio.to_thread(db.get_ticket_by_id, self.ticket_id)
         
         if not current_ticket:
-            await interaction.response.send_message("Ticket not found!", ephemeral=True)
+            await reply(interaction, "Ticket not found!", ephemeral=True)
+            return
+        
+        if interaction.user.id != current_ticket['user_id']:
+            await reply(interaction, "You can only close your own tickets!", ephemeral=True)
             return
         
         if current_ticket['status'] == 'closed':
-            await interaction.response.send_message("This ticket is already closed!", ephemeral=True)
+            await reply(interaction, "This ticket is already closed!", ephemeral=True)
             return
         
-        success = db.close_ticket(self.ticket_id)
+        success = await asyncio.to_thread(db.close_ticket, self.ticket_id)
         if not success:
-            await interaction.response.send_message("Failed to close ticket. Please try again.", ephemeral=True)
+            await reply(interaction, "Failed to close ticket. Please try again.", ephemeral=True)
             return
         
         embed = discord.Embed(
@@ -37,11 +43,11 @@ class UserTicketView(discord.ui.View):
             color=Colors.GRAY
         )
         embed.add_field(name="Closed by", value=interaction.user.display_name, inline=True)
-        embed.add_field(name="Closed at", value=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+        embed.add_field(name="Closed at", value=format_datetime(utcnow()), inline=True)
         
-        button.disabled = True
+        self.item.disabled = True
         
-        await interaction.response.edit_message(embed=embed, view=self)
+        await update_message(interaction, embed=embed, view=self.view)
         
         if current_ticket['mentor_id']:
             try:
@@ -54,4 +60,9 @@ class UserTicketView(discord.ui.View):
                 mentor_embed.add_field(name="Closed by", value=interaction.user.display_name, inline=True)
                 await mentor.send(embed=mentor_embed)
             except:
-                pass
\ No newline at end of file
+                pass
+
+class UserTicketView(discord.ui.View):
+    def __init__(self, ticket_id: str):
+        super().__init__(timeout=None)
+        self.add_item(CloseTicketButton(ticket_id))
@@ -1,41 +1,87 @@
+import asyncio
+import logging
 import discord
-from datetime import datetime
+from typing import Optional
 from utils.db import get_firebase_db
+from utils.mentor_load import suggest_mentors
+from utils.roles import get_role_registry
+from utils.ticket_messages import get_ticket_messages
+from utils.ticket_model import Ticket
+from utils.timestamps import utcnow, format_datetime
+from utils.interactions import interaction_handler, reply, update_message
 from utils.styles import Colors, Emojis, Titles, Messages
 
+logger = logging.getLogger('discord')
+
 """
 Views for managing tickets (acceptance, resolution, etc.)
 """
-class AcceptTicketView(discord.ui.View):
+async def claim_ticket(interaction: discord.Interaction, ticket_id: str) -> Optional[Ticket]:
+    """Assign an open, unassigned ticket to the clicking mentor; replies and returns None if they can't have it"""
+    if not get_role_registry().is_mentor(interaction.user):
+        await reply(interaction, "You need the Mentor role to accept tickets!", ephemeral=True)
+        return None
+    
+    db = get_firebase_db()
+    ticket = await asyncio.to_thread(db.get_ticket_by_id, ticket_id)
+    
+    if not ticket:
+        await reply(interaction, "Ticket not found!", ephemeral=True)
+        return None
+    
+    ticket = Ticket.from_dict(ticket)
+    if not ticket.is_open:
+        await reply(interaction, "This ticket is not open!", ephemeral=True)
+        return None
+    
+    if ticket.mentor_id:
+        await reply(interaction, f"This ticket is already assigned to {ticket.mentor_name}!", ephemeral=True)
+        return None
+    
+    success = await asyncio.to_thread(db.assign_ticket, ticket_id, interaction.user.id, interaction.user.display_name)
+    if not success:
+        await reply(interaction, "Failed to accept ticket. Please try again.", ephemeral=True)
+        return None
+    return ticket
+
+async def notify_hacker_accepted(interaction: discord.Interaction, ticket_id: str, ticket: Ticket):
+    """DM the hacker that a mentor accepted their ticket, with resolve/reassign buttons"""
+    try:
+        user = await interaction.client.fetch_user(ticket.user_id)
+        user_embed = discord.Embed(
+            title=Titles.TICKET_ASSIGNED,
+            description=Messages.TICKET_ASSIGNED_SUCCESS,
+            color=Colors.GREEN
+        )
+        user_embed.add_field(name="Mentor", value=interaction.user.mention, inline=True)
+        user_embed.add_field(name="Title", value=ticket.title, inline=False)
+        user_embed.add_field(name="Description", value=ticket.description, inline=False)
+        
+        from views.mentor_action import MentorActionView
+        view = MentorActionView(ticket_id)
+        await user.send(embed=user_embed, view=view)
+    except:
+        pass
+
+class AcceptTicketButton(discord.ui.DynamicItem[discord.ui.Button], template=r'accept_ticket:(?P<ticket_id>[0-9]+)'):
+    """
+    Accept button on a single ticket notification.
+
+    The ticket id lives in the custom_id, so the button is rebuilt from any click
+    once the class is registered with bot.add_dynamic_items, also after a restart.
+    """
     def __init__(self, ticket_id: str):
-        super().__init__(timeout=None)
+        super().__init__(discord.ui.Button(label="Accept Ticket", style=discord.ButtonStyle.success, custom_id=f"accept_ticket:{ticket_id}"))
         self.ticket_id = ticket_id
 
-    @discord.ui.button(label="Accept Ticket", style=discord.ButtonStyle.success)
-    async def accept_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        mentor_role = discord.utils.get(interaction.guild.roles, name="Mentor")
-        if not mentor_role or mentor_role not in interaction.user.roles:
-            await interaction.response.send_message("You need the Mentor role to accept tickets!", ephemeral=True)
-            return
-        
-        db = get_firebase_db()
-        ticket = db.get_ticket_by_id(self.ticket_id)
-        
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['ticket_id'])
+
+    @interaction_handler(defer='update')
+    async def callback(self, interaction: discord.Interaction):
+        ticket = await claim_ticket(interaction, self.ticket_id)
         if not ticket:
-            await interaction.response.send_message("Ticket not found!", ephemeral=True)
-            return
-        
-        if ticket['status'] != 'open':
-            await interaction.response.send_message("This ticket is not open!", ephemeral=True)
-            return
-        
-        if ticket['mentor_id']:
-            await interaction.response.send_message(f"This ticket is already assigned to {ticket['mentor_name']}!", ephemeral=True)
-            return
-        
-        success = db.assign_ticket(self.ticket_id, interaction.user.id, interaction.user.display_name)
-        if not success:
-            await interaction.response.send_message("Failed to accept ticket. Please try again.", ephemeral=True)
             return
         
         embed = discord.Embed(
@@ -43,40 +89,69 @@ class AcceptTicketView(discord.ui.View):
             description=f"Accepted by {interaction.user.mention}",
             color=Colors.GREEN
         )
-        embed.add_field(name="Hacker", value=ticket['user_name'], inline=True)
-        embed.add_field(name="Title", value=ticket.get('title', 'No title'), inline=False)
-        embed.add_field(name="Description", value=ticket['description'], inline=False)
-        embed.add_field(name="Location", value=ticket.get('location', 'No location'), inline=False)
-        if ticket.get('categories'):
-            embed.add_field(name="Categories", value=", ".join(ticket['categories']), inline=False)
-        embed.add_field(name="Accepted at", value=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+        embed.add_field(name="Hacker", value=ticket.user_name, inline=True)
+        embed.add_field(name="Title", value=ticket.title, inline=False)
+        embed.add_field(name="Description", value=ticket.description, inline=False)
+        embed.add_field(name="Location", value=ticket.location, inline=False)
+        if ticket.categories:
+            embed.add_field(name="Categories", value=", ".join(ticket.categories), inline=False)
+        embed.add_field(name="Accepted at", value=format_datetime(utcnow()), inline=True)
         
-        for child in self.children:
-            child.disabled = True
-        
-        await interaction.response.edit_message(embed=embed, view=self)
+        self.item.disabled = True
+        await update_message(interaction, embed=embed, view=self.view)
+        await notify_hacker_accepted(interaction, self.ticket_id, ticket)
+
+class AcceptTicketView(discord.ui.View):
+    def __init__(self, ticket_id: str):
+        super().__init__(timeout=None)
+        self.add_item(AcceptTicketButton(ticket_id))
+
+class DigestAcceptButton(discord.ui.DynamicItem[discord.ui.Button], template=r'accept_digest:(?P<ticket_id>[0-9]+)'):
+    """Accept button for one ticket in a digest; only this button changes when it's used"""
+    def __init__(self, ticket_id: str):
+        super().__init__(discord.ui.Button(label=f"Accept #{ticket_id}", style=discord.ButtonStyle.success, custom_id=f"accept_digest:{ticket_id}"))
+        self.ticket_id = ticket_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['ticket_id'])
+
+    @interaction_handler(defer='update')
+    async def callback(self, interaction: discord.Interaction):
+        ticket = await claim_ticket(interaction, self.ticket_id)
+        if not ticket:
+            return
         
-        try:
-            user = await interaction.client.fetch_user(ticket['user_id'])
-            user_embed = discord.Embed(
-                title=Titles.TICKET_ASSIGNED,
-                description=Messages.TICKET_ASSIGNED_SUCCESS,
-                color=Colors.GREEN
-            )
-            user_embed.add_field(name="Mentor", value=interaction.user.mention, inline=True)
-            user_embed.add_field(name="Title", value=ticket.get('title', 'No title'), inline=False)
-            user_embed.add_field(name="Description", value=ticket['description'], inline=False)
-            
-            from views.mentor_action import MentorActionView
-            view = MentorActionView(self.ticket_id, ticket)
-            await user.send(embed=user_embed, view=view)
-        except:
-            pass
-
-async def notify_mentors(interaction, ticket):
-    """Notify mentors about a new ticket"""
+        self.item.label = f"#{self.ticket_id} · {interaction.user.display_name}"[:80]
+        self.item.style = discord.ButtonStyle.secondary
+        self.item.disabled = True
+        await update_message(interaction, view=self.view)
+        await notify_hacker_accepted(interaction, self.ticket_id, ticket)
+
+class DigestAcceptView(discord.ui.View):
+    def __init__(self, ticket_ids):
+        super().__init__(timeout=None)
+        for ticket_id in ticket_ids:
+            self.add_item(DigestAcceptButton(ticket_id))
+
+async def auto_assign(guild, ticket):
+    """Assign a new ticket to the least-loaded mentor with matching skills; returns the member or None"""
+    db = get_firebase_db()
+    for mentor_id, _ in suggest_mentors(guild, ticket, count=3):
+        member = guild.get_member(mentor_id)
+        if member is None:
+            try:
+                member = await guild.fetch_member(mentor_id)
+            except discord.HTTPException:
+                continue
+        if await asyncio.to_thread(db.assign_ticket, ticket['id'], member.id, member.display_name):
+            return member
+    return None
+
+async def notify_mentors(interaction, ticket, duplicates=None):
+    """Notify mentors about a new ticket, flagging likely duplicates of open tickets"""
     db = get_firebase_db()
-    mentor_channel_id = db.get_dev_config('mentor_channel')
+    mentor_channel_id = await asyncio.to_thread(db.get_dev_config, 'mentor_channel')
     
     if not mentor_channel_id:
         return
@@ -86,19 +161,92 @@ async def notify_mentors(interaction, ticket):
         if not mentor_channel:
             return
         
-        embed = discord.Embed(
-            title=f"Ticket #{ticket['id']}",
-            color=Colors.DISCORD_DEFAULT
-        )
-        embed.add_field(name="Problem description", value=ticket['description'], inline=False)
-        embed.add_field(name="Where to meet", value=ticket['location'], inline=False)
-        embed.add_field(name="Helped by:", value="No mentor assigned yet", inline=False)
-        
-        if ticket['categories']:
-            embed.add_field(name="Categories", value=", ".join(ticket['categories']), inline=False)
+        mentor = None
+        if await asyncio.to_thread(db.get_dev_config, 'auto_assign') == 'on':
+            mentor = await auto_assign(interaction.guild, ticket)
+            if mentor:
+                await notify_auto_assignment(interaction.client, mentor, Ticket.from_dict(ticket))
         
-        view = AcceptTicketView(ticket['id'])
-        await mentor_channel.send(embed=embed, view=view)
+        # posted at once while it's quiet, folded into a digest during a burst
+        from utils.digest import get_notification_batcher
+        await get_notification_batcher().submit(mentor_channel, {'ticket': ticket, 'duplicates': duplicates, 'mentor': mentor})
         
     except Exception as e:
-        print(f"Failed to notify mentors: {e}") 
\ No newline at end of file
+        logger.error(f"Failed to notify mentors: {e}", extra={'ticket_id': ticket['id']}) 
+
+async def post_ticket_notification(channel, item):
+    """One message for one new ticket, with an accept button unless it was auto-assigned"""
+    ticket, duplicates, mentor = item['ticket'], item['duplicates'], item['mentor']
+    embed = discord.Embed(
+        title=f"Ticket #{ticket['id']}",
+        color=Colors.DISCORD_DEFAULT
+    )
+    embed.add_field(name="Problem description", value=ticket['description'], inline=False)
+    embed.add_field(name="Where to meet", value=ticket['location'], inline=False)
+    embed.add_field(name="Helped by:", value=f"{mentor.mention} (auto-assigned)" if mentor else "No mentor assigned yet", inline=False)
+    
+    if ticket['categories']:
+        embed.add_field(name="Categories", value=", ".join(ticket['categories']), inline=False)
+    
+    if duplicates:
+        from views.create_ticket import duplicates_text
+        embed.add_field(name=Titles.POSSIBLE_DUPLICATES, value=duplicates_text(duplicates), inline=False)
+    
+    if mentor:
+        message = await channel.send(embed=embed)
+    else:
+        message = await channel.send(embed=embed, view=AcceptTicketView(ticket['id']))
+    get_ticket_messages().record([ticket['id']], message)
+
+async def post_ticket_digest(channel, items):
+    """One message for several new tickets, with an accept button per unassigned ticket"""
+    embed = discord.Embed(
+        title=f"{Emojis.TICKET} {len(items)} new tickets",
+        color=Colors.DISCORD_DEFAULT
+    )
+    for item in items:
+        ticket, duplicates, mentor = item['ticket'], item['duplicates'], item['mentor']
+        lines = [ticket['description'][:150] + ("..." if len(ticket['description']) > 150 else ""),
+                 f"**Where:** {ticket['location'][:100]}"]
+        if mentor:
+            lines.append(f"**Helped by:** {mentor.mention} (auto-assigned)")
+        if duplicates:
+            lines.append(f"{Emojis.WARNING} Possibly the same as " + ", ".join(f"#{ticket_id}" for ticket_id, _ in duplicates))
+        categories = f" · {', '.join(ticket['categories'])}" if ticket['categories'] else ""
+        embed.add_field(name=f"Ticket #{ticket['id']}{categories}"[:256], value="\n".join(lines)[:1024], inline=False)
+    
+    view = DigestAcceptView([item['ticket']['id'] for item in items if not item['mentor']])
+    message = await channel.send(embed=embed, view=view)
+    get_ticket_messages().record([item['ticket']['id'] for item in items], message)
+
+async def notify_auto_assignment(client, mentor, ticket: Ticket):
+    """DM the auto-assigned mentor and the hacker"""
+    try:
+        mentor_embed = discord.Embed(
+            title=Titles.TICKET_ASSIGNED,
+            description=f"You have been assigned ticket #{ticket.id}",
+            color=Colors.GREEN
+        )
+        mentor_embed.add_field(name="Hacker", value=ticket.user_name, inline=True)
+        mentor_embed.add_field(name="Title", value=ticket.title, inline=False)
+        mentor_embed.add_field(name="Description", value=ticket.description, inline=False)
+        mentor_embed.add_field(name="Location", value=ticket.location, inline=False)
+        await mentor.send(embed=mentor_embed)
+    except:
+        pass
+    
+    try:
+        user = await client.fetch_user(ticket.user_id)
+        user_embed = discord.Embed(
+            title=Titles.TICKET_ASSIGNED,
+            description=Messages.TICKET_ASSIGNED_SUCCESS,
+            color=Colors.GREEN
+        )
+        user_embed.add_field(name="Mentor", value=mentor.mention, inline=True)
+        user_embed.add_field(name="Title", value=ticket.title, inline=False)
+        
+        from views.mentor_action import MentorActionView
+        view = MentorActionView(ticket.id)
+        await user.send(embed=user_embed, view=view)
+    except:
+        pass
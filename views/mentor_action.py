@@ -1,34 +1,51 @@
+import asyncio
+import logging
 import discord
-from datetime import datetime
 from utils.db import get_firebase_db
+from utils.ticket_messages import get_ticket_messages
+from utils.ticket_model import Ticket
+from utils.timestamps import utcnow, format_datetime
+from utils.interactions import interaction_handler, reply, update_message
 from utils.styles import Colors, Emojis, Titles, Messages
 
-class MentorActionView(discord.ui.View):
-    def __init__(self, ticket_id: str, ticket: dict):
-        super().__init__(timeout=None)
+logger = logging.getLogger('discord')
+
+def disable_all(view: discord.ui.View):
+    """Disable every button on a view, dynamic items included"""
+    for child in view.children:
+        getattr(child, 'item', child).disabled = True
+
+class ResolveTicketButton(discord.ui.DynamicItem[discord.ui.Button], template=r'ticket_resolve:(?P<ticket_id>[0-9]+)'):
+    """Resolve button on the mentor's DM; like the accept buttons it keeps working after a restart"""
+    def __init__(self, ticket_id: str):
+        super().__init__(discord.ui.Button(label="Resolve", style=discord.ButtonStyle.success, custom_id=f"ticket_resolve:{ticket_id}"))
         self.ticket_id = ticket_id
-        self.ticket = ticket
 
-    @discord.ui.button(label="Resolve", style=discord.ButtonStyle.success)
-    async def resolve_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['ticket_id'])
+
+    @interaction_handler(defer='update')
+    async def callback(self, interaction: discord.Interaction):
         db = get_firebase_db()
-        current_ticket = db.get_ticket_by_id(self.ticket_id)
+        current_ticket = await asyncio.to_thread(db.get_ticket_by_id, self.ticket_id)
         
         if not current_ticket:
-            await interaction.response.send_message("Ticket not found!", ephemeral=True)
+            await reply(interaction, "Ticket not found!", ephemeral=True)
             return
         
-        if current_ticket['status'] == 'closed':
-            await interaction.response.send_message("This ticket is already closed!", ephemeral=True)
+        current_ticket = Ticket.from_dict(current_ticket)
+        if not current_ticket.is_open:
+            await reply(interaction, "This ticket is already closed!", ephemeral=True)
             return
         
-        if current_ticket['mentor_id'] != interaction.user.id:
-            await interaction.response.send_message("You can only resolve tickets assigned to you!", ephemeral=True)
+        if current_ticket.mentor_id != interaction.user.id:
+            await reply(interaction, "You can only resolve tickets assigned to you!", ephemeral=True)
             return
         
-        success = db.close_ticket(self.ticket_id)
+        success = await asyncio.to_thread(db.close_ticket, self.ticket_id)
         if not success:
-            await interaction.response.send_message("Failed to resolve ticket. Please try again.", ephemeral=True)
+            await reply(interaction, "Failed to resolve ticket. Please try again.", ephemeral=True)
             return
         
         embed = discord.Embed(
@@ -37,17 +54,16 @@ class MentorActionView(discord.ui.View):
             color=Colors.GRAY
         )
         embed.add_field(name="Resolved by", value=interaction.user.display_name, inline=True)
-        embed.add_field(name="Hacker", value=self.ticket['user_name'], inline=True)
-        embed.add_field(name="Title", value=self.ticket.get('title', 'No title'), inline=False)
-        embed.add_field(name="Resolved at", value=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+        embed.add_field(name="Hacker", value=current_ticket.user_name, inline=True)
+        embed.add_field(name="Title", value=current_ticket.title, inline=False)
+        embed.add_field(name="Resolved at", value=format_datetime(utcnow()), inline=True)
         
-        for child in self.children:
-            child.disabled = True
+        disable_all(self.view)
         
-        await interaction.response.edit_message(embed=embed, view=self)
+        await update_message(interaction, embed=embed, view=self.view)
         
         try:
-            user = await interaction.client.fetch_user(self.ticket['user_id'])
+            user = await interaction.client.fetch_user(current_ticket.user_id)
             user_embed = discord.Embed(
                 title=Titles.TICKET_CLOSED,
                 description=f"Your ticket #{self.ticket_id} has been resolved by your mentor.",
@@ -58,27 +74,38 @@ class MentorActionView(discord.ui.View):
         except:
             pass
 
-    @discord.ui.button(label="Reassign", style=discord.ButtonStyle.danger)
-    async def discard_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+class ReassignTicketButton(discord.ui.DynamicItem[discord.ui.Button], template=r'ticket_reassign:(?P<ticket_id>[0-9]+)'):
+    """Reassign button on the mentor's DM"""
+    def __init__(self, ticket_id: str):
+        super().__init__(discord.ui.Button(label="Reassign", style=discord.ButtonStyle.danger, custom_id=f"ticket_reassign:{ticket_id}"))
+        self.ticket_id = ticket_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['ticket_id'])
+
+    @interaction_handler(defer='update')
+    async def callback(self, interaction: discord.Interaction):
         """Detach mentor from this ticket and push ticket back to the mentor queue"""
         db = get_firebase_db()
-        current_ticket = db.get_ticket_by_id(self.ticket_id)
+        current_ticket = await asyncio.to_thread(db.get_ticket_by_id, self.ticket_id)
         
         if not current_ticket:
-            await interaction.response.send_message("Ticket not found!", ephemeral=True)
+            await reply(interaction, "Ticket not found!", ephemeral=True)
             return
         
-        if current_ticket['status'] == 'closed':
-            await interaction.response.send_message("This ticket is already closed!", ephemeral=True)
+        current_ticket = Ticket.from_dict(current_ticket)
+        if not current_ticket.is_open:
+            await reply(interaction, "This ticket is already closed!", ephemeral=True)
             return
         
-        if current_ticket['mentor_id'] != interaction.user.id:
-            await interaction.response.send_message("You can only reassign tickets assigned to you!", ephemeral=True)
+        if current_ticket.mentor_id != interaction.user.id:
+            await reply(interaction, "You can only reassign tickets assigned to you!", ephemeral=True)
             return
 
-        success = db.release_ticket(self.ticket_id)
+        success = await asyncio.to_thread(db.release_ticket, self.ticket_id)
         if not success:
-            await interaction.response.send_message("Failed to reassign ticket. Please try again.", ephemeral=True)
+            await reply(interaction, "Failed to reassign ticket. Please try again.", ephemeral=True)
             return
         
         embed = discord.Embed(
@@ -87,39 +114,38 @@ class MentorActionView(discord.ui.View):
             color=Colors.DISCORD_DEFAULT
         )
         embed.add_field(name="Reassigned by", value=interaction.user.display_name, inline=True)
-        embed.add_field(name="Hacker", value=self.ticket['user_name'], inline=True)
-        embed.add_field(name="Reassigned at", value=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+        embed.add_field(name="Hacker", value=current_ticket.user_name, inline=True)
+        embed.add_field(name="Reassigned at", value=format_datetime(utcnow()), inline=True)
         
-        for child in self.children:
-            child.disabled = True
+        disable_all(self.view)
         
-        await interaction.response.edit_message(embed=embed, view=self)
+        await update_message(interaction, embed=embed, view=self.view)
         
         # Notify the user that their ticket has been reassigned
         try:
-            user = await interaction.client.fetch_user(self.ticket['user_id'])
+            user = await interaction.client.fetch_user(current_ticket.user_id)
             user_embed = discord.Embed(
                 title=Titles.TICKET_REASSIGNED,
                 description=f"Your ticket #{self.ticket_id} has been released back to the queue and is now available for other mentors to help you.",
                 color=Colors.BLUE
             )
             user_embed.add_field(name="Previous Mentor", value=interaction.user.display_name, inline=True)
-            user_embed.add_field(name="Ticket Title", value=self.ticket.get('title', 'No title'), inline=False)
-            user_embed.add_field(name="Reassigned at", value=datetime.now().strftime("%Y-%m-%d %H:%M:%S"), inline=True)
+            user_embed.add_field(name="Ticket Title", value=current_ticket.title, inline=False)
+            user_embed.add_field(name="Reassigned at", value=format_datetime(utcnow()), inline=True)
             await user.send(embed=user_embed)
         except Exception as e:
-            print(f"Failed to notify user {self.ticket['user_id']} about ticket reassignment: {e}")
+            logger.warning(f"Failed to notify user {current_ticket.user_id} about ticket reassignment: {e}")
         
         # Repost the ticket in the mentor channel
-        mentor_channel_id = db.get_dev_config('mentor_channel')
+        mentor_channel_id = await asyncio.to_thread(db.get_dev_config, 'mentor_channel')
         if not mentor_channel_id:
-            print(f"No mentor channel configured. Ticket {self.ticket_id} was reassigned but not reposted.")
+            logger.warning(f"No mentor channel configured. Ticket {self.ticket_id} was reassigned but not reposted.")
             return
             
         try:
             mentor_channel = interaction.guild.get_channel(int(mentor_channel_id))
             if not mentor_channel:
-                print(f"Mentor channel {mentor_channel_id} not found in guild {interaction.guild.id}")
+                logger.warning(f"Mentor channel {mentor_channel_id} not found in guild {interaction.guild.id}")
                 return
                 
             ticket_embed = discord.Embed(
@@ -127,23 +153,30 @@ class MentorActionView(discord.ui.View):
                 description="A ticket has been released back to the queue and is available for mentors.",
                 color=Colors.DISCORD_DEFAULT
             )
-            ticket_embed.add_field(name="Hacker", value=self.ticket['user_name'], inline=True)
-            ticket_embed.add_field(name="Title", value=self.ticket.get('title', 'No title'), inline=False)
-            ticket_embed.add_field(name="Description", value=self.ticket['description'][:200] + "..." if len(self.ticket['description']) > 200 else self.ticket['description'], inline=False)
-            ticket_embed.add_field(name="Location", value=self.ticket['location'], inline=True)
+            ticket_embed.add_field(name="Hacker", value=current_ticket.user_name, inline=True)
+            ticket_embed.add_field(name="Title", value=current_ticket.title, inline=False)
+            ticket_embed.add_field(name="Description", value=current_ticket.description[:200] + "..." if len(current_ticket.description) > 200 else current_ticket.description, inline=False)
+            ticket_embed.add_field(name="Location", value=current_ticket.location, inline=True)
             ticket_embed.add_field(name="Status", value="Available for mentoring", inline=True)
             
-            if self.ticket['categories']:
-                ticket_embed.add_field(name="Categories", value=", ".join(self.ticket['categories']), inline=False)
+            if current_ticket.categories:
+                ticket_embed.add_field(name="Categories", value=", ".join(current_ticket.categories), inline=False)
             
             from views.manage_ticket import AcceptTicketView
             view = AcceptTicketView(self.ticket_id)
-            await mentor_channel.send(embed=ticket_embed, view=view)
-            print(f"Successfully reposted ticket {self.ticket_id} in mentor channel {mentor_channel.name}")
+            message = await mentor_channel.send(embed=ticket_embed, view=view)
+            get_ticket_messages().record([self.ticket_id], message)
+            logger.info(f"Successfully reposted ticket {self.ticket_id} in mentor channel {mentor_channel.name}")
             
         except Exception as e:
-            print(f"Failed to repost ticket {self.ticket_id} in mentor channel: {e}")
+            logger.error(f"Failed to repost ticket {self.ticket_id} in mentor channel: {e}")
             try:
                 await interaction.followup.send("Ticket reassigned but there was an issue reposting it to the mentor channel. Please contact an administrator.", ephemeral=True)
             except:
-                pass
\ No newline at end of file
+                pass
+
+class MentorActionView(discord.ui.View):
+    def __init__(self, ticket_id: str):
+        super().__init__(timeout=None)
+        self.add_item(ResolveTicketButton(ticket_id))
+        self.add_item(ReassignTicketButton(ticket_id))
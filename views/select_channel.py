@@ -1,14 +1,23 @@
+import asyncio
+import logging
 import discord
 from utils.db import get_firebase_db
+from utils.dashboard import get_dashboard
+from utils.roles import get_role_registry
+from utils.ticket_messages import get_ticket_messages
+from utils.interactions import interaction_handler, reply
 from utils.styles import Colors, Titles, Messages, Footers
 
+logger = logging.getLogger('discord')
+
 """
 Components for setting up mentor and ticket channel configs
 
 """
 class ChannelSetupView(discord.ui.View):
     def __init__(self):
-        super().__init__(timeout=None)
+        # the picks only live in this view, and the ephemeral reply's components expire after 15 minutes anyway
+        super().__init__(timeout=900)
         self.ticket_channel = None
         self.mentor_channel = None
         
@@ -43,18 +52,21 @@ class SaveChannelsButton(discord.ui.Button):
             style=discord.ButtonStyle.success,
         )
 
+    @interaction_handler(defer='update')
     async def callback(self, interaction: discord.Interaction):
-        if not interaction.user.guild_permissions.administrator:
-            await interaction.response.send_message("You need administrator permissions to configure channels!", ephemeral=True)
+        if not get_role_registry().is_admin(interaction.user):
+            await reply(interaction, "You need administrator permissions or the Admin role to configure channels!", ephemeral=True)
             return
         
         if not self.view.ticket_channel or not self.view.mentor_channel:
-            await interaction.response.send_message("Please select both ticket and mentor channels first!", ephemeral=True)
+            await reply(interaction, "Please select both ticket and mentor channels first!", ephemeral=True)
             return
 
         db = get_firebase_db()
-        db.set_dev_config('ticket_channel', str(self.view.ticket_channel.id))
-        db.set_dev_config('mentor_channel', str(self.view.mentor_channel.id))
+        await asyncio.to_thread(db.set_dev_config, 'ticket_channel', str(self.view.ticket_channel.id))
+        await asyncio.to_thread(db.set_dev_config, 'mentor_channel', str(self.view.mentor_channel.id))
+        # move the pinned queue dashboard to the new mentor channel
+        get_dashboard().refresh()
         
         embed = discord.Embed(
             title=Titles.CHANNEL_CONFIG,
@@ -64,17 +76,23 @@ class SaveChannelsButton(discord.ui.Button):
         embed.add_field(name="Ticket Channel", value=self.view.ticket_channel.mention, inline=True)
         embed.add_field(name="Mentor Channel", value=self.view.mentor_channel.mention, inline=True)
         
-        await interaction.response.send_message(embed=embed)
+        await reply(interaction, embed=embed)
         
         try:
             ticket_embed = discord.Embed(
                 title="Need 1:1 mentor help?",
-                description="Select a technology you need help with and follow the instructions!",
+                description="Select the area you need help with, then the technology, and follow the instructions!",
                 color=Colors.GREEN
             )
             
             from views.create_ticket import PublicCategorySelectionView
-            view = PublicCategorySelectionView()
-            await self.view.ticket_channel.send(embed=ticket_embed, view=view)
+            from utils.categories import get_category_catalogue
+            catalogue = await asyncio.to_thread(get_category_catalogue().get, interaction.guild_id)
+            view = PublicCategorySelectionView(catalogue)
+            # the select gives an AppCommandChannel, which can't send; use the guild's channel
+            ticket_channel = interaction.guild.get_channel(self.view.ticket_channel.id)
+            message = await ticket_channel.send(embed=ticket_embed, view=view)
+            # so /category can update it when groups change
+            get_ticket_messages().record_interface(message)
         except Exception as e:
-            print(f"Failed to post ticket interface: {e}") 
\ No newline at end of file
+            logger.error(f"Failed to post ticket interface: {e}") 
\ No newline at end of file